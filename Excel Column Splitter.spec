@@ -5,7 +5,7 @@ a = Analysis(
     ['split_by_column.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('assets/fonts/Outfit-Regular.ttf', 'assets/fonts')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,90 @@
+"""
+Benchmark the Excel writer backends used for split outputs.
+
+Writes the same synthetic frame with every available writer in
+split_engine.EXCEL_WRITERS and reports rows/sec, so the streaming writers
+can be compared against the default openpyxl (to_excel) path.
+
+Usage:
+    python benchmarks/bench_excel_writers.py --rows 100000 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import split_engine  # noqa: E402
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Mixed-type frame resembling a typical business sheet."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "Region": rng.choice(["North", "South", "East", "West"], rows),
+            "Customer": [f"Customer {i % 5000}" for i in range(rows)],
+            "Quantity": rng.integers(1, 500, rows),
+            "Amount": rng.normal(1000, 250, rows).round(2),
+            "Date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), "D"),
+        }
+    )
+
+
+def bench_writer(frame: pd.DataFrame, writer: str, repeat: int) -> dict:
+    """Best-of-N wall time for writing frame with one backend."""
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.xlsx")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            split_engine.export_group(frame, path, "excel", excel_writer=writer)
+            timings.append(time.perf_counter() - started)
+        size = os.path.getsize(path)
+    best = min(timings)
+    return {
+        "writer": writer,
+        "rows": len(frame),
+        "best_seconds": round(best, 4),
+        "rows_per_second": round(len(frame) / best, 1),
+        "file_bytes": size,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare Excel writer throughput.")
+    parser.add_argument("--rows", type=int, default=50_000, help="Rows in the synthetic frame")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per writer (best is kept)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    frame = make_frame(args.rows)
+    results = []
+    for writer in split_engine.EXCEL_WRITERS:
+        try:
+            results.append(bench_writer(frame, writer, args.repeat))
+        except ValueError as e:
+            # Optional backend not installed
+            print(f"Skipping {writer}: {e}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    baseline = next((r for r in results if r["writer"] == "openpyxl"), None)
+    print(f"{'writer':<18}{'seconds':>10}{'rows/sec':>14}{'speedup':>10}")
+    for r in results:
+        speedup = baseline["best_seconds"] / r["best_seconds"] if baseline else float("nan")
+        print(f"{r['writer']:<18}{r['best_seconds']:>10.3f}{r['rows_per_second']:>14,.0f}{speedup:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Benchmark every stage of the split pipeline on synthetic data.
+
+Generates datasets from a grid of shapes (rows, value columns, key
+cardinality, null ratio, string width), writes them as CSV/XLSX input and
+times each split_engine stage separately for CSV and XLSX output:
+
+    load    load_dataframe on the input file (no cache)
+    group   Partition (factorize keys, reorder rows)
+    name    plan_file_paths (filename table + collision resolution)
+    export  iter_exports writing one file per group
+    zip     create_zip over the exported files
+    split   split_dataframe end to end (streaming ZIP, no manifest)
+
+Each stage keeps the best of --repeat runs. Results are printed as a table
+or written as JSON (--json / --output) together with the commit and library
+versions, so runs can be compared across commits with --compare.
+
+Usage:
+    python benchmarks/bench_split.py --rows 20000 100000 --cardinality 10 1000
+    python benchmarks/bench_split.py --output before.json
+    python benchmarks/bench_split.py --output after.json --compare before.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import split_engine  # noqa: E402
+
+STAGES = ("load", "group", "name", "export", "zip", "split")
+INPUT_EXTENSIONS = {"csv": ".csv", "xlsx": ".xlsx"}
+
+
+def make_frame(
+    rows: int,
+    value_columns: int = 6,
+    key_columns: int = 1,
+    cardinality: int = 100,
+    null_ratio: float = 0.0,
+    string_width: int = 12,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Synthetic dataset: key columns followed by alternating numeric and text columns.
+
+    Args:
+        rows: Number of rows
+        value_columns: Number of non-key columns (half numeric, half text)
+        key_columns: Number of key columns to split by
+        cardinality: Distinct values per key column
+        null_ratio: Share of missing values in key and text columns
+        string_width: Length of generated text values
+        seed: Random seed (same arguments give the same frame)
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for k in range(key_columns):
+        labels = np.array([f"Key {k}-{i:05d}" for i in range(cardinality)], dtype=object)
+        values = labels[rng.integers(0, cardinality, rows)]
+        if null_ratio:
+            values[rng.random(rows) < null_ratio] = None
+        data[f"key_{k}"] = values
+
+    alphabet = np.array(list("abcdefghijklmnopqrstuvwxyz "))
+    # A small pool of strings keeps generation fast for large row counts
+    pool = np.array(
+        ["".join(rng.choice(alphabet, string_width)) for _ in range(1000)], dtype=object
+    )
+    for c in range(value_columns):
+        if c % 2 == 0:
+            data[f"num_{c}"] = rng.normal(1000, 250, rows).round(2)
+        else:
+            values = pool[rng.integers(0, len(pool), rows)]
+            if null_ratio:
+                values[rng.random(rows) < null_ratio] = None
+            data[f"text_{c}"] = values
+    return pd.DataFrame(data)
+
+
+def write_input(frame: pd.DataFrame, directory: str, input_format: str) -> str:
+    """Write frame as a CSV or XLSX input file and return its path."""
+    path = os.path.join(directory, f"input{INPUT_EXTENSIONS[input_format]}")
+    if input_format == "csv":
+        frame.to_csv(path, index=False)
+    else:
+        split_engine.export_group(frame, path, "excel", excel_writer="openpyxl-stream")
+    return path
+
+
+def time_stages(
+    input_path: str, keys: list, output_format: str, excel_writer: str, repeat: int
+) -> dict:
+    """Best-of-repeat seconds per stage for one input file and output format."""
+    best = {stage: float("inf") for stage in STAGES}
+
+    def record(stage: str, started: float) -> None:
+        best[stage] = min(best[stage], time.perf_counter() - started)
+
+    extension = split_engine.FORMAT_EXTENSIONS[output_format]
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            started = time.perf_counter()
+            frame = split_engine.load_dataframe(input_path)
+            record("load", started)
+
+            started = time.perf_counter()
+            partition = split_engine.Partition(frame, keys)
+            record("group", started)
+
+            split_engine.sanitize_string.cache_clear()
+            started = time.perf_counter()
+            _, file_paths = split_engine.plan_file_paths(
+                partition, keys, list(frame.columns), tmp, extension
+            )
+            record("name", started)
+
+            started = time.perf_counter()
+            for _, error, _ in split_engine.iter_exports(
+                partition, file_paths, output_format, excel_writer=excel_writer
+            ):
+                if error:
+                    raise RuntimeError(error)
+            record("export", started)
+
+            started = time.perf_counter()
+            split_engine.create_zip(file_paths, os.path.join(tmp, "out.zip"), tmp)
+            record("zip", started)
+
+            split_dir = os.path.join(tmp, "split")
+            os.makedirs(split_dir)
+            started = time.perf_counter()
+            split_engine.split_dataframe(
+                frame, keys, output_format, split_dir,
+                excel_writer=excel_writer, write_manifest=False,
+            )
+            record("split", started)
+
+    groups = len(partition)
+    return {
+        "groups": groups,
+        "seconds": {stage: round(value, 5) for stage, value in best.items()},
+        "rows_per_second": round(len(frame) / best["split"], 1) if best["split"] else None,
+    }
+
+
+def case_id(case: dict) -> str:
+    """Stable identifier of a benchmark case, used to match runs in --compare."""
+    return ",".join(f"{name}={case[name]}" for name in sorted(case))
+
+
+def environment() -> dict:
+    """Commit and versions the results were produced with."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(args: argparse.Namespace) -> list:
+    """Run the whole grid and return one result dict per case."""
+    results = []
+    grid = itertools.product(
+        args.rows, args.columns, args.cardinality, args.null_ratio, args.string_width
+    )
+    for rows, columns, cardinality, null_ratio, string_width in grid:
+        frame = make_frame(
+            rows, columns, args.keys, cardinality, null_ratio, string_width, seed=args.seed
+        )
+        keys = [f"key_{k}" for k in range(args.keys)]
+        with tempfile.TemporaryDirectory() as tmp:
+            for input_format in args.inputs:
+                input_path = write_input(frame, tmp, input_format)
+                for output_format in args.formats:
+                    case = {
+                        "rows": rows,
+                        "columns": columns,
+                        "keys": args.keys,
+                        "cardinality": cardinality,
+                        "null_ratio": null_ratio,
+                        "string_width": string_width,
+                        "input": input_format,
+                        "output": output_format,
+                    }
+                    if output_format == "excel":
+                        case["excel_writer"] = args.excel_writer
+                    print(f"Running {case_id(case)}", file=sys.stderr)
+                    measured = time_stages(
+                        input_path, keys, output_format, args.excel_writer, args.repeat
+                    )
+                    results.append({"case": case, **measured})
+    return results
+
+
+def compare(results: list, baseline_path: str) -> None:
+    """Print per-stage time ratios (current / baseline) for matching cases."""
+    with open(baseline_path, "r", encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    previous = {case_id(r["case"]): r for r in baseline.get("results", [])}
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('environment', {}).get('commit')}):")
+    print(f"{'case':<70}" + "".join(f"{stage:>9}" for stage in STAGES))
+    for result in results:
+        old = previous.get(case_id(result["case"]))
+        if old is None:
+            continue
+        ratios = []
+        for stage in STAGES:
+            before = old["seconds"].get(stage)
+            after = result["seconds"][stage]
+            ratios.append(f"{after / before:>8.2f}x" if before else f"{'-':>9}")
+        print(f"{case_id(result['case']):<70}" + "".join(ratios))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time each stage of the split pipeline.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000], help="Row counts")
+    parser.add_argument("--columns", type=int, nargs="+", default=[6], help="Non-key column counts")
+    parser.add_argument("--keys", type=int, default=1, help="Number of key columns")
+    parser.add_argument(
+        "--cardinality", type=int, nargs="+", default=[10, 1000], help="Distinct values per key"
+    )
+    parser.add_argument(
+        "--null-ratio", type=float, nargs="+", default=[0.0], help="Share of missing values"
+    )
+    parser.add_argument(
+        "--string-width", type=int, nargs="+", default=[12], help="Text value lengths"
+    )
+    parser.add_argument(
+        "--inputs", nargs="+", choices=sorted(INPUT_EXTENSIONS), default=["csv"],
+        help="Input file formats to load from",
+    )
+    parser.add_argument(
+        "--formats", nargs="+", choices=["csv", "excel"], default=["csv", "excel"],
+        help="Output formats",
+    )
+    parser.add_argument(
+        "--excel-writer", choices=split_engine.EXCEL_WRITERS, default=split_engine.DEFAULT_EXCEL_WRITER,
+        help="Excel writer backend for excel output",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the datasets")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results to compare against")
+    args = parser.parse_args()
+
+    report = {"environment": environment(), "results": run(args)}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'case':<70}{'groups':>8}" + "".join(f"{stage:>9}" for stage in STAGES))
+        for result in report["results"]:
+            seconds = result["seconds"]
+            print(
+                f"{case_id(result['case']):<70}{result['groups']:>8}"
+                + "".join(f"{seconds[stage]:>9.3f}" for stage in STAGES)
+            )
+    if args.compare:
+        compare(report["results"], args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
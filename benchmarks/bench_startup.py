@@ -0,0 +1,101 @@
+"""
+Benchmark desktop application startup.
+
+Measures, in fresh interpreters, how long importing split_by_column takes
+and whether pandas was imported on the way (it should only be imported on
+the first file load). With --window the application window is also built
+and the time until Tk is first idle is measured; this needs a display.
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 5
+    python benchmarks/bench_startup.py --window --json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+IMPORT_PROBE = """
+import sys, time
+started = time.perf_counter()
+import split_by_column
+elapsed = time.perf_counter() - started
+print(elapsed, "pandas" in sys.modules)
+"""
+
+WINDOW_PROBE = """
+import sys, time, tempfile, os
+started = time.perf_counter()
+import split_by_column
+import tkinter as tk
+os.environ["HOME"] = os.environ["USERPROFILE"] = tempfile.mkdtemp()
+root = tk.Tk()
+app = split_by_column.DataSplitterApp(root)
+
+def ready():
+    print(time.perf_counter() - started, "pandas" in sys.modules)
+    root.destroy()
+
+root.after_idle(ready)
+root.mainloop()
+"""
+
+
+def measure(probe: str, repeat: int) -> dict:
+    """Best-of-N seconds for one probe script run in fresh interpreters."""
+    timings = []
+    pandas_imported = False
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(output[-2]))
+        pandas_imported = pandas_imported or output[-1] == "True"
+    return {
+        "best_seconds": round(min(timings), 4),
+        "worst_seconds": round(max(timings), 4),
+        "pandas_imported": pandas_imported,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure desktop application startup.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per probe")
+    parser.add_argument(
+        "--window", action="store_true", help="Also build the window (needs a display)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from split_by_column import STARTUP_TARGET_SECONDS
+
+    results = {"import": measure(IMPORT_PROBE, args.repeat)}
+    if args.window:
+        results["window"] = measure(WINDOW_PROBE, args.repeat)
+    results["target_seconds"] = STARTUP_TARGET_SECONDS
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'probe':<10}{'best':>10}{'worst':>10}  pandas imported")
+        for name in ("import", "window"):
+            if name in results:
+                r = results[name]
+                print(
+                    f"{name:<10}{r['best_seconds']:>10.3f}{r['worst_seconds']:>10.3f}"
+                    f"  {'yes' if r['pandas_imported'] else 'no'}"
+                )
+        print(f"target: window ready within {STARTUP_TARGET_SECONDS:.1f} s")
+
+    slowest = results.get("window", results["import"])
+    within = slowest["best_seconds"] <= STARTUP_TARGET_SECONDS
+    return 0 if within and not results["import"]["pandas_imported"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,21 +20,126 @@ Author: Senior Python Developer
 Version: 2.0.0 - Enhanced with Preview & Multi-Select Listbox
 """
 
+import time
+
+# Start of the startup-time measurement (see STARTUP_TARGET_SECONDS)
+_MODULE_LOADED_AT = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import pandas as pd
+import tkinter.font as tkfont
+import json
 import os
 from datetime import datetime
-import zipfile
 import threading
 import traceback
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Set
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple, Set
 import logging
-import urllib.request
 import shutil
 import subprocess
 import sys
+import multiprocessing
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# split_engine imports pandas, which costs a large share of the startup
+# time; it is imported on first use (loading a file) instead. The window
+# is built from split_options, which has no third-party imports.
+import split_options
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import split_engine
+
+
+# How often queued progress/log updates from worker threads are applied to
+# the widgets (about 20 frames per second)
+UI_POLL_INTERVAL_MS = 50
+# Upper bound on queued messages handled per poll so the UI stays responsive
+UI_MAX_MESSAGES_PER_POLL = 5000
+# Lines kept in the activity log widget; older lines are dropped from the
+# view (the full history stays in app.log)
+DEFAULT_LOG_MAX_LINES = 2000
+LOG_VERBOSITY_CHOICES = ("Summary", "Detailed")
+# Delay before a column selection change recomputes the preview, so rapid
+# clicking only triggers one computation
+PREVIEW_DEBOUNCE_MS = 150
+PREVIEW_SAMPLE_ROWS = 30
+PREVIEW_SAMPLE_FILES = 10
+# Time from importing this module to the first idle window; exceeding it is
+# logged as a warning
+STARTUP_TARGET_SECONDS = 1.0
+# The Outfit font is resolved in the background: an installed family, the
+# bundled assets/fonts file, an earlier download, or a fresh download. A
+# failed download is remembered and not retried for a day, so offline
+# machines do not pay for it on every start.
+FONT_FAMILY = "Outfit"
+FONT_FILE_NAME = "Outfit-Regular.ttf"
+FONT_URL = "https://raw.githubusercontent.com/google/fonts/main/ofl/outfit/Outfit-Regular.ttf"
+FONT_DOWNLOAD_TIMEOUT_SECONDS = 10
+FONT_RETRY_SECONDS = 24 * 3600
+
+
+def _register_font_file(font_path: str) -> None:
+    """
+    Register a font file for this process (best effort, any thread).
+
+    Windows uses AddFontResourceExW (private to the process), macOS CoreText
+    with process scope and Linux adds the file to the current fontconfig
+    configuration. Failures are ignored; the caller checks whether the
+    family became visible to Tk.
+    """
+    if sys.platform.startswith("win"):
+        try:
+            from ctypes import windll
+            FR_PRIVATE = 0x10
+            # Registers font for this session
+            windll.gdi32.AddFontResourceExW(font_path, FR_PRIVATE, 0)
+            # Broadcast WM_FONTCHANGE so applications notice the new font
+            HWND_BROADCAST = 0xFFFF
+            WM_FONTCHANGE = 0x001D
+            windll.user32.SendMessageW(HWND_BROADCAST, WM_FONTCHANGE, 0, 0)
+        except Exception:
+            pass
+
+    elif sys.platform == "darwin":
+        # macOS: register the font for the current process using CoreText
+        try:
+            from ctypes import cdll, c_void_p, c_int, c_bool, c_char_p
+            coretext = cdll.LoadLibrary('/System/Library/Frameworks/CoreText.framework/CoreText')
+            cf = cdll.LoadLibrary('/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation')
+            CFURLCreateFromFileSystemRepresentation = cf.CFURLCreateFromFileSystemRepresentation
+            CFURLCreateFromFileSystemRepresentation.restype = c_void_p
+            CFURLCreateFromFileSystemRepresentation.argtypes = [c_void_p, c_char_p, c_int, c_bool]
+            encoded = font_path.encode('utf-8')
+            url = CFURLCreateFromFileSystemRepresentation(None, encoded, len(encoded), True)
+            CTFontManagerRegisterFontsForURL = coretext.CTFontManagerRegisterFontsForURL
+            CTFontManagerRegisterFontsForURL.argtypes = [c_void_p, c_int, c_void_p]
+            CTFontManagerRegisterFontsForURL.restype = c_bool
+            kCTFontManagerScopeProcess = 1
+            CTFontManagerRegisterFontsForURL(url, kCTFontManagerScopeProcess, None)
+        except Exception:
+            pass
+
+    else:
+        # Linux-ish: add the font to the application's current fontconfig
+        # configuration (NULL config = the current one)
+        try:
+            from ctypes import cdll, c_void_p, c_char_p
+            libfc = None
+            for libname in ("libfontconfig.so.1", "libfontconfig.so"):
+                try:
+                    libfc = cdll.LoadLibrary(libname)
+                    break
+                except OSError:
+                    continue
+            if libfc is not None:
+                FcConfigAppFontAddFile = libfc.FcConfigAppFontAddFile
+                FcConfigAppFontAddFile.argtypes = [c_void_p, c_char_p]
+                FcConfigAppFontAddFile(None, font_path.encode('utf-8'))
+        except Exception:
+            pass
 
 
 class DataSplitterApp:
@@ -53,48 +158,80 @@ class DataSplitterApp:
         )
         self._setup_file_logging()
 
-        # Define default fonts via a runtime helper that attempts to ensure
-        # the 'Outfit' family is available across platforms. If Outfit
-        # cannot be installed/registered, the helper returns a sensible
-        # fallback family name.
-        preferred = self._ensure_outfit_font()
-
-        self.default_font = (preferred, 10)
-        self.small_font = (preferred, 8)
-        self.button_font = (preferred, 9)
-        self.title_font = (preferred, 11, "bold")
-
-        # Monospace font for preview/logs; prefer Courier New, then Consolas, else fallback to preferred
-        try:
-            import tkinter.font as tkfont
-            families = set(tkfont.families())
-            mono_family = "Courier New" if "Courier New" in families else ("Consolas" if "Consolas" in families else preferred)
-        except Exception:
-            mono_family = "Courier New"
+        # Parsed inputs are cached next to the log so reopening an unchanged
+        # workbook does not parse it again
+        self.cache_dir = os.path.join(os.path.dirname(self.log_file_path), "cache")
+        # One JSON record per split run (stage timings, memory, throughput)
+        self.metrics_file_path = os.path.join(
+            os.path.dirname(self.log_file_path), "split_metrics.jsonl"
+        )
 
-        self.mono_font = (mono_family, 9)
-        # Slightly larger listbox font to increase perceived line height
-        self.listbox_font = (preferred, 9)
+        # Named Tk fonts shared by all widgets. They start in the platform
+        # default family so the window appears at once; Outfit is applied
+        # when the background font resolution finishes.
+        self.fonts_dir = os.path.join(os.path.dirname(self.log_file_path), "fonts")
+        self._font_loaded_source = "fallback"
+        self._create_fonts()
 
         # Application state
         self.input_file_path: Optional[str] = None
+        # Sheets of the loaded workbook (None for the first sheet)
+        self.input_sheets: "split_engine.SheetSelection" = None
         self.output_folder_path: Optional[str] = None
         self.dataframe: Optional[pd.DataFrame] = None
         self.all_columns: List[str] = []
         self.selected_columns: List[str] = []
         self.is_processing = False
+        self.is_loading = False
+        self.load_cancel_event: Optional[threading.Event] = None
+        self.load_generation = 0  # Identifies the current load; stale results are ignored
         self.split_groups_info: Dict = {}  # Store group info for preview
+        # Load stage of the current dataset, prepended to each split's metrics
+        self.load_metrics: Optional[split_engine.RunMetrics] = None
+
+        # Preview is computed off the UI thread from a per-dataset cache of
+        # key factorizations; stale computations are discarded by generation
+        self.grouping_cache: Optional[split_engine.GroupingCache] = None
+        self.preview_executor = ThreadPoolExecutor(max_workers=1)
+        self.preview_generation = 0
+        self._preview_after_id: Optional[str] = None
 
         # UI components storage
         self.column_listbox: Optional[tk.Listbox] = None
         self.output_format_var = tk.StringVar(value="csv")
+        # The preview lists file or sheet names depending on the format
+        self.output_format_var.trace_add("write", lambda *_: self._update_preview())
+        self.workers_var = tk.IntVar(value=min(4, os.cpu_count() or 1))
+        self.excel_writer_var = tk.StringVar(value=split_options.DEFAULT_EXCEL_WRITER)
+        self.zip_only_var = tk.BooleanVar(value=False)
+        self.resume_var = tk.BooleanVar(value=False)
+        self.read_as_text_var = tk.BooleanVar(value=False)
         self.progress_var = tk.DoubleVar(value=0)
         self.log_text: Optional[scrolledtext.ScrolledText] = None
+        self.log_line_count = 0
+        self.log_max_lines_var = tk.IntVar(value=DEFAULT_LOG_MAX_LINES)
+        # "Summary" keeps per-file (DETAIL) lines out of the log view; the
+        # flag mirrors the variable so worker threads never read Tk state
+        self.log_verbosity_var = tk.StringVar(value="Summary")
+        self.show_detail_logs = False
+        self.log_verbosity_var.trace_add(
+            "write",
+            lambda *_: setattr(
+                self, "show_detail_logs", self.log_verbosity_var.get() == "Detailed"
+            ),
+        )
         self.start_button: Optional[tk.Button] = None
         self.preview_text: Optional[scrolledtext.ScrolledText] = None
 
+        # Worker threads never touch Tk directly: progress, log lines and
+        # callbacks are queued here and applied by a periodic poller
+        self.ui_queue: "queue.Queue[tuple]" = queue.Queue()
+
         # Setup UI
         self._setup_ui()
+        self.root.after(UI_POLL_INTERVAL_MS, self._drain_ui_queue)
+        self.root.after_idle(self._start_font_resolution)
+        self.root.after_idle(self._report_startup_time)
 
         self.log("Application started successfully.")
 
@@ -134,9 +271,34 @@ class DataSplitterApp:
         )
         self.input_file_label.grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
 
-        ttk.Button(
-            file_frame, text="📁 Load Excel/CSV", command=self._load_file, width=25
-        ).grid(row=1, column=0, sticky=tk.W)
+        load_buttons = ttk.Frame(file_frame)
+        load_buttons.grid(row=1, column=0, sticky=tk.W)
+
+        self.load_button = ttk.Button(
+            load_buttons, text="📁 Load Excel/CSV", command=self._load_file, width=25
+        )
+        self.load_button.pack(side=tk.LEFT)
+
+        self.cancel_load_button = ttk.Button(
+            load_buttons, text="✖ Cancel", command=self._cancel_load, width=10
+        )
+        self.cancel_load_button.pack(side=tk.LEFT, padx=(5, 0))
+        self.cancel_load_button.config(state=tk.DISABLED)
+
+        ttk.Checkbutton(
+            file_frame,
+            text="Read values as text (verbatim output)",
+            variable=self.read_as_text_var,
+        ).grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+
+        self.reload_button = ttk.Button(
+            file_frame,
+            text="⟳ Reload selected columns only",
+            command=self._reload_selected_columns,
+            width=30,
+        )
+        self.reload_button.grid(row=3, column=0, sticky=tk.W, pady=(5, 0))
+        self.reload_button.config(state=tk.DISABLED)
 
         # Output Folder Selection
         output_frame = ttk.LabelFrame(left_frame, text="2. Output Folder", padding="10")
@@ -200,6 +362,69 @@ class DataSplitterApp:
             value="excel",
         ).pack(anchor=tk.W)
 
+        ttk.Radiobutton(
+            format_frame,
+            text="📑 Excel workbook (one sheet per group)",
+            variable=self.output_format_var,
+            value="excel-sheets",
+        ).pack(anchor=tk.W)
+
+        ttk.Radiobutton(
+            format_frame,
+            text="🧱 Parquet (one file per group)",
+            variable=self.output_format_var,
+            value="parquet",
+        ).pack(anchor=tk.W)
+
+        ttk.Radiobutton(
+            format_frame,
+            text="🪶 Feather (one file per group)",
+            variable=self.output_format_var,
+            value="feather",
+        ).pack(anchor=tk.W)
+
+        ttk.Radiobutton(
+            format_frame,
+            text="🗂 Parquet dataset (col=value folders)",
+            variable=self.output_format_var,
+            value="parquet-dataset",
+        ).pack(anchor=tk.W)
+
+        writer_row = ttk.Frame(format_frame)
+        writer_row.pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(writer_row, text="Excel writer:").pack(side=tk.LEFT)
+        ttk.Combobox(
+            writer_row,
+            textvariable=self.excel_writer_var,
+            values=split_options.EXCEL_WRITERS,
+            state="readonly",
+            width=16,
+        ).pack(side=tk.LEFT, padx=(5, 0))
+
+        workers_row = ttk.Frame(format_frame)
+        workers_row.pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(workers_row, text="Parallel workers:").pack(side=tk.LEFT)
+        tk.Spinbox(
+            workers_row,
+            from_=1,
+            to=max(1, os.cpu_count() or 1),
+            textvariable=self.workers_var,
+            width=4,
+            font=self.default_font,
+        ).pack(side=tk.LEFT, padx=(5, 0))
+
+        ttk.Checkbutton(
+            format_frame,
+            text="ZIP only (no loose files)",
+            variable=self.zip_only_var,
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+        ttk.Checkbutton(
+            format_frame,
+            text="Update previous split (skip unchanged groups)",
+            variable=self.resume_var,
+        ).pack(anchor=tk.W)
+
         # ===== RIGHT COLUMN: PREVIEW & PROGRESS =====
         right_frame = ttk.Frame(main_frame)
         right_frame.grid(row=0, column=1, rowspan=4, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(5, 0))
@@ -283,6 +508,13 @@ class DataSplitterApp:
         self.start_button.pack(side=tk.LEFT, padx=(0, 5))
         self.start_button.config(state=tk.DISABLED)
 
+        # Applies the current column selection to every file of a folder
+        self.batch_button = ttk.Button(
+            buttons_subframe, text="📚 Batch Folder...", command=self._start_batch, width=15
+        )
+        self.batch_button.pack(side=tk.LEFT, padx=(0, 5))
+        self.batch_button.config(state=tk.DISABLED)
+
         ttk.Button(buttons_subframe, text="🔄 Reset", command=self._reset_app, width=15).pack(
             side=tk.LEFT, padx=(0, 5)
         )
@@ -295,12 +527,33 @@ class DataSplitterApp:
         log_frame = ttk.LabelFrame(main_frame, text="📝 Activity Log", padding="10")
         log_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
         log_frame.columnconfigure(0, weight=1)
-        log_frame.rowconfigure(0, weight=1)
+        log_frame.rowconfigure(1, weight=1)
+
+        log_options = ttk.Frame(log_frame)
+        log_options.grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Label(log_options, text="Detail:").pack(side=tk.LEFT)
+        ttk.Combobox(
+            log_options,
+            textvariable=self.log_verbosity_var,
+            values=LOG_VERBOSITY_CHOICES,
+            state="readonly",
+            width=10,
+        ).pack(side=tk.LEFT, padx=(5, 15))
+        ttk.Label(log_options, text="Max lines:").pack(side=tk.LEFT)
+        tk.Spinbox(
+            log_options,
+            from_=100,
+            to=100000,
+            increment=100,
+            textvariable=self.log_max_lines_var,
+            width=7,
+            font=self.default_font,
+        ).pack(side=tk.LEFT, padx=(5, 0))
 
         self.log_text = scrolledtext.ScrolledText(
             log_frame, height=8, width=150, wrap=tk.WORD, bg="black", fg="white", font=("Courier New", 8)
         )
-        self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.log_text.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
         # Configure line spacing for log display as well
         try:
@@ -332,169 +585,136 @@ class DataSplitterApp:
         except Exception as e:
             print(f"Warning: Could not setup file logging: {e}")
 
-    def _ensure_outfit_font(self) -> str:
+    def _create_fonts(self) -> None:
+        """Create the named fonts used by the widgets, in the default family."""
+        try:
+            family = tkfont.nametofont("TkDefaultFont").actual("family")
+        except Exception:
+            family = "Segoe UI"
+        self.default_font = tkfont.Font(root=self.root, family=family, size=10)
+        self.small_font = tkfont.Font(root=self.root, family=family, size=8)
+        self.button_font = tkfont.Font(root=self.root, family=family, size=9)
+        self.title_font = tkfont.Font(root=self.root, family=family, size=11, weight="bold")
+        # Slightly larger listbox font to increase perceived line height
+        self.listbox_font = tkfont.Font(root=self.root, family=family, size=9)
+        # Monospace font for preview/logs; the family is refined once the
+        # installed families are known
+        self.mono_font = tkfont.Font(root=self.root, family="Courier New", size=9)
+
+    def _start_font_resolution(self) -> None:
         """
-        Ensure the 'Outfit' font family is available at runtime.
-
-        Strategy:
-        - If 'Outfit' already present in the system's font families, return it.
-        - Otherwise, attempt to download Outfit-Regular.ttf from the
-          Google Fonts repository and register it for the current session.
-          Registration is platform-specific:
-            - Windows: use AddFontResourceExW (private) via ctypes.
-            - macOS: copy into ~/Library/Fonts.
-            - Linux: copy into ~/.local/share/fonts and run fc-cache.
-        - If registration succeeds and the family becomes visible to Tk, return 'Outfit'.
-        - On any failure, return the system default family as a safe fallback.
-
-        Note: Download/registration is best-effort and behaves gracefully when
-        offline or when the current user lacks permission to install fonts.
+        Resolve the Outfit font without blocking the window (main thread).
+
+        Listing font families needs Tk, so it runs here once the window is
+        idle; finding, downloading and registering the font file runs on a
+        worker thread and _on_font_registered applies the result.
         """
         try:
-            import tkinter.font as tkfont
             families = set(tkfont.families())
-            if "Outfit" in families:
-                # Already installed system-wide
-                try:
-                    self._font_loaded_source = "system"
-                except Exception:
-                    pass
-                return "Outfit"
         except Exception:
             families = set()
+        for mono_family in ("Courier New", "Consolas"):
+            if mono_family in families:
+                self.mono_font.configure(family=mono_family)
+                break
+
+        if FONT_FAMILY in families:
+            self._apply_font_family("system")
+            return
+        threading.Thread(target=self._resolve_font_worker, daemon=True).start()
 
-        # Prefer a bundled font inside the project: ./fonts/Outfit-Regular.ttf
+    def _resolve_font_worker(self) -> None:
+        """Find or download the font file and register it (worker thread)."""
+        source = None
         try:
-            script_dir = Path(__file__).parent
+            font_path, source = self._locate_font_file()
+            if font_path:
+                _register_font_file(font_path)
         except Exception:
-            script_dir = Path(os.path.expanduser("~"))
-
-        bundled_font_path = script_dir / "fonts" / "Outfit-Regular.ttf"
+            source = None
+        self._call_in_ui(self._on_font_registered, source)
 
-        local_path = None
-        if bundled_font_path.exists():
-            local_path = str(bundled_font_path)
-            try:
-                self._font_loaded_source = "bundled"
-            except Exception:
-                pass
+    def _on_font_registered(self, source: Optional[str]) -> None:
+        """Switch the fonts to Outfit if registration made it visible (main thread)."""
+        try:
+            available = source is not None and FONT_FAMILY in set(tkfont.families())
+        except Exception:
+            available = False
+        if available:
+            self._apply_font_family(source)
         else:
-            # Prepare local fonts directory inside the user's Desktop as fallback
-            fonts_dir = os.path.join(os.path.expanduser("~"), "Desktop", "seperatebycolumn", "fonts")
-            try:
-                os.makedirs(fonts_dir, exist_ok=True)
-            except Exception:
-                fonts_dir = os.path.join(os.path.expanduser("~"), ".local_separatebycolumn_fonts")
-                os.makedirs(fonts_dir, exist_ok=True)
-
-            ttf_url = "https://raw.githubusercontent.com/google/fonts/main/ofl/outfit/Outfit-Regular.ttf"
-            local_path = os.path.join(fonts_dir, "Outfit-Regular.ttf")
-
-            try:
-                # Download if not present
-                if not os.path.exists(local_path):
-                    try:
-                        urllib.request.urlretrieve(ttf_url, local_path)
-                        try:
-                            self._font_loaded_source = "downloaded"
-                        except Exception:
-                            pass
-                    except Exception:
-                        # If download fails, give up gracefully
-                        local_path = None
-
-            except Exception:
-                local_path = None
-
-        if local_path and os.path.exists(local_path):
-                # Platform specific registration
-                if sys.platform.startswith("win"):
-                    try:
-                        from ctypes import windll
-                        FR_PRIVATE = 0x10
-                        # Registers font for this session
-                        windll.gdi32.AddFontResourceExW(local_path, FR_PRIVATE, 0)
-                        # Broadcast WM_FONTCHANGE so applications notice the new font
-                        HWND_BROADCAST = 0xFFFF
-                        WM_FONTCHANGE = 0x001D
-                        windll.user32.SendMessageW(HWND_BROADCAST, WM_FONTCHANGE, 0, 0)
-                    except Exception:
-                        pass
-
-                elif sys.platform == "darwin":
-                    # macOS: attempt to register font for the current process using CoreText
-                    try:
-                        from ctypes import cdll, c_void_p, c_int, c_bool, c_char_p
-                        coretext = cdll.LoadLibrary('/System/Library/Frameworks/CoreText.framework/CoreText')
-                        cf = cdll.LoadLibrary('/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation')
-                        CFURLCreateFromFileSystemRepresentation = cf.CFURLCreateFromFileSystemRepresentation
-                        CFURLCreateFromFileSystemRepresentation.restype = c_void_p
-                        CFURLCreateFromFileSystemRepresentation.argtypes = [c_void_p, c_char_p, c_int, c_bool]
-                        url = CFURLCreateFromFileSystemRepresentation(None, local_path.encode('utf-8'), len(local_path), True)
-                        CTFontManagerRegisterFontsForURL = coretext.CTFontManagerRegisterFontsForURL
-                        CTFontManagerRegisterFontsForURL.argtypes = [c_void_p, c_int, c_void_p]
-                        CTFontManagerRegisterFontsForURL.restype = c_bool
-                        kCTFontManagerScopeProcess = 1
-                        try:
-                            CTFontManagerRegisterFontsForURL(url, kCTFontManagerScopeProcess, None)
-                        except Exception:
-                            pass
-                    except Exception:
-                        # If CoreText registration is unavailable, do not copy or install
-                        pass
+            self._font_loaded_source = "system"
+
+    def _apply_font_family(self, source: str) -> None:
+        """Switch every named font to Outfit; widgets using them update in place."""
+        for font in (
+            self.default_font, self.small_font, self.button_font,
+            self.title_font, self.listbox_font,
+        ):
+            font.configure(family=FONT_FAMILY)
+        self._font_loaded_source = source
+
+    def _locate_font_file(self) -> Tuple[Optional[str], str]:
+        """
+        Path and source of the Outfit font file (worker thread).
 
-                else:
-                    # Linux-ish: attempt to add font to the application's fontconfig
-                    try:
-                        from ctypes import cdll, c_char_p
-                        # Try common lib names
-                        for libname in ("libfontconfig.so.1", "libfontconfig.so"):
-                            try:
-                                libfc = cdll.LoadLibrary(libname)
-                                break
-                            except Exception:
-                                libfc = None
-                        if libfc is not None:
-                            try:
-                                FcInitLoadConfigAndFonts = libfc.FcInitLoadConfigAndFonts
-                                FcInitLoadConfigAndFonts.restype = c_void_p
-                                config = FcInitLoadConfigAndFonts()
-                                FcConfigAppFontAddFile = libfc.FcConfigAppFontAddFile
-                                FcConfigAppFontAddFile.argtypes = [c_void_p, c_char_p]
-                                FcConfigAppFontAddFile.config = None
-                                FcConfigAppFontAddFile(config, local_path.encode('utf-8'))
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
+        Returns the bundled file, else an earlier download, else a fresh
+        download; (None, "fallback") when none is available or a download
+        failed less than FONT_RETRY_SECONDS ago.
+        """
+        script_dir = Path(getattr(sys, "_MEIPASS", Path(__file__).parent))
+        for candidate in (
+            script_dir / "assets" / "fonts" / FONT_FILE_NAME,
+            script_dir / "fonts" / FONT_FILE_NAME,
+        ):
+            if candidate.exists():
+                return str(candidate), "bundled"
+
+        local_path = os.path.join(self.fonts_dir, FONT_FILE_NAME)
+        if os.path.exists(local_path):
+            return local_path, "downloaded"
+
+        status_path = os.path.join(self.fonts_dir, "font_status.json")
+        try:
+            with open(status_path, "r", encoding="utf-8") as handle:
+                failed_at = float(json.load(handle).get("download_failed_at", 0))
+        except (OSError, ValueError, AttributeError):
+            failed_at = 0.0
+        if time.time() - failed_at < FONT_RETRY_SECONDS:
+            return None, "fallback"
 
-                # After registration attempt, refresh families and check
-                try:
-                    import tkinter.font as tkfont2
-                    families = set(tkfont2.families())
-                    if "Outfit" in families:
-                        return "Outfit"
-                except Exception:
-                    pass
-
-        # Final fallback: system default family or sensible Windows default
         try:
-            try:
-                self._font_loaded_source = "system"
-            except Exception:
-                pass
-            import tkinter.font as tkfont
-            return tkfont.nametofont("TkDefaultFont").actual().get("family", "Segoe UI")
+            import urllib.request
+
+            os.makedirs(self.fonts_dir, exist_ok=True)
+            with urllib.request.urlopen(FONT_URL, timeout=FONT_DOWNLOAD_TIMEOUT_SECONDS) as response:
+                data = response.read()
+            # Written under a temporary name so an interrupted download is
+            # never mistaken for a complete font file
+            with open(local_path + ".part", "wb") as handle:
+                handle.write(data)
+            os.replace(local_path + ".part", local_path)
+            return local_path, "downloaded"
         except Exception:
             try:
-                self._font_loaded_source = "fallback"
-            except Exception:
+                os.makedirs(self.fonts_dir, exist_ok=True)
+                with open(status_path, "w", encoding="utf-8") as handle:
+                    json.dump({"download_failed_at": time.time()}, handle)
+            except OSError:
                 pass
-            return "Segoe UI"
+            return None, "fallback"
+
+    def _report_startup_time(self) -> None:
+        """Log the time from module import to the idle window (main thread)."""
+        elapsed = time.perf_counter() - _MODULE_LOADED_AT
+        level = "INFO" if elapsed <= STARTUP_TARGET_SECONDS else "WARNING"
+        self.log(
+            f"Window ready in {elapsed:.2f} s (target {STARTUP_TARGET_SECONDS:.1f} s)", level
+        )
 
     def log(self, message: str, level: str = "INFO") -> None:
         """
-        Log a message to GUI, console, and file.
+        Log a message to GUI, console, and file. Safe to call from any thread.
 
         Args:
             message: Message to log
@@ -519,45 +739,124 @@ class DataSplitterApp:
         except Exception as e:
             print(f"Error writing to log file: {e}")
 
-        # GUI output
-        if self.log_text:
-            self.log_text.config(state=tk.NORMAL)
+        # Per-file lines are only rendered in detailed mode
+        if level == "DETAIL" and not self.show_detail_logs:
+            return
 
-            # Color coding
-            color_tag = "default"
-            if level == "ERROR":
-                color_tag = "error"
-            elif level == "WARNING":
-                color_tag = "warning"
-            elif level == "SUCCESS":
-                color_tag = "success"
-
-            # Configure tags if not exist
-            if not self.log_text.tag_ranges(color_tag):
-                if level == "ERROR":
-                    self.log_text.tag_configure(color_tag, foreground="red")
-                elif level == "WARNING":
-                    self.log_text.tag_configure(color_tag, foreground="yellow")
-                elif level == "SUCCESS":
-                    self.log_text.tag_configure(color_tag, foreground="lightgreen")
-
-            self.log_text.insert(tk.END, log_message + "\n", color_tag)
-            self.log_text.see(tk.END)
-            # Ensure consistent line spacing across the whole log
-            try:
-                self.log_text.tag_add("line_spacing", "1.0", tk.END)
-            except Exception:
-                pass
-            self.log_text.config(state=tk.DISABLED)
+        # GUI output (applied by the UI poller on the main thread)
+        color_tag = "default"
+        if level == "ERROR":
+            color_tag = "error"
+        elif level == "WARNING":
+            color_tag = "warning"
+        elif level == "SUCCESS":
+            color_tag = "success"
+        self.ui_queue.put(("log", log_message, color_tag))
+
+    def _call_in_ui(self, func, *args) -> None:
+        """Run func(*args) on the Tk main thread (safe to call from any thread)."""
+        self.ui_queue.put(("call", func, args))
+
+    def _drain_ui_queue(self) -> None:
+        """
+        Apply queued UI updates; runs periodically on the main thread.
 
+        Log lines are inserted in one batch and only the latest progress
+        update is shown, so a worker producing thousands of messages costs
+        one repaint per frame rather than one per message. Queued callbacks
+        run in order, after the updates queued before them.
+        """
+        log_lines: List[Tuple[str, str]] = []
+        latest_progress: Optional[Tuple[float, str]] = None
+
+        try:
+            for _ in range(UI_MAX_MESSAGES_PER_POLL):
+                kind, *payload = self.ui_queue.get_nowait()
+                if kind == "log":
+                    log_lines.append((payload[0], payload[1]))
+                elif kind == "progress":
+                    latest_progress = (payload[0], payload[1])
+                else:
+                    self._apply_ui_updates_logged(log_lines, latest_progress)
+                    log_lines, latest_progress = [], None
+                    func, args = payload
+                    try:
+                        func(*args)
+                    except Exception:
+                        self._report_ui_error(f"UI callback {getattr(func, '__name__', func)}")
+        except queue.Empty:
+            pass
+        finally:
+            # A failed update must not stop the poller, or progress and
+            # completion would silently stop being shown
+            self._apply_ui_updates_logged(log_lines, latest_progress)
+            self.root.after(UI_POLL_INTERVAL_MS, self._drain_ui_queue)
+
+    def _apply_ui_updates_logged(
+        self, log_lines: List[Tuple[str, str]], latest_progress: Optional[Tuple[float, str]]
+    ) -> None:
+        """_apply_ui_updates, reporting a failure instead of raising it."""
+        try:
+            self._apply_ui_updates(log_lines, latest_progress)
+        except Exception:
+            self._report_ui_error("UI update")
+
+    def _report_ui_error(self, what: str) -> None:
+        """
+        Write a failed UI update to the console and log file.
+
+        Not shown in the activity log: the failure may be in the log widget
+        itself, and queueing a message there could fail again on every poll.
+        """
+        details = traceback.format_exc()
+        print(f"{what} failed:\n{details}")
+        try:
+            logging.error(f"{what} failed:\n{details}")
+        except Exception:
+            pass
+
+    def _apply_ui_updates(
+        self, log_lines: List[Tuple[str, str]], latest_progress: Optional[Tuple[float, str]]
+    ) -> None:
+        """Write a batch of log lines and the latest progress to the widgets."""
+        if latest_progress is not None:
+            value, message = latest_progress
+            self.progress_var.set(value)
+            self.progress_label.config(text=message, fg="blue")
+
+        if not log_lines or not self.log_text:
+            return
+
+        try:
+            max_lines = max(100, int(self.log_max_lines_var.get()))
+        except (tk.TclError, ValueError):
+            max_lines = DEFAULT_LOG_MAX_LINES
+        # Messages that would be trimmed straight away are not inserted at all
+        log_lines = log_lines[-max_lines:]
+
+        self.log_text.config(state=tk.NORMAL)
+        # Tags are attached to the inserted text only, so each append costs
+        # the same regardless of how much is already in the log
+        for log_message, color_tag in log_lines:
+            self.log_text.insert(tk.END, log_message + "\n", (color_tag, "line_spacing"))
+            self.log_line_count += log_message.count("\n") + 1
+
+        excess = self.log_line_count - max_lines
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self.log_line_count -= excess
+
+        self.log_text.see(tk.END)
+        self.log_text.config(state=tk.DISABLED)
 
     def _load_file(self) -> None:
-        """Load Excel or CSV file and auto-detect columns."""
+        """Load an Excel, CSV, Parquet or Feather file and auto-detect columns."""
         file_path = filedialog.askopenfilename(
-            title="Select Excel or CSV file",
+            title="Select Excel, CSV, Parquet or Feather file",
             filetypes=[
                 ("Excel files", "*.xlsx *.xls"),
                 ("CSV files", "*.csv"),
+                ("Parquet/Feather files", "*.parquet *.feather"),
                 ("All files", "*.*"),
             ],
         )
@@ -566,59 +865,365 @@ class DataSplitterApp:
             return
 
         self.log(f"User selected file: {file_path}")
+        self._start_load(file_path)
+
+    def _reload_selected_columns(self) -> None:
+        """Reload the current file with only the selected columns."""
+        selected_columns = self._get_selected_columns()
+        if self.input_file_path is None or not selected_columns:
+            messagebox.showwarning("Column Selection", "Please select at least one column.")
+            return
+
+        self.log(f"Reloading with columns: {', '.join(map(str, selected_columns))}")
+        self._start_load(
+            self.input_file_path, usecols=selected_columns, sheets=self.input_sheets
+        )
+
+    def _start_load(
+        self,
+        file_path: str,
+        usecols: Optional[List[str]] = None,
+        sheets: "split_engine.SheetSelection" = None,
+    ) -> None:
+        """
+        Start loading file_path on a background thread.
+
+        Args:
+            file_path: File to load
+            usecols: Only load these columns (None = all columns)
+            sheets: Workbook sheets to load; None asks the user when the
+                workbook has several sheets
+        """
+        # Cancel a load that is still running; its result will be ignored
+        if self.load_cancel_event is not None:
+            self.load_cancel_event.set()
+
+        self.load_generation += 1
+        self.load_cancel_event = threading.Event()
+        self.is_loading = True
+        self.load_button.config(state=tk.DISABLED)
+        self.reload_button.config(state=tk.DISABLED)
+        self.cancel_load_button.config(state=tk.NORMAL)
+        self.start_button.config(state=tk.DISABLED)
+        self._update_progress(0, f"Loading {os.path.basename(file_path)}...")
+
+        thread = threading.Thread(
+            target=self._load_file_worker,
+            args=(
+                file_path,
+                self.load_generation,
+                self.load_cancel_event,
+                usecols,
+                "str" if self.read_as_text_var.get() else None,
+                sheets,
+            ),
+            daemon=True,
+        )
+        thread.start()
+
+    def _load_file_worker(
+        self,
+        file_path: str,
+        generation: int,
+        cancel_event: threading.Event,
+        usecols: Optional[List[str]] = None,
+        dtype: Optional[str] = None,
+        sheets: "split_engine.SheetSelection" = None,
+    ) -> None:
+        """
+        Read and validate the file on a background thread.
+
+        A workbook with several sheets is handed back to the main thread to
+        ask which sheets to load (unless sheets is given). For a new file
+        the header is probed first so the column list can be shown while
+        the data is still being parsed. The result (or error) is
+        handed back to the Tk main thread through the UI queue; nothing here
+        touches widgets directly.
+        """
+
+        def progress(value: float, message: str) -> None:
+            self._call_in_ui(self._on_load_progress, generation, value, message)
+
+        log = self.log
 
         try:
-            # Validate file exists
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File not found: {file_path}")
-
-            # Detect file type and read
-            if file_path.lower().endswith((".xlsx", ".xls")):
-                self.dataframe = pd.read_excel(file_path)
-                self.log("File loaded as Excel format")
-            elif file_path.lower().endswith(".csv"):
-                self.dataframe = pd.read_csv(file_path)
-                self.log("File loaded as CSV format")
-            else:
-                raise ValueError(
-                    "Invalid file format. Please use .xlsx, .xls, or .csv"
+            # The first load pays for importing pandas, off the UI thread
+            import split_engine
+        except ImportError as e:
+            details = traceback.format_exc()
+            self._call_in_ui(self._on_load_failed, generation, file_path, e, details)
+            return
+
+        if sheets is None and file_path.lower().endswith((".xlsx", ".xls")):
+            try:
+                sheet_names = split_engine.list_sheets(file_path)
+            except Exception:
+                # The full load below reports the problem
+                sheet_names = []
+            if len(sheet_names) > 1:
+                self._call_in_ui(self._on_sheets_listed, generation, file_path, sheet_names)
+                return
+
+        if usecols is None:
+            try:
+                columns = split_engine.probe_columns(file_path, sheets=sheets)
+            except Exception:
+                # The full load below reports the problem
+                columns = None
+            if columns:
+                self._call_in_ui(self._on_columns_probed, generation, columns)
+
+        metrics = split_engine.RunMetrics()
+        try:
+            with metrics.stage("load") as stage:
+                dataframe = split_engine.load_dataframe(
+                    file_path,
+                    cache_dir=self.cache_dir,
+                    progress=progress,
+                    cancel_event=cancel_event,
+                    log=log,
+                    usecols=usecols,
+                    dtype=dtype,
+                    sheets=sheets,
+                    # Arrow-backed text keeps the loaded dataset (and the
+                    # reordered copy a split makes) close to the file size
+                    text_storage="auto",
                 )
+                stage.rows += len(dataframe)
+                stage.bytes += os.path.getsize(file_path)
+        except Exception as e:
+            details = traceback.format_exc()
+            self._call_in_ui(self._on_load_failed, generation, file_path, e, details)
+            return
 
-            # Validate data
-            if self.dataframe is None or self.dataframe.empty:
-                raise ValueError("Dataset is empty")
+        self._call_in_ui(
+            self._on_load_complete, generation, file_path, dataframe, metrics, sheets
+        )
 
-            if len(self.dataframe.columns) == 0:
-                raise ValueError("No columns detected in dataset")
+    def _on_sheets_listed(self, generation: int, file_path: str, sheet_names: List[str]) -> None:
+        """Ask which sheets of a multi-sheet workbook to load, then load them (main thread)."""
+        if generation != self.load_generation:
+            return
 
-            self.input_file_path = file_path
-            self._update_input_label()
+        self._finish_loading()
+        self._update_progress(0, "Select the sheets to load")
+        sheets = self._ask_sheets(os.path.basename(file_path), sheet_names)
+        if sheets is None:
+            self._update_progress(0, "Ready")
+            self._update_start_button_state()
+            self.log("Sheet selection cancelled.", "WARNING")
+            return
 
-            # Auto-detect columns
-            self.all_columns = list(self.dataframe.columns)
-            self.log(f"Columns detected: {', '.join(self.all_columns)}")
-            self.log(f"Total rows: {len(self.dataframe)}")
+        if sheets == split_options.ALL_SHEETS:
+            self.log(f"Selected sheets: all {len(sheet_names)} sheets")
+        else:
+            self.log(f"Selected sheets: {sheets if isinstance(sheets, str) else ', '.join(sheets)}")
+        self._start_load(file_path, sheets=sheets)
+
+    def _ask_sheets(
+        self, file_name: str, sheet_names: List[str]
+    ) -> "split_engine.SheetSelection":
+        """
+        Modal dialog selecting one, several or all sheets of a workbook.
 
-            # Update UI - populate listbox
+        Returns:
+            A sheet name, a list of sheet names, split_options.ALL_SHEETS, or
+            None if the dialog was cancelled
+        """
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Select Sheets")
+        dialog.transient(self.root)
+        dialog.resizable(False, False)
+
+        ttk.Label(
+            dialog,
+            text=f"{file_name} has {len(sheet_names)} sheets. Select the sheets to load;\n"
+            f"several sheets are combined with a '{split_options.SHEET_COLUMN}' column\n"
+            "that can be selected as a split column.",
+            justify=tk.LEFT,
+        ).pack(anchor=tk.W, padx=10, pady=(10, 5))
+
+        listbox = tk.Listbox(
+            dialog, selectmode=tk.EXTENDED, height=min(len(sheet_names), 12),
+            exportselection=False, font=self.default_font,
+        )
+        for name in sheet_names:
+            listbox.insert(tk.END, name)
+        listbox.selection_set(0)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        choice: list = []
+
+        def accept(all_sheets: bool = False) -> None:
+            selected = [sheet_names[i] for i in listbox.curselection()]
+            if all_sheets or len(selected) == len(sheet_names):
+                choice.append(split_options.ALL_SHEETS)
+            elif len(selected) == 1:
+                choice.append(selected[0])
+            elif selected:
+                choice.append(selected)
+            else:
+                return
+            dialog.destroy()
+
+        buttons = ttk.Frame(dialog)
+        buttons.pack(pady=10)
+        ttk.Button(buttons, text="Load Selected", command=accept).pack(side=tk.LEFT)
+        ttk.Button(
+            buttons, text="Load All Sheets", command=lambda: accept(all_sheets=True)
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+
+        dialog.grab_set()
+        self.root.wait_window(dialog)
+        return choice[0] if choice else None
+
+    def _on_columns_probed(self, generation: int, columns: List[str]) -> None:
+        """List the probed columns of a file that is still loading (main thread)."""
+        if generation != self.load_generation:
+            return
+
+        # The previous dataset is replaced by the file being loaded
+        self.dataframe = None
+        self._release_grouping_cache()
+        self.load_metrics = None
+        self.input_file_path = None
+        self.input_sheets = None
+        self.preview_generation += 1
+        self.all_columns = list(columns)
+        self._populate_column_listbox()
+        self._set_preview_text([("Loading data... columns can be selected already.", "info")])
+        self.preview_info_label.config(text="⏳ Loading data...", fg="gray")
+
+    def _on_load_progress(self, generation: int, value: float, message: str) -> None:
+        """Show load progress (main thread)."""
+        if generation == self.load_generation and self.is_loading:
+            self._update_progress(value, message)
+
+    def _finish_loading(self) -> None:
+        """Restore the load controls after a load ends, fails or is cancelled."""
+        self.is_loading = False
+        self.load_cancel_event = None
+        self.load_button.config(state=tk.NORMAL)
+        self.cancel_load_button.config(state=tk.DISABLED)
+        if self.dataframe is not None:
+            self.reload_button.config(state=tk.NORMAL)
+        elif self.all_columns:
+            # Only probed columns were listed; there is no data behind them
+            self.all_columns = []
+            self.column_listbox.delete(0, tk.END)
+            self._set_preview_text([])
+
+    def _release_grouping_cache(self) -> None:
+        """
+        Drop the grouping cache of the previous dataset.
+
+        The cache is cleared as well, so a preview or split still holding it
+        does not keep the old key codes alive.
+        """
+        if self.grouping_cache is not None:
+            self.grouping_cache.clear()
+            self.grouping_cache = None
+
+    def _cancel_load(self) -> None:
+        """Cancel the running load; the UI is released immediately."""
+        if not self.is_loading or self.load_cancel_event is None:
+            return
+
+        self.load_cancel_event.set()
+        # Invalidate the running load so a late result is discarded
+        self.load_generation += 1
+        self._finish_loading()
+        self._update_progress(0, "Loading cancelled")
+        self.log("File loading cancelled by user.", "WARNING")
+        self._update_start_button_state()
+
+    def _on_load_complete(
+        self, generation: int, file_path: str, dataframe, metrics=None, sheets=None
+    ) -> None:
+        """Install a freshly loaded dataset (main thread)."""
+        if generation != self.load_generation:
+            return
+
+        import split_engine
+
+        self.dataframe = dataframe
+        self.load_metrics = metrics
+        self._release_grouping_cache()
+        self.grouping_cache = split_engine.GroupingCache(dataframe)
+        self._finish_loading()
+        lower_path = file_path.lower()
+        if lower_path.endswith(".csv"):
+            self.log("File loaded as CSV format")
+        elif lower_path.endswith(".parquet"):
+            self.log("File loaded as Parquet format")
+        elif lower_path.endswith(".feather"):
+            self.log("File loaded as Feather format")
+        else:
+            self.log("File loaded as Excel format")
+
+        self.input_file_path = file_path
+        self.input_sheets = sheets
+        self._update_input_label()
+
+        # Auto-detect columns; keep the listbox (and any selection made
+        # while loading) when it already shows the probed columns
+        columns = list(self.dataframe.columns)
+        if columns != self.all_columns:
+            self.all_columns = columns
             self._populate_column_listbox()
-            self._update_preview()
-            self._update_start_button_state()
+        self.log(f"Columns detected: {', '.join(map(str, self.all_columns))}")
+        self.log(f"Total rows: {len(self.dataframe)}")
+        self._update_progress(0, "Ready")
 
-        except FileNotFoundError as e:
-            self.log(f"File not found: {str(e)}", "ERROR")
-            messagebox.showerror("File Error", f"File not found:\n{str(e)}")
-        except ValueError as e:
-            self.log(f"Data validation error: {str(e)}", "ERROR")
-            messagebox.showerror("Data Error", f"Invalid data:\n{str(e)}")
-        except Exception as e:
-            self.log(f"Error loading file: {str(e)}", "ERROR")
-            self.log(traceback.format_exc(), "ERROR")
-            messagebox.showerror("Error", f"Error loading file:\n{str(e)}")
+        # Update UI
+        self._update_preview()
+        self._update_start_button_state()
+
+    def _on_load_failed(
+        self, generation: int, file_path: str, error: Exception, details: str
+    ) -> None:
+        """Report a failed load (main thread)."""
+        if generation != self.load_generation:
+            return
+
+        self._finish_loading()
+        self._update_progress(0, "Ready")
+        self._update_start_button_state()
+
+        if isinstance(error, ImportError):
+            self.log(f"Missing dependency: {str(error)}", "ERROR")
+            messagebox.showerror(
+                "Missing Dependency",
+                f"{str(error)}\n\nInstall the requirements with:\npip install -r requirements.txt",
+            )
+            return
+
+        import split_engine
+
+        if isinstance(error, split_engine.SplitCancelled):
+            self.log("File loading cancelled.", "WARNING")
+        elif isinstance(error, FileNotFoundError):
+            self.log(f"File not found: {str(error)}", "ERROR")
+            messagebox.showerror("File Error", f"File not found:\n{str(error)}")
+        elif isinstance(error, ValueError):
+            self.log(f"Data validation error: {str(error)}", "ERROR")
+            messagebox.showerror("Data Error", f"Invalid data:\n{str(error)}")
+        else:
+            self.log(f"Error loading file: {str(error)}", "ERROR")
+            self.log(details, "ERROR")
+            messagebox.showerror("Error", f"Error loading file:\n{str(error)}")
 
     def _update_input_label(self) -> None:
         """Update the input file label with the loaded file path."""
         if self.input_file_path:
             filename = os.path.basename(self.input_file_path)
+            if self.input_sheets == split_options.ALL_SHEETS:
+                filename += " (all sheets)"
+            elif isinstance(self.input_sheets, str):
+                filename += f" - {self.input_sheets}"
+            elif self.input_sheets:
+                filename += f" ({len(self.input_sheets)} sheets)"
             self.input_file_label.config(text=f"✓ {filename}", fg="green")
         else:
             self.input_file_label.config(text="No file selected", fg="gray")
@@ -665,8 +1270,10 @@ class DataSplitterApp:
         self.log(f"Column listbox populated with {len(self.all_columns)} columns")
 
     def _on_columns_selected(self, event=None) -> None:
-        """Handle column selection changes - update preview immediately."""
-        self._update_preview()
+        """Handle column selection changes - schedule a (debounced) preview update."""
+        if self._preview_after_id is not None:
+            self.root.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.root.after(PREVIEW_DEBOUNCE_MS, self._update_preview)
         self._update_start_button_state()
 
     def _get_selected_columns(self) -> List[str]:
@@ -693,134 +1300,163 @@ class DataSplitterApp:
 
         return selected_columns
 
+    def _set_preview_text(self, parts: List[Tuple[str, Optional[str]]]) -> None:
+        """Replace the preview text with (text, tag) parts."""
+        self.preview_text.config(state=tk.NORMAL)
+        self.preview_text.delete(1.0, tk.END)
+        for text, tag in parts:
+            if tag:
+                self.preview_text.insert(tk.END, text, (tag, "line_spacing"))
+            else:
+                self.preview_text.insert(tk.END, text, "line_spacing")
+        self.preview_text.config(state=tk.DISABLED)
+
     def _update_preview(self) -> None:
-        """Update preview section with sample data, groups, and planned filenames."""
+        """Start computing the preview for the current column selection."""
+        self._preview_after_id = None
         if self.preview_text is None or self.dataframe is None:
             return
 
-        self.preview_text.config(state=tk.NORMAL)
-        self.preview_text.delete(1.0, tk.END)
+        selected_columns = list(self._get_selected_columns())
+        self.preview_generation += 1
 
-        try:
-            selected_columns = self._get_selected_columns()
+        if not selected_columns:
+            self._set_preview_text([("Select columns from the list to see preview...", "info")])
+            self.preview_info_label.config(text="No columns selected", fg="gray")
+            return
 
-            if not selected_columns:
-                self.preview_text.insert(
-                    tk.END, "Select columns from the list to see preview...", "info"
-                )
-                self.preview_info_label.config(
-                    text="No columns selected", fg="gray"
-                )
-                # Apply spacing tag for consistent line height
-                try:
-                    self.preview_text.tag_add("line_spacing", "1.0", tk.END)
-                except Exception:
-                    pass
-                self.preview_text.config(state=tk.DISABLED)
-                return
+        self.preview_info_label.config(text="⏳ Computing preview...", fg="gray")
+        self.preview_executor.submit(
+            self._compute_preview,
+            self.preview_generation,
+            self.dataframe,
+            self.grouping_cache,
+            selected_columns,
+        )
 
-            # Display selected columns info
-            info_text = f"📊 Selected Columns: {', '.join(selected_columns)}\n"
-            info_text += f"📈 Total Rows: {len(self.dataframe)}\n"
-
-            # Get unique groups
-            if len(selected_columns) == 1:
-                unique_groups = self.dataframe[selected_columns[0]].nunique()
-                info_text += f"📁 Unique Groups: {unique_groups} (one per value)\n\n"
-                group_type = "Value-based"
-            elif len(selected_columns) == len(self.all_columns):
-                grouped = self.dataframe.groupby(selected_columns, dropna=False)
-                unique_groups = len(grouped)
-                info_text += f"📁 Unique Groups: {unique_groups} (one per unique row combination)\n\n"
-                group_type = "Combination-based (All)"
-            else:
-                grouped = self.dataframe.groupby(selected_columns, dropna=False)
-                unique_groups = len(grouped)
-                info_text += f"📁 Unique Groups: {unique_groups} (one per unique combination)\n\n"
-                group_type = "Combination-based"
-
-            self.preview_info_label.config(text=info_text, fg="black")
-
-            # Display sample data with selected columns only
-            sample_df = self.dataframe[selected_columns].head(30)
-            
-            self.preview_text.insert(tk.END, "═" * 100 + "\n", "header")
-            self.preview_text.insert(
-                tk.END, f"Sample Data (First 30 rows, {group_type}):\n", "header"
-            )
-            self.preview_text.insert(tk.END, "═" * 100 + "\n", "header")
+    def _compute_preview(
+        self,
+        generation: int,
+        dataframe,
+        cache: Optional["split_engine.GroupingCache"],
+        selected_columns: List[str],
+    ) -> None:
+        """
+        Compute group count, sample rows and sample filenames (worker thread).
 
-            # Display as formatted table
-            preview_str = sample_df.to_string(index=True)
-            self.preview_text.insert(tk.END, preview_str)
+        Skipped if a newer selection has been made in the meantime; results
+        are handed to _render_preview on the main thread.
+        """
+        if generation != self.preview_generation:
+            return
+        import split_engine
 
-            # Display planned filenames sample
-            self.preview_text.insert(tk.END, "\n\n" + "═" * 100 + "\n", "header")
-            self.preview_text.insert(
-                tk.END, "Sample Output Filenames (first 10):\n", "header"
+        try:
+            if cache is None or cache.dataframe is not dataframe:
+                cache = split_engine.GroupingCache(dataframe)
+            summary, sample_filenames = cache.sample_filenames(
+                selected_columns, sample_count=PREVIEW_SAMPLE_FILES
             )
-            self.preview_text.insert(tk.END, "═" * 100 + "\n", "header")
-
-            # Generate sample filenames
-            grouped = self.dataframe.groupby(selected_columns, dropna=False)
-            sample_filenames = self._generate_sample_filenames(
-                selected_columns, grouped, sample_count=10
+            sample_sheet_names = cache.sample_sheet_names(
+                selected_columns, sample_count=PREVIEW_SAMPLE_FILES
             )
+            sample_str = dataframe[selected_columns].head(PREVIEW_SAMPLE_ROWS).to_string(index=True)
+        except Exception as e:
+            self._call_in_ui(self._render_preview_error, generation, e)
+            return
 
-            for i, filename in enumerate(sample_filenames, 1):
-                ext = ".csv" if self.output_format_var.get() == "csv" else ".xlsx"
-                self.preview_text.insert(tk.END, f"{i:2d}. {filename}{ext}\n")
+        self._call_in_ui(
+            self._render_preview,
+            generation,
+            selected_columns,
+            len(dataframe),
+            summary.total_groups,
+            sample_str,
+            sample_filenames,
+            sample_sheet_names,
+        )
 
-            if unique_groups > 10:
-                self.preview_text.insert(
-                    tk.END,
-                    f"\n... and {unique_groups - 10} more files\n",
-                    "info",
-                )
+    def _render_preview(
+        self,
+        generation: int,
+        selected_columns: List[str],
+        total_rows: int,
+        unique_groups: int,
+        sample_str: str,
+        sample_filenames: List[str],
+        sample_sheet_names: Optional[List[str]] = None,
+    ) -> None:
+        """Show a computed preview (main thread)."""
+        if generation != self.preview_generation:
+            return
 
-            # Apply spacing tag for consistent line height
-            try:
-                self.preview_text.tag_add("line_spacing", "1.0", tk.END)
-            except Exception:
-                pass
-            self.preview_text.config(state=tk.DISABLED)
+        # Display selected columns info
+        info_text = f"📊 Selected Columns: {', '.join(selected_columns)}\n"
+        info_text += f"📈 Total Rows: {total_rows}\n"
 
-        except Exception as e:
-            self.preview_text.insert(tk.END, f"Error generating preview: {str(e)}", "error")
-            try:
-                self.preview_text.tag_add("line_spacing", "1.0", tk.END)
-            except Exception:
-                pass
-            self.preview_text.config(state=tk.DISABLED)
-            self.log(f"Preview error: {str(e)}", "WARNING")
+        if len(selected_columns) == 1:
+            info_text += f"📁 Unique Groups: {unique_groups} (one per value)\n\n"
+            group_type = "Value-based"
+        elif len(selected_columns) == len(self.all_columns):
+            info_text += f"📁 Unique Groups: {unique_groups} (one per unique row combination)\n\n"
+            group_type = "Combination-based (All)"
+        else:
+            info_text += f"📁 Unique Groups: {unique_groups} (one per unique combination)\n\n"
+            group_type = "Combination-based"
 
-    def _generate_sample_filenames(
-        self, selected_columns: List[str], grouped, sample_count: int = 10
-    ) -> List[str]:
-        """Generate sample filenames from first N groups."""
-        filenames = []
+        self.preview_info_label.config(text=info_text, fg="black")
 
-        for idx, (group_key, _) in enumerate(grouped):
-            if idx >= sample_count:
-                break
+        rule = "═" * 100 + "\n"
+        output_format = self.output_format_var.get()
+        if output_format == "excel-sheets" and sample_sheet_names is not None:
+            names, ext, kind = sample_sheet_names, "", "Sheet Names"
+        else:
+            # The Parquet dataset has one col=value folder per group, not a file
+            names, kind = sample_filenames, "Filenames"
+            ext = split_options.FORMAT_EXTENSIONS.get(output_format, " (dataset partition)")
+        parts: List[Tuple[str, Optional[str]]] = [
+            (rule, "header"),
+            (f"Sample Data (First {PREVIEW_SAMPLE_ROWS} rows, {group_type}):\n", "header"),
+            (rule, "header"),
+            # Display as formatted table
+            (sample_str, None),
+            ("\n\n" + rule, "header"),
+            (f"Sample Output {kind} (first {PREVIEW_SAMPLE_FILES}):\n", "header"),
+            (rule, "header"),
+        ]
+        for i, name in enumerate(names, 1):
+            parts.append((f"{i:2d}. {name}{ext}\n", None))
+
+        if unique_groups > PREVIEW_SAMPLE_FILES:
+            more = "sheets" if kind == "Sheet Names" else "files"
+            parts.append(
+                (f"\n... and {unique_groups - PREVIEW_SAMPLE_FILES} more {more}\n", "info")
+            )
 
-            filename = self._create_filename(selected_columns, group_key, "preview")
-            filenames.append(filename)
+        self._set_preview_text(parts)
 
-        return filenames
+    def _render_preview_error(self, generation: int, error: Exception) -> None:
+        """Show a preview failure (main thread)."""
+        if generation != self.preview_generation:
+            return
+        self._set_preview_text([(f"Error generating preview: {str(error)}", "error")])
+        self.log(f"Preview error: {str(error)}", "WARNING")
 
     def _update_start_button_state(self) -> None:
         """Enable/disable START button based on validation."""
         can_start = (
-            self.input_file_path is not None
+            not self.is_loading
+            and self.input_file_path is not None
             and self.output_folder_path is not None
             and len(self._get_selected_columns()) > 0
         )
 
         if can_start:
             self.start_button.config(state=tk.NORMAL)
+            self.batch_button.config(state=tk.NORMAL)
         else:
             self.start_button.config(state=tk.DISABLED)
+            self.batch_button.config(state=tk.DISABLED)
 
     def _start_split(self) -> None:
         """Start the split operation in a separate thread."""
@@ -839,6 +1475,24 @@ class DataSplitterApp:
         self.log(f"Split operation starting...")
         self.log(f"Selected columns: {', '.join(selected_columns)}")
         self.log(f"Output format: {output_format}")
+        excel_writer = self.excel_writer_var.get()
+        if output_format in ("excel", "excel-sheets"):
+            self.log(f"Excel writer: {excel_writer}")
+
+        try:
+            workers = max(1, int(self.workers_var.get()))
+        except (tk.TclError, ValueError):
+            workers = 1
+        keep_files = not self.zip_only_var.get()
+        if not keep_files:
+            self.log("Writing groups straight into the ZIP archive (no loose files)")
+        resume = self.resume_var.get()
+        if resume and not keep_files:
+            messagebox.showwarning(
+                "Update Previous Split",
+                "Updating a previous split needs the loose files; untick \"ZIP only\".",
+            )
+            return
 
         # Start split in separate thread to avoid UI freeze
         self.is_processing = True
@@ -846,325 +1500,262 @@ class DataSplitterApp:
 
         thread = threading.Thread(
             target=self._perform_split,
-            args=(selected_columns, output_format),
+            args=(selected_columns, output_format, workers, excel_writer, keep_files, resume),
             daemon=True,
         )
         thread.start()
 
-    def _perform_split(self, selected_columns: List[str], output_format: str) -> None:
+    def _perform_split(
+        self,
+        selected_columns: List[str],
+        output_format: str,
+        workers: int = 1,
+        excel_writer: str = split_options.DEFAULT_EXCEL_WRITER,
+        keep_files: bool = True,
+        resume: bool = False,
+    ) -> None:
         """
         Perform the actual split operation.
 
         Args:
             selected_columns: List of columns to split by
-            output_format: Output format ('csv' or 'excel')
+            output_format: Output format (see split_options.OUTPUT_FORMATS)
+            workers: Number of parallel export workers
+            excel_writer: Excel backend (see split_options.EXCEL_WRITERS)
+            keep_files: Also write loose files next to the ZIP archive
+            resume: Update the previous split folder, skipping unchanged groups
         """
-        try:
-            self._update_progress(5, "Preparing split operation...")
-            self.log(f"Starting split with columns: {', '.join(selected_columns)}")
-
-            # Get unique combinations
-            self._update_progress(10, "Computing unique groups...")
-
-            # Create a safe copy of the dataframe for grouping to avoid Pandas
-            # errors when columns are categorical and contain null-like values.
-            # We only sanitize the selected columns on the copy so original data
-            # remains unchanged for other operations.
-            safe_df = self.dataframe.copy()
-            for col in selected_columns:
-                try:
-                    # Convert to string and normalize common null representations to 'Unknown'
-                    safe_df[col] = (
-                        safe_df[col]
-                        .astype(str)
-                        .replace(["nan", "None", "<NA>", "NoneType", "NA", "NaN", ""], "Unknown")
-                        .fillna("Unknown")
-                    )
-                except Exception:
-                    # Fallback: ensure no nulls, then cast to string
-                    try:
-                        safe_df[col] = safe_df[col].fillna("Unknown").astype(str)
-                    except Exception:
-                        # If all else fails, create a column of 'Unknown'
-                        safe_df[col] = "Unknown"
-
-            if len(selected_columns) == 1:
-                # Single column: split by unique values (use sanitized copy)
-                split_groups = safe_df.groupby(selected_columns[0], dropna=False)
-                total_groups = len(split_groups)
-                self.log(f"Single column split: {total_groups} unique values found", "INFO")
-
-            elif len(selected_columns) == len(self.all_columns):
-                # All columns: each unique row combination (use sanitized copy)
-                split_groups = safe_df.groupby(selected_columns, dropna=False)
-                total_groups = len(split_groups)
-                self.log(
-                    f"All columns split: {total_groups} unique row combinations found",
-                    "INFO",
-                )
+        import split_engine
 
-            else:
-                # Multiple columns: split by unique combinations (use sanitized copy)
-                split_groups = safe_df.groupby(selected_columns, dropna=False)
-                total_groups = len(split_groups)
-                self.log(
-                    f"Multi-column split: {total_groups} unique combinations found",
-                    "INFO",
-                )
+        # Each split record starts with the load of the dataset it splits
+        metrics = self.load_metrics.copy() if self.load_metrics else split_engine.RunMetrics()
+        try:
+            result = split_engine.split_dataframe(
+                self.dataframe,
+                selected_columns,
+                output_format,
+                self.output_folder_path,
+                workers=workers,
+                excel_writer=excel_writer,
+                grouping_cache=self.grouping_cache,
+                keep_files=keep_files,
+                resume=resume,
+                metrics=metrics,
+                progress=self._update_progress,
+                log=self.log,
+            )
+            self.split_groups_info.update(result.group_rows)
+            self._write_metrics_record(
+                result, self.input_file_path, selected_columns, output_format, workers
+            )
 
-            # Guard against zero groups to avoid division by zero
-            if total_groups == 0:
-                self.log("No groups found to export.", "WARNING")
-                self._update_progress(100, "No groups to export")
-                self.is_processing = False
-                self.root.after(0, lambda: self.start_button.config(state=tk.NORMAL))
+            if not result.file_count and not result.errors:
                 return
 
-            self._update_progress(15, f"Exporting {total_groups} groups...")
-
-            # Create output directory for split files
-            # Prefer a descriptive folder name based on selected column(s)
-            try:
-                if len(selected_columns) == 1:
-                    base_folder = self._sanitize_string(selected_columns[0])
-                elif len(selected_columns) == len(self.all_columns):
-                    base_folder = "all_columns"
-                else:
-                    parts = [self._sanitize_string(c) for c in selected_columns]
-                    base_folder = "__".join(parts)
-            except Exception:
-                base_folder = "split_output"
-
-            # Keep folder name reasonably short
-            if len(base_folder) > 80:
-                base_folder = base_folder[:80]
-
-            split_output_dir = os.path.join(self.output_folder_path, base_folder)
-
-            # If folder exists, append a counter to avoid collisions
-            if os.path.exists(split_output_dir):
-                counter = 1
-                orig = split_output_dir
-                while os.path.exists(split_output_dir):
-                    split_output_dir = f"{orig}_{counter}"
-                    counter += 1
-
-            os.makedirs(split_output_dir, exist_ok=True)
-            self.log(f"Created output directory: {split_output_dir}", "INFO")
-
-            # Export each group
-            exported_files = []
-            errors = []
-
-            for idx, (group_key, group_data) in enumerate(split_groups):
-                try:
-                    # Create filename from group key
-                    filename = self._create_filename(
-                        selected_columns, group_key, mode="export"
-                    )
-
-                    extension = ".csv" if output_format == "csv" else ".xlsx"
-                    full_filename = f"{filename}{extension}"
-                    file_path = os.path.join(split_output_dir, full_filename)
-
-                    # Ensure unique filename if collision occurs
-                    original_path = file_path
-                    counter = 1
-                    while os.path.exists(file_path):
-                        name, ext = os.path.splitext(original_path)
-                        file_path = f"{name}_{counter}{ext}"
-                        counter += 1
-
-                    # Export based on format
-                    if output_format == "csv":
-                        group_data.to_csv(file_path, index=False)
-                    elif output_format == "excel":
-                        group_data.to_excel(file_path, index=False, engine="openpyxl")
-
-                    exported_files.append(file_path)
-                    # Track exported group info for future features
-                    try:
-                        # store without extension
-                        self.split_groups_info[filename] = len(group_data)
-                    except Exception:
-                        pass
-                    self.log(
-                        f"✓ Exported: {full_filename} ({len(group_data)} rows)",
-                        "INFO",
-                    )
-
-                except Exception as e:
-                    error_msg = f"Error exporting group {idx + 1}: {str(e)}"
-                    self.log(error_msg, "ERROR")
-                    errors.append(error_msg)
-
-                # Update progress
-                progress = 15 + (idx / total_groups) * 65
-                self._update_progress(
-                    progress,
-                    f"Exporting files... ({idx + 1}/{total_groups})",
-                )
-
-            if errors:
-                self.log(f"Completed with {len(errors)} errors", "WARNING")
-
-            self._update_progress(82, "Creating ZIP archive...")
-
-            # Create ZIP archive named after the output folder (sanitized)
-            try:
-                zip_base = os.path.basename(split_output_dir)
-                zip_base_safe = self._sanitize_string(zip_base)
-            except Exception:
-                zip_base_safe = "output_split"
-
-            zip_filename = f"{zip_base_safe}.zip"
-            zip_path = os.path.join(self.output_folder_path, zip_filename)
-
-            # Ensure unique zip filename
-            if os.path.exists(zip_path):
-                zcnt = 1
-                orig_zip = zip_path
-                while os.path.exists(zip_path):
-                    name, ext = os.path.splitext(orig_zip)
-                    zip_path = f"{name}_{zcnt}{ext}"
-                    zcnt += 1
-
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in exported_files:
-                    arcname = os.path.relpath(file_path, self.output_folder_path)
-                    zipf.write(file_path, arcname)
-
-            zip_size_mb = os.path.getsize(zip_path) / 1024 / 1024
-
-            self.log(f"✓ ZIP archive created: {os.path.basename(zip_path)} ({zip_size_mb:.2f} MB)", "SUCCESS")
-            self.log(
-                f"✓ Total files exported: {len(exported_files)}",
-                "SUCCESS",
-            )
-
-            self._update_progress(100, "✓ Split completed successfully!")
             self.log("=" * 80, "INFO")
             self.log("SPLIT OPERATION COMPLETED SUCCESSFULLY!", "SUCCESS")
             self.log("=" * 80, "INFO")
 
+            if output_format == "excel-sheets":
+                workbook_path = result.exported_files[0]
+                workbook_mb = os.path.getsize(workbook_path) / 1024 / 1024
+                self._call_in_ui(
+                    lambda: messagebox.showinfo(
+                        "Success",
+                        f"Split operation completed!\n\n"
+                        f"Workbook: {workbook_path}\n"
+                        f"Sheets: {len(result.group_rows)} of {result.total_groups} groups\n"
+                        f"Size: {workbook_mb:.2f} MB\n"
+                        f"Time: {result.elapsed_seconds:.1f} s "
+                        f"({result.rows_per_second:,.0f} rows/sec)",
+                    ),
+                )
+                return
+
+            zip_filename = os.path.basename(result.zip_path) if result.zip_path else "-"
+            zip_size_mb = result.zip_size_mb
+            output_dir = result.output_dir if result.exported_files else "- (ZIP only)"
+
             # Show success message
-            self.root.after(
-                0,
+            self._call_in_ui(
                 lambda: messagebox.showinfo(
                     "Success",
                     f"Split operation completed!\n\n"
-                    f"Total files: {len(exported_files)}\n"
-                    f"Output folder: {split_output_dir}\n"
+                    f"Total files: {result.file_count}"
+                    f"{f' ({result.skipped_groups} unchanged)' if result.skipped_groups else ''}\n"
+                    f"Output folder: {output_dir}\n"
                     f"ZIP file: {zip_filename}\n"
-                    f"ZIP size: {zip_size_mb:.2f} MB",
+                    f"ZIP size: {zip_size_mb:.2f} MB\n"
+                    f"Time: {result.elapsed_seconds:.1f} s "
+                    f"({result.rows_per_second:,.0f} rows/sec)",
                 ),
             )
 
         except Exception as e:
             self.log(f"Split operation failed: {str(e)}", "ERROR")
             self.log(traceback.format_exc(), "ERROR")
-            self.root.after(
-                0,
+            error_text = str(e)
+            self._call_in_ui(
                 lambda: messagebox.showerror(
-                    "Error", f"Split operation failed:\n{str(e)}"
+                    "Error", f"Split operation failed:\n{error_text}"
                 ),
             )
 
         finally:
             # Reset UI state
             self.is_processing = False
-            self.root.after(0, lambda: self.start_button.config(state=tk.NORMAL))
-            self.root.after(0, self._update_start_button_state)
+            self._call_in_ui(self.start_button.config, {"state": tk.NORMAL})
+            self._call_in_ui(self._update_start_button_state)
 
-    def _create_filename(
+    def _write_metrics_record(
         self,
+        result: "split_engine.SplitResult",
+        input_path: Optional[str],
         selected_columns: List[str],
-        group_key: Tuple,
-        mode: str = "export",  # 'export' or 'preview'
-    ) -> str:
-        """
-        Create a safe, readable filename from group key.
-
-        Naming rules:
-        - One column: <value>
-        - Multiple columns: ColumnA_ValueA__ColumnB_ValueB
-        - All columns: Group_001, Group_002, etc.
+        output_format: str,
+        workers: int,
+    ) -> None:
+        """Append the run's stage metrics to split_metrics.jsonl next to app.log."""
+        import split_engine
 
-        Args:
-            selected_columns: List of columns used for splitting
-            group_key: Tuple of values for this group
-            mode: 'export' for actual files, 'preview' for display
+        try:
+            split_engine.append_metrics_record(
+                self.metrics_file_path,
+                result.metrics_record(
+                    input=input_path,
+                    selected_columns=[str(c) for c in selected_columns],
+                    output_format=output_format,
+                    workers=workers,
+                ),
+            )
+        except Exception as e:
+            self.log(f"Could not write split metrics: {e}", "WARNING")
 
-        Returns:
-            Safe filename string (without extension)
-        """
-        # Special case: if all columns selected, use Group_NNN format
-        if len(selected_columns) == len(self.all_columns):
-            if mode == "export":
-                group_num = len(self.split_groups_info) + 1
-                return f"Group_{group_num:03d}"
-            else:
-                # For preview, just show Group_NNN
-                return f"Group_NNN"
+    def _start_batch(self) -> None:
+        """Split every file of a folder by the selected columns, in one job."""
+        if self.is_processing:
+            messagebox.showwarning("Processing", "A split operation is already in progress.")
+            return
 
-        # Single column: just the value
-        if len(selected_columns) == 1:
-            val_safe = self._sanitize_string(str(group_key[0]))
-            return val_safe
+        selected_columns = self._get_selected_columns()
+        if not selected_columns or not self.output_folder_path:
+            messagebox.showwarning(
+                "Batch Split", "Select the split columns and an output folder first."
+            )
+            return
 
-        # Multiple columns: ColumnA_ValueA__ColumnB_ValueB
-        parts = []
-        for col, value in zip(selected_columns, group_key):
-            col_safe = self._sanitize_string(str(col))
-            val_safe = self._sanitize_string(str(value))
-            parts.append(f"{col_safe}_{val_safe}")
+        folder = filedialog.askdirectory(title="Select Folder With Files To Split")
+        if not folder:
+            return
+        single_zip = messagebox.askyesno(
+            "Batch Split",
+            "Put the output of every file into one ZIP archive?\n\n"
+            "(No = one ZIP archive per file)",
+        )
 
-        return "__".join(parts)
+        output_format = self.output_format_var.get()
+        excel_writer = self.excel_writer_var.get()
+        try:
+            workers = max(1, int(self.workers_var.get()))
+        except (tk.TclError, ValueError):
+            workers = 1
+        if self.zip_only_var.get():
+            self.log("Batch splits keep the loose files; \"ZIP only\" is ignored", "WARNING")
 
-    def _sanitize_string(self, s: str) -> str:
-        """
-        Sanitize a string for use in filenames.
+        self.log(f"Batch split of {folder} starting...")
+        self.log(f"Selected columns: {', '.join(selected_columns)}")
+        self.is_processing = True
+        self.start_button.config(state=tk.DISABLED)
+        self.batch_button.config(state=tk.DISABLED)
 
-        Args:
-            s: String to sanitize
+        thread = threading.Thread(
+            target=self._perform_batch,
+            args=(
+                folder, selected_columns, output_format, workers, excel_writer,
+                single_zip, self.resume_var.get(),
+            ),
+            daemon=True,
+        )
+        thread.start()
 
-        Returns:
-            Sanitized string safe for filenames
+    def _perform_batch(
+        self,
+        folder: str,
+        selected_columns: List[str],
+        output_format: str,
+        workers: int,
+        excel_writer: str,
+        single_zip: bool,
+        resume: bool,
+    ) -> None:
         """
-        # Remove/replace invalid characters
-        invalid_chars = r'<>:"/\\|?*'
-        result = s
-
-        for char in invalid_chars:
-            result = result.replace(char, "_")
+        Run a batch split (worker thread).
 
-        # Replace spaces with underscores
-        result = result.replace(" ", "_")
+        The next file is loaded while the current one is exported; see
+        split_engine.split_batch. Every input gets a metrics record.
+        """
+        import split_engine
 
-        # Remove leading/trailing dots and spaces
-        result = result.strip(". ")
+        try:
+            batch = split_engine.split_batch(
+                [folder],
+                selected_columns,
+                output_format,
+                self.output_folder_path,
+                single_zip=single_zip,
+                workers=workers,
+                excel_writer=excel_writer,
+                cache_dir=self.cache_dir,
+                text_storage="auto",
+                resume=resume,
+                progress=self._update_progress,
+                log=self.log,
+            )
+            for input_path, result in batch.results.items():
+                self._write_metrics_record(
+                    result, input_path, selected_columns, output_format, workers
+                )
 
-        # Replace multiple underscores with single
-        while "__" in result and not result.startswith("__"):
-            result = result.replace("__", "_")
+            failed = "\n".join(
+                f"• {os.path.basename(path)}: {message}"
+                for path, message in list(batch.failures.items())[:10]
+            )
+            summary = (
+                f"Files split: {len(batch.results)} of "
+                f"{len(batch.results) + len(batch.failures)}\n"
+                f"Output files: {batch.file_count}\n"
+                f"Time: {split_engine.format_duration(batch.elapsed_seconds)}\n"
+                f"Report: {batch.report_path}"
+                + (f"\nZIP file: {os.path.basename(batch.zip_path)}" if batch.zip_path else "")
+                + (f"\n\nFailed:\n{failed}" if failed else "")
+            )
+            show = messagebox.showwarning if batch.failed else messagebox.showinfo
+            self._call_in_ui(lambda: show("Batch Split", summary))
 
-        # Limit length
-        if len(result) > 100:
-            result = result[:100]
+        except Exception as e:
+            self.log(f"Batch split failed: {str(e)}", "ERROR")
+            self.log(traceback.format_exc(), "ERROR")
+            error_text = str(e)
+            self._call_in_ui(
+                lambda: messagebox.showerror("Error", f"Batch split failed:\n{error_text}"),
+            )
 
-        return result if result else "empty"
+        finally:
+            self.is_processing = False
+            self._call_in_ui(self._update_start_button_state)
 
     def _update_progress(self, value: float, message: str) -> None:
         """
         Update progress bar and label.
 
+        Safe to call from worker threads: the update is queued and the UI
+        poller shows the most recent one on its next frame.
+
         Args:
             value: Progress value (0-100)
             message: Progress message
         """
-        self.progress_var.set(value)
-        self.progress_label.config(text=message, fg="blue")
-        self.root.update_idletasks()
+        self.ui_queue.put(("progress", value, message))
 
     def _reset_app(self) -> None:
         """Reset the application to initial state."""
@@ -1175,9 +1766,16 @@ class DataSplitterApp:
             )
             return
 
+        if self.is_loading:
+            self._cancel_load()
+
         self.input_file_path = None
+        self.input_sheets = None
         self.output_folder_path = None
         self.dataframe = None
+        self._release_grouping_cache()
+        self.load_metrics = None
+        self.preview_generation += 1
         self.all_columns = []
         self.selected_columns = []
         self.split_groups_info = {}
@@ -1191,6 +1789,12 @@ class DataSplitterApp:
         self.progress_var.set(0)
         self.progress_label.config(text="Ready")
         self.output_format_var.set("csv")
+        self.workers_var.set(min(4, os.cpu_count() or 1))
+        self.excel_writer_var.set(split_options.DEFAULT_EXCEL_WRITER)
+        self.zip_only_var.set(False)
+        self.resume_var.set(False)
+        self.read_as_text_var.set(False)
+        self.reload_button.config(state=tk.DISABLED)
 
         # Clear preview
         self.preview_text.config(state=tk.NORMAL)
@@ -1210,4 +1814,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the export process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,3461 @@
+"""
+Split by Column - Split Engine
+GUI-free loading, grouping, naming and export logic shared by the desktop
+application and the command line.
+
+Usage (command line):
+    python -m split_engine data.xlsx --columns Region --format csv --output out/
+
+Usage (Python):
+    from split_engine import split_file
+    result = split_file("data.xlsx", ["Region"], "csv", "out/")
+    print(result.zip_path, len(result.exported_files))
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import traceback
+import zipfile
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+# Formats and backend choices are defined in split_options, which the desktop
+# app can import without pandas; they are re-exported from here
+from split_options import (  # noqa: F401
+    ALL_SHEETS,
+    ARROW_FORMATS,
+    DEFAULT_EXCEL_WRITER,
+    EXCEL_READERS,
+    EXCEL_WRITERS,
+    FORMAT_EXTENSIONS,
+    OUTPUT_FORMATS,
+    SHEET_COLUMN,
+    SUPPORTED_INPUT_EXTENSIONS,
+    TEXT_STORAGES,
+    ZIP_COMPRESSIONS,
+)
+
+
+# Callback signatures used to report back to a UI (or the console).
+# progress(value, message) with value in 0-100; log(message, level) with
+# level one of INFO, WARNING, ERROR, SUCCESS or DETAIL. DETAIL marks
+# high-volume per-file/per-chunk lines that a UI may choose to summarise.
+ProgressCallback = Callable[[float, str], None]
+LogCallback = Callable[[str, str], None]
+
+# Outputs that are compressed already and gain nothing from ZIP deflate
+_PRECOMPRESSED_FORMATS = ("excel", "excel-sheets", "parquet", "feather", "parquet-dataset")
+
+# Values treated as missing when normalising key columns
+NULL_LIKE_VALUES = ["nan", "None", "<NA>", "NoneType", "NA", "NaN", ""]
+UNKNOWN_LABEL = "Unknown"
+
+
+@dataclass
+class StageMetrics:
+    """Resources used by one stage of a run."""
+
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    rows: int = 0
+    bytes: int = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows handled per second of wall time in this stage."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.rows / self.wall_seconds
+
+
+class RunMetrics:
+    """
+    Per-stage wall time, CPU time, peak memory and rows/bytes of one run.
+
+    Stages are measured with the stage() context manager. Entering a stage
+    again adds to it, which is how interleaved stages (export and zip) are
+    measured group by group. CPU time covers all threads of this process;
+    work done in export worker processes is not included. peak_rss_mb is the
+    process peak at the end of the stage, so it only grows from stage to
+    stage; a jump shows which stage raised it.
+    """
+
+    def __init__(self):
+        self.stages: "OrderedDict[str, StageMetrics]" = OrderedDict()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        """Time a block as (part of) stage name; add rows/bytes to the yielded object."""
+        metrics = self.stages.setdefault(name, StageMetrics())
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield metrics
+        finally:
+            metrics.wall_seconds += time.perf_counter() - wall
+            metrics.cpu_seconds += time.process_time() - cpu
+            metrics.peak_rss_mb = peak_rss_mb()
+
+    def copy(self) -> "RunMetrics":
+        """Independent copy, e.g. to start a split from the metrics of its load."""
+        clone = RunMetrics()
+        for name, metrics in self.stages.items():
+            clone.stages[name] = StageMetrics(**metrics.__dict__)
+        return clone
+
+    def summary_lines(self) -> List[str]:
+        """One human-readable line per stage."""
+        lines = []
+        for name, m in self.stages.items():
+            line = f"{name:<9} {m.wall_seconds:8.3f} s wall, {m.cpu_seconds:8.3f} s CPU"
+            if m.rows:
+                line += f", {m.rows:,} rows ({m.rows_per_second:,.0f}/s)"
+            if m.bytes:
+                line += f", {m.bytes / 1024 / 1024:,.1f} MB"
+            if m.peak_rss_mb is not None:
+                line += f", peak RSS {m.peak_rss_mb:,.0f} MB"
+            lines.append(line)
+        return lines
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Stages as plain dicts, in the order they first ran."""
+        return {
+            name: {
+                "wall_seconds": round(m.wall_seconds, 6),
+                "cpu_seconds": round(m.cpu_seconds, 6),
+                "peak_rss_mb": None if m.peak_rss_mb is None else round(m.peak_rss_mb, 1),
+                "rows": m.rows,
+                "bytes": m.bytes,
+            }
+            for name, m in self.stages.items()
+        }
+
+
+@dataclass
+class SplitResult:
+    """Outcome of a split run."""
+
+    output_dir: str
+    total_groups: int
+    exported_files: List[str] = field(default_factory=list)
+    group_rows: Dict[str, int] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    zip_path: Optional[str] = None
+    archive_members: List[str] = field(default_factory=list)
+    skipped_groups: int = 0
+    manifest_path: Optional[str] = None
+    rows_processed: int = 0
+    elapsed_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+
+    @property
+    def zip_size_mb(self) -> float:
+        """Size of the ZIP archive in MB (0 when no archive was written)."""
+        if self.zip_path and os.path.exists(self.zip_path):
+            return os.path.getsize(self.zip_path) / 1024 / 1024
+        return 0.0
+
+    @property
+    def file_count(self) -> int:
+        """Number of group files produced (loose files or archive members)."""
+        return max(len(self.exported_files), len(self.archive_members))
+
+    @property
+    def rows_per_second(self) -> float:
+        """Input rows processed per second of wall time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.rows_processed / self.elapsed_seconds
+
+    def metrics_record(self, **context) -> Dict:
+        """
+        JSON-serialisable summary of the run for throughput tracking.
+
+        Args:
+            **context: Extra fields stored with the record (input file,
+                selected columns, output format, ...)
+        """
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            **context,
+            "rows": self.rows_processed,
+            "groups": self.total_groups,
+            "files": self.file_count,
+            "skipped_groups": self.skipped_groups,
+            "errors": len(self.errors),
+            "elapsed_seconds": round(self.elapsed_seconds, 6),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "peak_rss_mb": None if self.peak_rss_mb is None else round(self.peak_rss_mb, 1),
+            "zip_bytes": (
+                os.path.getsize(self.zip_path)
+                if self.zip_path and os.path.exists(self.zip_path) else 0
+            ),
+            "stages": self.metrics.to_dict(),
+        }
+
+
+def append_metrics_record(path: str, record: Dict) -> None:
+    """Append one record to a JSON Lines file (one JSON object per line)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record, default=str) + "\n")
+
+
+class SplitCancelled(Exception):
+    """Raised when an operation is cancelled through its cancel event."""
+
+
+def _noop_progress(value: float, message: str) -> None:
+    pass
+
+
+def _noop_log(message: str, level: str = "INFO") -> None:
+    pass
+
+
+def format_duration(seconds: float) -> str:
+    """Short human-readable duration, e.g. "45 s", "3 min 05 s", "1 h 02 min"."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+
+
+class ProgressMeter:
+    """
+    Progress of one stage weighted by the work it has done.
+
+    Maps done/total units (rows or bytes) onto the [start, end] band of the
+    progress bar, so a group of a million rows moves the bar further than a
+    group of ten, and appends the throughput so far and an ETA to each
+    message.
+    """
+
+    def __init__(
+        self,
+        progress: ProgressCallback,
+        start: float,
+        end: float,
+        total: int,
+        unit: str = "rows",
+    ):
+        """
+        Args:
+            progress: Progress callback to report through
+            start: Progress value when nothing is done
+            end: Progress value when total units are done
+            total: Units of work in the stage
+            unit: "rows" or "bytes" (shown as MB/s)
+        """
+        self.progress = progress
+        self.start = start
+        self.end = end
+        self.total = max(int(total), 0)
+        self.unit = unit
+        self.done = 0
+        self._started = time.perf_counter()
+
+    def advance(self, amount: int, message: str) -> None:
+        """Add amount units of finished work and report."""
+        self.update(self.done + amount, message)
+
+    def update(self, done: int, message: str) -> None:
+        """Set the finished units of work and report."""
+        self.done = done
+        fraction = min(self.done / self.total, 1.0) if self.total else 1.0
+        elapsed = time.perf_counter() - self._started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        if rate > 0:
+            if self.unit == "bytes":
+                message += f" - {rate / 1024 / 1024:,.1f} MB/s"
+            else:
+                message += f" - {rate:,.0f} {self.unit}/s"
+            if self.done < self.total:
+                message += f", ETA {format_duration((self.total - self.done) / rate)}"
+        self.progress(self.start + fraction * (self.end - self.start), message)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of this process in MB.
+
+    Uses the resource module where available and falls back to psutil
+    (current RSS) on Windows; returns None if neither is available.
+    """
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        if sys.platform == "darwin":
+            return peak / 1024 / 1024
+        return peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 1024 / 1024
+    except Exception:
+        return None
+
+
+def _module_available(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def _require_pyarrow(purpose: str) -> None:
+    """Raise ValueError when the optional pyarrow dependency is missing."""
+    if not _module_available("pyarrow"):
+        raise ValueError(f"{purpose} requires the pyarrow package (pip install pyarrow)")
+
+
+def resolve_excel_reader(reader: str = "auto") -> Optional[str]:
+    """
+    Map an Excel reader choice to a pandas read_excel engine.
+
+    "auto" picks calamine (Rust-based, much faster than openpyxl) when the
+    optional python-calamine package is installed and otherwise lets pandas
+    choose its default engine (returns None).
+    """
+    if reader not in EXCEL_READERS:
+        raise ValueError(f"Unsupported Excel reader: {reader}")
+    if reader == "auto":
+        return "calamine" if _module_available("python_calamine") else None
+    if reader == "calamine" and not _module_available("python_calamine"):
+        raise ValueError(
+            "The calamine Excel reader requires the python-calamine package "
+            "(pip install python-calamine)"
+        )
+    return reader
+
+
+def _cache_paths(
+    cache_dir: str, file_path: str, sheet_name, options: str = ""
+) -> Tuple[str, str]:
+    """
+    Cache file stem for an input file and the prefix shared by all its versions.
+
+    Entries are named <path>-<sheet and options>-<size and mtime> (hashed),
+    so any change to the file produces a new entry. The prefix covers the
+    path, sheet and load options: a new version replaces only the entries
+    of the same sheet and options, other sheets and options stay cached.
+    """
+    abs_path = os.path.abspath(file_path)
+    stat = os.stat(abs_path)
+    path_hash = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:16]
+    key_hash = hashlib.sha1(f"{sheet_name!r}|{options}".encode("utf-8")).hexdigest()[:16]
+    version_hash = hashlib.sha1(
+        f"{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8")
+    ).hexdigest()[:16]
+    prefix = f"{path_hash}-{key_hash}-"
+    return os.path.join(cache_dir, prefix + version_hash), prefix
+
+
+def resolve_text_storage(text_storage: str = "default") -> bool:
+    """
+    Whether a text_storage choice stores text columns as Arrow strings.
+
+    "auto" picks Arrow when the optional pyarrow package is installed.
+    """
+    if text_storage not in TEXT_STORAGES:
+        raise ValueError(f"Unsupported text storage: {text_storage}")
+    if text_storage == "auto":
+        return _module_available("pyarrow")
+    if text_storage == "arrow":
+        _require_pyarrow("Arrow text storage")
+        return True
+    return False
+
+
+def to_arrow_strings(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store the text columns of a frame as pandas string[pyarrow].
+
+    Object columns holding only strings (and missing values) and pandas
+    string columns of another flavour are converted; their values then live
+    in contiguous Arrow buffers instead of one Python object per cell, which
+    typically takes a fraction of the memory. Mixed-type object columns,
+    numbers, dates and categories are left as they are.
+    """
+    arrow_string = pd.StringDtype("pyarrow")
+    converted = {}
+    for col, series in dataframe.items():
+        if isinstance(series.dtype, pd.StringDtype):
+            if series.dtype != arrow_string:
+                converted[col] = arrow_string
+        elif series.dtype == object and pd.api.types.infer_dtype(series) in ("string", "empty"):
+            converted[col] = arrow_string
+    return dataframe.astype(converted) if converted else dataframe
+
+
+def _arrow_string_types(arrow_type):
+    """types_mapper for Table.to_pandas: Arrow strings become string[pyarrow]."""
+    import pyarrow as pa
+
+    if arrow_type in (pa.string(), pa.large_string()):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def _read_cache(stem: str) -> Optional[pd.DataFrame]:
+    """
+    Read a cached frame (Arrow IPC, Parquet or pickle) if present.
+
+    Arrow IPC entries are memory-mapped: string and null-free numeric
+    columns reference the mapped file instead of being copied into memory,
+    so the operating system pages them in (and out) as they are used.
+    """
+    if os.path.exists(stem + ".arrow"):
+        try:
+            import pyarrow as pa
+
+            table = pa.ipc.open_file(pa.memory_map(stem + ".arrow", "r")).read_all()
+            return table.to_pandas(split_blocks=True, types_mapper=_arrow_string_types)
+        except Exception:
+            return None
+    if os.path.exists(stem + ".parquet"):
+        try:
+            return pd.read_parquet(stem + ".parquet")
+        except Exception:
+            return None
+    if os.path.exists(stem + ".pkl"):
+        try:
+            return pd.read_pickle(stem + ".pkl")
+        except Exception:
+            return None
+    return None
+
+
+def _write_cache(
+    stem: str, prefix: str, dataframe: pd.DataFrame, arrow_ipc: bool = False
+) -> Optional[str]:
+    """
+    Store a loaded frame in the cache and drop older versions of the same file.
+
+    With arrow_ipc the entry is an uncompressed Arrow IPC file that
+    _read_cache memory-maps. Otherwise Parquet (columnar) is used when
+    pyarrow is installed; frames these cannot represent (mixed-type object
+    columns, non-string column names) and installs without pyarrow fall
+    back to pickle. Writes are atomic and failures are ignored - the cache
+    is only an accelerator.
+    """
+    cache_dir = os.path.dirname(stem)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        return None
+
+    written = None
+    if arrow_ipc:
+        tmp = stem + ".arrow.tmp"
+        try:
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(dataframe, preserve_index=False)
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, stem + ".arrow")
+            written = stem + ".arrow"
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    if written is None and _module_available("pyarrow"):
+        tmp = stem + ".parquet.tmp"
+        try:
+            dataframe.to_parquet(tmp, index=False)
+            os.replace(tmp, stem + ".parquet")
+            written = stem + ".parquet"
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    if written is None:
+        tmp = stem + ".pkl.tmp"
+        try:
+            dataframe.to_pickle(tmp)
+            os.replace(tmp, stem + ".pkl")
+            written = stem + ".pkl"
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return None
+
+    # Remove stale entries for earlier versions of this input, sheet and options
+    try:
+        for name in os.listdir(cache_dir):
+            entry = os.path.join(cache_dir, name)
+            if name.startswith(prefix) and entry != written:
+                os.remove(entry)
+    except OSError:
+        pass
+    return written
+
+
+class _MonitoredFile(io.RawIOBase):
+    """
+    Raw binary file that reports how far it has been read.
+
+    Parsers read through it as through any file object; every read calls
+    on_read(position), which may raise (e.g. SplitCancelled) to abort the
+    parse from inside pandas.
+    """
+
+    def __init__(self, file_path: str, on_read: Callable[[int], None]):
+        super().__init__()
+        self._raw = open(file_path, "rb", buffering=0)
+        self._on_read = on_read
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+    def readinto(self, buffer) -> int:
+        count = self._raw.readinto(buffer)
+        self._on_read(self._raw.tell())
+        return count
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
+
+def _open_monitored(
+    file_path: str,
+    progress: ProgressCallback,
+    cancel_event: Optional[threading.Event],
+) -> io.BufferedReader:
+    """Open file_path for parsing with byte progress and cancellation checks."""
+    total_bytes = max(os.path.getsize(file_path), 1)
+    total_mb = total_bytes / 1024 / 1024
+    last_percent = [-1]
+
+    def on_read(position: int) -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            raise SplitCancelled("Loading cancelled")
+        percent = int(min(position / total_bytes, 1.0) * 100)
+        if percent != last_percent[0]:
+            last_percent[0] = percent
+            progress(
+                percent,
+                f"Reading file... {position / 1024 / 1024:.1f} / {total_mb:.1f} MB",
+            )
+
+    return io.BufferedReader(_MonitoredFile(file_path, on_read), buffer_size=1024 * 1024)
+
+
+# Sheet selection for Excel inputs: None (first sheet), one sheet name, a
+# list of sheet names or ALL_SHEETS
+SheetSelection = Union[None, str, Sequence[str]]
+
+
+def is_multi_sheet(sheets: SheetSelection) -> bool:
+    """Whether a sheet selection loads several sheets (with a SHEET_COLUMN)."""
+    return sheets is not None and (not isinstance(sheets, str) or sheets == ALL_SHEETS)
+
+
+def list_sheets(file_path: str, reader: str = "auto") -> List[str]:
+    """
+    Sheet names of a workbook, in workbook order.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    with pd.ExcelFile(file_path, engine=resolve_excel_reader(reader)) as book:
+        return [str(name) for name in book.sheet_names]
+
+
+def _resolve_sheets(sheets: SheetSelection, available: Sequence[str]) -> List[str]:
+    """
+    Sheet names selected by sheets, validated against the workbook's sheets.
+
+    Raises:
+        ValueError: If no sheet is selected or a selected sheet does not exist
+    """
+    if sheets is None:
+        names = list(available[:1])
+    elif sheets == ALL_SHEETS:
+        names = list(available)
+    elif isinstance(sheets, str):
+        names = [sheets]
+    else:
+        names = list(dict.fromkeys(sheets))
+    if not names:
+        raise ValueError("No sheets selected")
+    missing = [name for name in names if name not in available]
+    if missing:
+        raise ValueError(f"Sheets not found in workbook: {', '.join(missing)}")
+    return names
+
+
+def _sheet_read_options(read_options: Dict) -> Dict:
+    """
+    Per-sheet read options for a multi-sheet load.
+
+    SHEET_COLUMN is added after reading, not read, and usecols becomes a
+    filter because sheets need not share all columns (load_dataframe checks
+    that every column exists on at least one sheet).
+    """
+    options = dict(read_options)
+    if "usecols" in options:
+        wanted = set(options["usecols"])
+        options["usecols"] = lambda column: column in wanted
+    if isinstance(options.get("dtype"), dict):
+        options["dtype"] = options["dtype"].copy()
+        options["dtype"].pop(SHEET_COLUMN, None)
+    return options
+
+
+def _read_excel_sheets(
+    file_path: str,
+    sheets: SheetSelection,
+    engine: Optional[str],
+    read_options: Dict,
+    progress: ProgressCallback,
+    cancel_event: Optional[threading.Event],
+    log: LogCallback,
+) -> pd.DataFrame:
+    """
+    Read several sheets of a workbook into one frame with a SHEET_COLUMN.
+
+    The file is read from disk once and its sheets are parsed concurrently.
+    openpyxl and xlrd workbooks are opened once and shared by the workers;
+    a calamine workbook cannot be used from several threads, so each worker
+    opens its own reader over the same in-memory bytes.
+
+    Raises:
+        ValueError: If a selected sheet is missing or already has a
+            SHEET_COLUMN
+        SplitCancelled: If cancel_event was set during loading
+    """
+
+    def read_progress(value: float, message: str) -> None:
+        progress(value * 0.2, message)
+
+    with _open_monitored(file_path, read_progress, cancel_event) as source:
+        data = source.read()
+
+    options = _sheet_read_options(read_options)
+    shared = engine != "calamine"
+    with pd.ExcelFile(io.BytesIO(data), engine=engine) as book:
+        names = _resolve_sheets(sheets, [str(name) for name in book.sheet_names])
+
+        def parse(name: str) -> pd.DataFrame:
+            if cancel_event is not None and cancel_event.is_set():
+                raise SplitCancelled("Loading cancelled")
+            if shared:
+                return book.parse(name, **options)
+            with pd.ExcelFile(io.BytesIO(data), engine=engine) as own:
+                return own.parse(name, **options)
+
+        frames = {}
+        with ThreadPoolExecutor(max_workers=min(len(names), os.cpu_count() or 1)) as pool:
+            futures = {pool.submit(parse, name): name for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                frames[name] = future.result()
+                progress(
+                    20 + 80 * len(frames) / len(names),
+                    f"Parsed sheet '{name}' ({len(frames)}/{len(names)})",
+                )
+    log(
+        f"Excel file parsed with {engine or 'default'} reader: "
+        f"{len(names)} sheet(s) ({', '.join(names)})",
+        "INFO",
+    )
+
+    for name in names:
+        if SHEET_COLUMN in frames[name].columns:
+            raise ValueError(
+                f"Sheet '{name}' already has a '{SHEET_COLUMN}' column; "
+                "load its sheets one at a time instead"
+            )
+    ordered = [frames[name] for name in names]
+    dataframe = pd.concat(ordered, ignore_index=True, sort=False)
+    missing = [
+        c for c in read_options.get("usecols", [])
+        if c != SHEET_COLUMN and c not in dataframe.columns
+    ]
+    if missing:
+        raise ValueError(f"Columns not found in file: {', '.join(map(str, missing))}")
+    sheet_codes = np.repeat(np.arange(len(names)), [len(frame) for frame in ordered])
+    dataframe.insert(0, SHEET_COLUMN, pd.Categorical.from_codes(sheet_codes, categories=names))
+    # Concatenating categoricals with different categories yields object
+    # columns; restore the requested category dtypes over the union
+    dtypes = options.get("dtype")
+    if isinstance(dtypes, dict):
+        categories = [
+            col for col, kind in dtypes.items()
+            if kind == "category" and col in dataframe.columns
+        ]
+        if categories:
+            dataframe = dataframe.astype({col: "category" for col in categories})
+    return dataframe
+
+
+def probe_columns(
+    file_path: str, reader: str = "auto", sheets: SheetSelection = None
+) -> List:
+    """
+    Column names of a file, read from its header (or schema) only.
+
+    Much cheaper than a full load, so a UI can list the columns while the
+    data is still being parsed. For several Excel sheets the result is
+    SHEET_COLUMN followed by the union of the sheets' columns.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the extension is unsupported or a sheet is missing
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    lower_path = file_path.lower()
+    if lower_path.endswith(".csv"):
+        return list(pd.read_csv(file_path, nrows=0).columns)
+    if lower_path.endswith((".xlsx", ".xls")):
+        engine = resolve_excel_reader(reader)
+        if not is_multi_sheet(sheets):
+            return list(
+                pd.read_excel(file_path, sheet_name=sheets or 0, nrows=0, engine=engine).columns
+            )
+        columns = [SHEET_COLUMN]
+        with pd.ExcelFile(file_path, engine=engine) as book:
+            for name in _resolve_sheets(sheets, [str(n) for n in book.sheet_names]):
+                columns += [c for c in book.parse(name, nrows=0).columns if c not in columns]
+        return columns
+    if lower_path.endswith((".parquet", ".feather")):
+        _require_pyarrow("Reading Parquet/Feather files")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if lower_path.endswith(".parquet"):
+            schema = pq.read_schema(file_path)
+        else:
+            with pa.memory_map(file_path) as source:
+                schema = pa.ipc.open_file(source).schema
+        # Skip the columns pandas uses to store a non-default index
+        return [name for name in schema.names if not name.startswith("__index_level_")]
+    raise ValueError("Invalid file format. Please use .xlsx, .xls, .csv, .parquet or .feather")
+
+
+LoadDtype = Union[None, str, Dict[str, str]]
+
+
+def _reader_dtypes(dtype: LoadDtype, category_columns: Sequence[str]):
+    """dtype argument for read_csv/read_excel from the load options."""
+    categories = {col: "category" for col in category_columns}
+    if dtype == "str":
+        return defaultdict(lambda: str, categories)
+    if isinstance(dtype, dict):
+        return {**dtype, **categories}
+    return categories or None
+
+
+def load_dataframe(
+    file_path: str,
+    reader: str = "auto",
+    cache_dir: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+    cancel_event: Optional[threading.Event] = None,
+    log: Optional[LogCallback] = None,
+    usecols: Optional[Sequence[str]] = None,
+    dtype: LoadDtype = None,
+    category_columns: Optional[Sequence[str]] = None,
+    sheets: SheetSelection = None,
+    text_storage: str = "default",
+) -> pd.DataFrame:
+    """
+    Load an Excel, CSV, Parquet or Feather file and validate it.
+
+    Parquet and Feather files are read with their stored dtypes (dtype="str"
+    does not apply to them) and are never cached (they are columnar
+    already).
+
+    Args:
+        file_path: Path to a .xlsx, .xls, .csv, .parquet or .feather file
+        reader: Excel reader, one of EXCEL_READERS ("auto" prefers calamine)
+        cache_dir: Optional folder for a columnar cache of parsed files;
+            reloading an unchanged file is then served from the cache
+        progress: Optional callback receiving the share of bytes read (0-100)
+        cancel_event: Optional event; setting it aborts the read with
+            SplitCancelled at the parser's next read from the file
+        log: Optional log callback
+        usecols: Only load these columns (in file order)
+        dtype: None to infer types, "str" to read every value as text
+            exactly as written (no type or missing-value conversion, so
+            split files reproduce the input verbatim) or a {column: dtype}
+            mapping
+        category_columns: Columns to load as pandas category, typically
+            the split keys; saves memory on repetitive values
+        sheets: Excel sheets to load: None for the first sheet, a sheet
+            name, a list of sheet names or ALL_SHEETS. Several sheets are
+            concatenated (columns are matched by name) with the sheet name
+            in a leading SHEET_COLUMN; ignored for other file types
+        text_storage: One of TEXT_STORAGES. With Arrow storage text columns
+            are returned as string[pyarrow] (see to_arrow_strings), cache
+            entries are Arrow IPC files that later loads memory-map, and
+            Feather inputs are memory-mapped too
+
+    Returns:
+        Loaded DataFrame
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the extension is unsupported, a requested column or
+            sheet is missing or the dataset is empty
+        SplitCancelled: If cancel_event was set during loading
+    """
+    progress = progress or _noop_progress
+    log = log or _noop_log
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    lower_path = file_path.lower()
+    if not lower_path.endswith(SUPPORTED_INPUT_EXTENSIONS):
+        raise ValueError(
+            "Invalid file format. Please use .xlsx, .xls, .csv, .parquet or .feather"
+        )
+    is_excel = lower_path.endswith((".xlsx", ".xls"))
+    is_arrow = lower_path.endswith((".parquet", ".feather"))
+
+    usecols = list(usecols) if usecols else None
+    category_columns = list(category_columns or [])
+    if dtype is not None and dtype != "str" and not isinstance(dtype, dict):
+        raise ValueError(f"Unsupported dtype option: {dtype!r}")
+    read_options = {}
+    if usecols:
+        read_options["usecols"] = usecols
+    reader_dtypes = _reader_dtypes(dtype, category_columns)
+    if reader_dtypes is not None:
+        read_options["dtype"] = reader_dtypes
+    if dtype == "str":
+        read_options.update(keep_default_na=False, na_filter=False)
+
+    arrow_text = resolve_text_storage(text_storage)
+    multi_sheet = is_excel and is_multi_sheet(sheets)
+    if multi_sheet:
+        sheet_name = ALL_SHEETS if sheets == ALL_SHEETS else tuple(sheets)
+    else:
+        sheet_name = sheets if is_excel and sheets is not None else 0
+    dataframe = None
+    if is_arrow:
+        _require_pyarrow("Reading Parquet/Feather files")
+        progress(0, f"Reading {os.path.basename(file_path)}...")
+        if usecols:
+            missing = [c for c in usecols if c not in probe_columns(file_path)]
+            if missing:
+                raise ValueError(f"Columns not found in file: {', '.join(map(str, missing))}")
+        if lower_path.endswith(".parquet"):
+            dataframe = pd.read_parquet(file_path, columns=usecols)
+        elif arrow_text:
+            from pyarrow import feather
+
+            table = feather.read_table(file_path, columns=usecols, memory_map=True)
+            dataframe = table.to_pandas(split_blocks=True, types_mapper=_arrow_string_types)
+        else:
+            dataframe = pd.read_feather(file_path, columns=usecols)
+        # Stored types are kept; only explicit dtypes and categories apply
+        typed = {col: "category" for col in category_columns}
+        if isinstance(dtype, dict):
+            typed = {**dtype, **typed}
+        if typed:
+            dataframe = dataframe.astype(typed)
+        if cancel_event is not None and cancel_event.is_set():
+            raise SplitCancelled("Loading cancelled")
+        progress(100, f"Read {os.path.basename(file_path)}")
+    elif cache_dir:
+        options_key = repr(
+            (usecols, sorted(dtype.items()) if isinstance(dtype, dict) else dtype, category_columns)
+        ) + ("|arrow" if arrow_text else "")
+        stem, prefix = _cache_paths(
+            cache_dir, file_path, sheet_name if is_excel else None, options_key
+        )
+        dataframe = _read_cache(stem)
+        if dataframe is not None:
+            log(f"Loaded from cache: {os.path.basename(file_path)}", "INFO")
+
+    if dataframe is None and not is_arrow:
+        if multi_sheet:
+            dataframe = _read_excel_sheets(
+                file_path, sheets, resolve_excel_reader(reader), read_options,
+                progress, cancel_event, log,
+            )
+        else:
+            engine = resolve_excel_reader(reader) if is_excel else None
+            with _open_monitored(file_path, progress, cancel_event) as source:
+                if is_excel:
+                    dataframe = pd.read_excel(
+                        source, sheet_name=sheet_name, engine=engine, **read_options
+                    )
+                    log(f"Excel file parsed with {engine or 'default'} reader", "INFO")
+                else:
+                    dataframe = pd.read_csv(source, **read_options)
+        if cancel_event is not None and cancel_event.is_set():
+            raise SplitCancelled("Loading cancelled")
+        if arrow_text:
+            dataframe = to_arrow_strings(dataframe)
+
+        if cache_dir and dataframe is not None and not dataframe.empty:
+            _write_cache(stem, prefix, dataframe, arrow_ipc=arrow_text)
+    elif arrow_text:
+        # Parquet/Feather inputs and cache entries from other formats
+        dataframe = to_arrow_strings(dataframe)
+
+    if dataframe is None or dataframe.empty:
+        raise ValueError("Dataset is empty")
+
+    if len(dataframe.columns) == 0:
+        raise ValueError("No columns detected in dataset")
+
+    return dataframe
+
+
+# Characters replaced by "_" in filenames (invalid on Windows, plus space)
+_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?* ]')
+_REPEATED_UNDERSCORES = re.compile(r"__+")
+
+
+@lru_cache(maxsize=65536)
+def sanitize_string(s: str) -> str:
+    """
+    Sanitize a string for use in filenames.
+
+    Results are memoized, so values repeated across groups or key columns
+    are only sanitized once.
+
+    Args:
+        s: String to sanitize
+
+    Returns:
+        Sanitized string safe for filenames
+    """
+    # Replace invalid characters and spaces with underscores
+    result = _UNSAFE_FILENAME_CHARS.sub("_", s)
+
+    # Remove leading/trailing dots and spaces
+    result = result.strip(". ")
+
+    # Replace multiple underscores with single (names that start with a
+    # double underscore are left as they are)
+    if not result.startswith("__"):
+        result = _REPEATED_UNDERSCORES.sub("_", result)
+
+    # Limit length
+    if len(result) > 100:
+        result = result[:100]
+
+    return result if result else "empty"
+
+
+def sanitize_labels(labels: Sequence) -> np.ndarray:
+    """Sanitized filename part for each distinct key label (object array)."""
+    safe = np.empty(len(labels), dtype=object)
+    safe[:] = [sanitize_string(str(label)) for label in labels]
+    return safe
+
+
+def is_all_columns(selected_columns: Sequence[str], all_columns: Sequence[str]) -> bool:
+    """Return True when the selection covers every column of the dataset."""
+    return len(selected_columns) == len(all_columns)
+
+
+def create_filename(
+    selected_columns: Sequence[str],
+    group_key: Tuple,
+    all_columns: Sequence[str],
+    group_number: Optional[int] = None,
+) -> str:
+    """
+    Create a safe, readable filename from group key.
+
+    Naming rules:
+    - One column: <value>
+    - Multiple columns: ColumnA_ValueA__ColumnB_ValueB
+    - All columns: Group_001, Group_002, etc.
+
+    Args:
+        selected_columns: List of columns used for splitting
+        group_key: Tuple of values for this group
+        all_columns: All columns of the dataset
+        group_number: 1-based group index used for the all-columns case;
+            None renders the Group_NNN placeholder used by the preview
+
+    Returns:
+        Safe filename string (without extension)
+    """
+    # Special case: if all columns selected, use Group_NNN format
+    if is_all_columns(selected_columns, all_columns):
+        if group_number is None:
+            return "Group_NNN"
+        return f"Group_{group_number:03d}"
+
+    if not isinstance(group_key, tuple):
+        group_key = (group_key,)
+
+    # Single column: just the value
+    if len(selected_columns) == 1:
+        return sanitize_string(str(group_key[0]))
+
+    # Multiple columns: ColumnA_ValueA__ColumnB_ValueB
+    parts = []
+    for col, value in zip(selected_columns, group_key):
+        col_safe = sanitize_string(str(col))
+        val_safe = sanitize_string(str(value))
+        parts.append(f"{col_safe}_{val_safe}")
+
+    return "__".join(parts)
+
+
+def filename_table(
+    selected_columns: Sequence[str],
+    all_columns: Sequence[str],
+    safe_labels: Sequence[np.ndarray],
+    key_codes: np.ndarray,
+    numbered: bool = True,
+) -> List[str]:
+    """
+    Filenames of many groups at once, identical to create_filename.
+
+    Works on the factorized keys: every distinct label is sanitized once
+    (see sanitize_labels) and names are assembled with array operations
+    over the per-group label codes.
+
+    Args:
+        selected_columns: List of columns used for splitting
+        all_columns: All columns of the dataset
+        safe_labels: Sanitized labels of each key column
+        key_codes: (groups, key columns) array of label codes per group
+        numbered: Number the all-columns Group_NNN names by group; False
+            renders the Group_NNN placeholder used by the preview
+
+    Returns:
+        Filename (without extension) per group, in key_codes order
+    """
+    group_count = len(key_codes)
+    if is_all_columns(selected_columns, all_columns):
+        if not numbered:
+            return ["Group_NNN"] * group_count
+        return [f"Group_{number:03d}" for number in range(1, group_count + 1)]
+
+    if len(selected_columns) == 1:
+        return list(safe_labels[0][key_codes[:, 0]])
+
+    names = None
+    for position, (col, safe) in enumerate(zip(selected_columns, safe_labels)):
+        part = f"{sanitize_string(str(col))}_" + safe[key_codes[:, position]]
+        names = part if names is None else names + "__" + part
+    return list(names)
+
+
+def sheet_name_table(
+    selected_columns: Sequence[str],
+    all_columns: Sequence[str],
+    labels: Sequence[np.ndarray],
+    key_codes: np.ndarray,
+    numbered: bool = True,
+) -> List[str]:
+    """
+    Sheet names of many groups for the excel-sheets format.
+
+    Naming rules:
+    - One or more columns: the key values joined by " - " (sheet names are
+      short, so the column names are left out)
+    - All columns: Group_001, Group_002, etc.
+
+    The names are then made valid and unique by a SheetNameRegistry.
+
+    Args:
+        selected_columns: List of columns used for splitting
+        all_columns: All columns of the dataset
+        labels: Normalised labels of each key column
+        key_codes: (groups, key columns) array of label codes per group
+        numbered: Number the all-columns Group_NNN names by group
+
+    Returns:
+        Sheet name per group, in key_codes order
+    """
+    if is_all_columns(selected_columns, all_columns):
+        return filename_table(selected_columns, all_columns, [], key_codes, numbered)
+
+    names = None
+    for position, column_labels in enumerate(labels):
+        text = np.array([str(label) for label in column_labels], dtype=object)
+        part = text[key_codes[:, position]]
+        names = part if names is None else names + " - " + part
+    registry = SheetNameRegistry()
+    return [registry.claim(name) for name in names]
+
+
+def output_folder_name(selected_columns: Sequence[str], all_columns: Sequence[str]) -> str:
+    """Descriptive folder name for the split output based on the selected column(s)."""
+    try:
+        if len(selected_columns) == 1:
+            base_folder = sanitize_string(selected_columns[0])
+        elif is_all_columns(selected_columns, all_columns):
+            base_folder = "all_columns"
+        else:
+            parts = [sanitize_string(c) for c in selected_columns]
+            base_folder = "__".join(parts)
+    except Exception:
+        base_folder = "split_output"
+
+    # Keep folder name reasonably short
+    return base_folder[:80]
+
+
+class NameRegistry:
+    """
+    Collision-free output names, resolved in memory.
+
+    Each directory is listed once, on first use; after that names are
+    checked against the listing plus every name handed out so far, and a
+    per-name counter continues where the previous collision left off. Many
+    groups sanitizing to the same name therefore cost no extra filesystem
+    calls, which matters on network shares. Collisions are resolved with
+    the same _1, _2, ... suffixes as unique_path. With ignore_case (the
+    default on Windows and macOS) names differing only in case collide.
+    """
+
+    def __init__(self, ignore_case: Optional[bool] = None) -> None:
+        # Windows (NTFS) and macOS (APFS, HFS+) filesystems ignore case by
+        # default, so "North.csv" and "north.csv" would be the same file
+        if ignore_case is None:
+            ignore_case = sys.platform in ("win32", "darwin")
+        self.ignore_case = ignore_case
+        self._taken: Dict[str, set] = {}
+        self._counters: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _fold(self, name: str) -> str:
+        """Comparison form of a name or directory on the target filesystem."""
+        name = os.path.normcase(name)
+        return name.casefold() if self.ignore_case else name
+
+    def _names(self, directory: str) -> set:
+        names = self._taken.get(self._fold(directory))
+        if names is None:
+            try:
+                listing = os.listdir(directory) if directory else os.listdir(".")
+            except OSError:
+                listing = []
+            names = {self._fold(n) for n in listing}
+            self._taken[self._fold(directory)] = names
+        return names
+
+    def adopt(self, directory: str) -> None:
+        """Treat directory as empty: its existing files may be overwritten."""
+        with self._lock:
+            self._taken[self._fold(directory)] = set()
+
+    def claim(self, directory: str, name: str, extension: str = "") -> str:
+        """
+        Reserve a unique file or folder name in directory.
+
+        Args:
+            directory: Directory the name will be created in
+            name: Desired name without extension
+            extension: Extension including the dot ('' for folders)
+
+        Returns:
+            The reserved name (with extension)
+        """
+        with self._lock:
+            taken = self._names(directory)
+            candidate = f"{name}{extension}"
+            if self._fold(candidate) in taken:
+                key = (self._fold(directory), self._fold(name), self._fold(extension))
+                counter = self._counters.get(key, 1)
+                candidate = f"{name}_{counter}{extension}"
+                while self._fold(candidate) in taken:
+                    counter += 1
+                    candidate = f"{name}_{counter}{extension}"
+                self._counters[key] = counter + 1
+            taken.add(self._fold(candidate))
+            return candidate
+
+    def claim_path(self, path: str) -> str:
+        """Reserve a unique path; the extension is split off like unique_path does."""
+        directory, base = os.path.split(path)
+        name, extension = os.path.splitext(base)
+        return os.path.join(directory, self.claim(directory, name, extension))
+
+
+# Excel sheet names: at most 31 characters, none of []:*?/\ and unique
+# ignoring case; "History" is reserved by Excel
+EXCEL_SHEET_NAME_LIMIT = 31
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+# Rows per worksheet, including the header row
+EXCEL_MAX_ROWS = 1_048_576
+
+
+class SheetNameRegistry:
+    """
+    Valid, unique Excel sheet names for one workbook, resolved in memory.
+
+    Names are cleaned (invalid characters become "_", leading and trailing
+    apostrophes are dropped) and cut to 31 characters. Collisions are
+    checked case-insensitively, as Excel does, and resolved with _1, _2, ...
+    suffixes that fit within the limit; like NameRegistry, a per-name
+    counter continues where the previous collision left off, so many groups
+    truncating to the same name stay cheap.
+    """
+
+    def __init__(self) -> None:
+        self._taken = {"history"}
+        self._counters: Dict[str, int] = {}
+
+    def claim(self, name: str) -> str:
+        """Reserve a sheet name derived from name and return it."""
+        base = _INVALID_SHEET_CHARS.sub("_", str(name))[:EXCEL_SHEET_NAME_LIMIT]
+        base = base.strip("'").strip() or "Sheet"
+        candidate = base
+        if candidate.lower() in self._taken:
+            counter = self._counters.get(base.lower(), 1)
+            while True:
+                suffix = f"_{counter}"
+                candidate = base[:EXCEL_SHEET_NAME_LIMIT - len(suffix)] + suffix
+                if candidate.lower() not in self._taken:
+                    break
+                counter += 1
+            self._counters[base.lower()] = counter + 1
+        self._taken.add(candidate.lower())
+        return candidate
+
+
+def unique_path(path: str) -> str:
+    """Append _1, _2, ... before the extension until the path does not exist."""
+    if not os.path.exists(path):
+        return path
+    name, ext = os.path.splitext(path)
+    counter = 1
+    candidate = f"{name}_{counter}{ext}"
+    while os.path.exists(candidate):
+        counter += 1
+        candidate = f"{name}_{counter}{ext}"
+    return candidate
+
+
+def code_dtype(label_count: int) -> np.dtype:
+    """Smallest signed integer dtype holding the codes 0 .. label_count - 1."""
+    return np.min_scalar_type(-max(int(label_count), 1))
+
+
+def factorize_key_column(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Factorize one key column into integer codes over normalised string labels.
+
+    Only the distinct values are converted to strings; missing values and
+    null-like strings ("nan", "None", "<NA>", empty, ...) share the
+    "Unknown" label, exactly as the old astype(str)/replace sanitising did.
+
+    Args:
+        series: Key column to factorize
+
+    Returns:
+        (codes, labels) where labels is a sorted object array of strings,
+        labels[codes] reproduces the normalised column and codes use the
+        smallest integer dtype for the label count (see code_dtype)
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+
+    texts = pd.Series(uniques).astype(str).fillna(UNKNOWN_LABEL).to_numpy(dtype=object)
+    texts[np.isin(texts, NULL_LIKE_VALUES)] = UNKNOWN_LABEL
+    # Dedicated slot for missing values (factorize sentinel -1)
+    texts = np.append(texts, UNKNOWN_LABEL).astype(object)
+    codes = np.where(codes < 0, len(texts) - 1, codes)
+
+    # Different raw values may normalise to the same label (1 and "1",
+    # None and "None"); merge them and sort labels like groupby does.
+    labels, remap = np.unique(texts, return_inverse=True)
+    return remap.astype(code_dtype(len(labels)))[codes], labels
+
+
+def combine_key_codes(key_codes: Sequence[np.ndarray], label_counts: Sequence[int]) -> np.ndarray:
+    """
+    Combine per-column key codes into one dense group id per row.
+
+    Ids are re-ranked after each column so they stay dense (no overflow for
+    many columns) and ordered lexicographically by the key labels. They are
+    returned in the smallest integer dtype for the group count.
+    """
+    group_ids = np.zeros(len(key_codes[0]) if key_codes else 0, dtype=np.int64)
+    for codes, count in zip(key_codes, label_counts):
+        group_ids = group_ids * count + codes
+        _, group_ids = np.unique(group_ids, return_inverse=True)
+        group_ids = group_ids.reshape(-1)
+    group_count = int(group_ids.max()) + 1 if len(group_ids) else 0
+    return group_ids.astype(code_dtype(group_count))
+
+
+@dataclass
+class GroupSummary:
+    """Group count and the first few group keys for a column selection."""
+
+    total_groups: int
+    sample_keys: List[Tuple]
+    sample_codes: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.int64))
+
+
+class GroupingCache:
+    """
+    Per-dataset cache of key column factorizations and group ids.
+
+    Factorizing a column is the expensive part of both the preview and the
+    split; caching it per column makes re-selecting columns (or splitting
+    right after previewing) nearly free. Codes of the max_cached_columns
+    most recently used columns are kept (one small integer per row each),
+    group summaries are cached per column selection and the most recent
+    group id arrays are kept for reuse by Partition. Safe to share between
+    threads; clear() releases everything.
+    """
+
+    def __init__(
+        self,
+        dataframe: pd.DataFrame,
+        max_cached_groupings: int = 2,
+        max_cached_columns: int = 8,
+    ):
+        self.dataframe = dataframe
+        self.max_cached_groupings = max_cached_groupings
+        self.max_cached_columns = max_cached_columns
+        self._columns: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._safe_labels: Dict[str, np.ndarray] = {}
+        self._group_ids: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._summaries: Dict[Tuple, GroupSummary] = {}
+        self._lock = threading.Lock()
+
+    def column(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(codes, labels) of one key column, see factorize_key_column."""
+        with self._lock:
+            cached = self._columns.get(column)
+            if cached is not None:
+                self._columns.move_to_end(column)
+                return cached
+
+        cached = factorize_key_column(self.dataframe[column])
+        with self._lock:
+            self._columns[column] = cached
+            while len(self._columns) > self.max_cached_columns:
+                evicted, _ = self._columns.popitem(last=False)
+                self._safe_labels.pop(evicted, None)
+        return cached
+
+    def clear(self) -> None:
+        """Drop all cached codes, group ids and summaries."""
+        with self._lock:
+            self._columns.clear()
+            self._safe_labels.clear()
+            self._group_ids.clear()
+            self._summaries.clear()
+
+    def safe_labels(self, column: str) -> np.ndarray:
+        """Sanitized filename part of each label of a key column."""
+        with self._lock:
+            cached = self._safe_labels.get(column)
+        if cached is None:
+            cached = sanitize_labels(self.column(column)[1])
+            with self._lock:
+                self._safe_labels[column] = cached
+        return cached
+
+    def group_ids(self, columns: Sequence[str]) -> np.ndarray:
+        """Dense group id per row for the given key columns."""
+        key = tuple(columns)
+        with self._lock:
+            cached = self._group_ids.get(key)
+            if cached is not None:
+                self._group_ids.move_to_end(key)
+                return cached
+
+        factorized = [self.column(col) for col in columns]
+        group_ids = combine_key_codes(
+            [codes for codes, _ in factorized], [len(labels) for _, labels in factorized]
+        )
+        with self._lock:
+            self._group_ids[key] = group_ids
+            while len(self._group_ids) > self.max_cached_groupings:
+                self._group_ids.popitem(last=False)
+        return group_ids
+
+    def summary(self, columns: Sequence[str], sample_count: int = 10) -> GroupSummary:
+        """Number of groups and the keys of the first sample_count groups."""
+        key = (tuple(columns), sample_count)
+        with self._lock:
+            cached = self._summaries.get(key)
+        if cached is not None:
+            return cached
+
+        group_ids = self.group_ids(columns)
+        _, first_rows = np.unique(group_ids, return_index=True)
+        factorized = [self.column(col) for col in columns]
+        sample_rows = first_rows[:sample_count]
+        sample_codes = np.column_stack(
+            [codes[sample_rows] for codes, _ in factorized]
+        ).reshape(len(sample_rows), len(factorized))
+        sample_keys = [
+            tuple(labels[code] for (_, labels), code in zip(factorized, row_codes))
+            for row_codes in sample_codes
+        ]
+        summary = GroupSummary(
+            total_groups=len(first_rows), sample_keys=sample_keys, sample_codes=sample_codes
+        )
+        with self._lock:
+            self._summaries[key] = summary
+        return summary
+
+    def sample_filenames(
+        self, columns: Sequence[str], sample_count: int = 10
+    ) -> Tuple[GroupSummary, List[str]]:
+        """Summary plus the filenames of its sample groups (Group_NNN placeholder for all columns)."""
+        summary = self.summary(columns, sample_count)
+        names = filename_table(
+            columns,
+            list(self.dataframe.columns),
+            [self.safe_labels(col) for col in columns],
+            summary.sample_codes,
+            numbered=False,
+        )
+        return summary, names
+
+    def sample_sheet_names(self, columns: Sequence[str], sample_count: int = 10) -> List[str]:
+        """Sheet names of the summary's sample groups for the excel-sheets format."""
+        summary = self.summary(columns, sample_count)
+        return sheet_name_table(
+            columns,
+            list(self.dataframe.columns),
+            [self.column(col)[1] for col in columns],
+            summary.sample_codes,
+            numbered=False,
+        )
+
+
+def _normalised_buffer(
+    dataframe: pd.DataFrame,
+    key_columns: Sequence[str],
+    key_codes: Sequence[np.ndarray],
+    labels: Sequence[np.ndarray],
+    order: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Reorder a frame by order with its key columns replaced by normalised labels.
+
+    Only the non-key columns are copied by the reordering. Each key column
+    is rebuilt as a Categorical over its (few) normalised labels from the
+    factorization codes, so no full-length array of label strings is ever
+    built; writers see the same text values as before.
+    """
+    keys = dict(zip(key_columns, zip(key_codes, labels)))
+    is_key = [col in keys for col in dataframe.columns]
+    buffer = dataframe.loc[:, [not flag for flag in is_key]].take(order)
+    for position, (col, flag) in enumerate(zip(dataframe.columns, is_key)):
+        if flag:
+            codes, column_labels = keys[col]
+            buffer.insert(
+                position, col,
+                pd.Categorical.from_codes(codes[order], categories=column_labels),
+                allow_duplicates=True,
+            )
+    return buffer
+
+
+class Partition:
+    """
+    Rows of a DataFrame grouped by key, stored contiguously.
+
+    The key columns are factorized once, rows are reordered with a stable
+    argsort on the combined group code, and each group is a slice
+    [offsets[i], offsets[i + 1]) of the reordered buffer. Groups are in the
+    same sorted order as groupby(..., sort=True) on the sanitised keys and
+    rows keep their original order within a group. With normalise_keys the
+    key columns of the buffer hold the normalised text labels (as
+    categoricals, see _normalised_buffer); otherwise they keep their
+    original values and dtype.
+    """
+
+    def __init__(
+        self,
+        dataframe: pd.DataFrame,
+        key_columns: Sequence[str],
+        cache: Optional[GroupingCache] = None,
+        normalise_keys: bool = True,
+    ):
+        self.key_columns = list(key_columns)
+        self.all_columns = list(dataframe.columns)
+        self.normalise_keys = normalise_keys
+        if cache is not None and cache.dataframe is not dataframe:
+            cache = None
+        self._cache = cache
+        self._filenames: Optional[List[str]] = None
+
+        if cache is not None:
+            factorized = [cache.column(col) for col in self.key_columns]
+        else:
+            factorized = [factorize_key_column(dataframe[col]) for col in self.key_columns]
+        key_codes = [codes for codes, _ in factorized]
+        self.labels: List[np.ndarray] = [labels for _, labels in factorized]
+
+        if cache is not None:
+            group_ids = cache.group_ids(self.key_columns)
+        else:
+            group_ids = combine_key_codes(key_codes, [len(labels) for labels in self.labels])
+
+        counts = np.bincount(group_ids) if len(group_ids) else np.zeros(0, dtype=np.int64)
+        self.offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+
+        order = np.argsort(group_ids, kind="stable")
+        first_rows = order[self.offsets[:-1]]
+        self.key_codes = np.column_stack(
+            [codes[first_rows] for codes in key_codes]
+        ) if key_codes else np.zeros((0, 0), dtype=np.int64)
+
+        if normalise_keys:
+            self.buffer = _normalised_buffer(
+                dataframe, self.key_columns, key_codes, self.labels, order
+            )
+        else:
+            self.buffer = dataframe.take(order)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self.group_key(idx), self.group(idx)
+
+    def group_key(self, idx: int) -> Tuple:
+        """Normalised key values of group idx."""
+        return tuple(
+            labels[code] for labels, code in zip(self.labels, self.key_codes[idx])
+        )
+
+    def filenames(self) -> List[str]:
+        """Output filename (without extension) of every group, see filename_table."""
+        if self._filenames is None:
+            if self._cache is not None:
+                safe_labels = [self._cache.safe_labels(col) for col in self.key_columns]
+            else:
+                safe_labels = [sanitize_labels(labels) for labels in self.labels]
+            self._filenames = filename_table(
+                self.key_columns, self.all_columns, safe_labels, self.key_codes
+            )
+        return self._filenames
+
+    def sheet_names(self) -> List[str]:
+        """Unique sheet name of every group for excel-sheets, see sheet_name_table."""
+        return sheet_name_table(self.key_columns, self.all_columns, self.labels, self.key_codes)
+
+    def group_size(self, idx: int) -> int:
+        """Number of rows in group idx."""
+        return int(self.offsets[idx + 1] - self.offsets[idx])
+
+    def group(self, idx: int) -> pd.DataFrame:
+        """Rows of group idx as a slice of the reordered buffer."""
+        return self.buffer.iloc[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def detached_group(self, idx: int) -> pd.DataFrame:
+        """
+        Rows of group idx, with key columns that do not reference all labels.
+
+        A slice of a normalised key column still carries every label of the
+        column as its categories, which is what gets pickled when the group
+        is sent to a worker process. Within a group each key column holds a
+        single label, so it is rebuilt as a one-category Categorical; the
+        values are the same as in group(idx).
+        """
+        group = self.group(idx)
+        if not self.normalise_keys or not self.key_columns:
+            return group
+        group = group.copy(deep=False)
+        zeros = np.zeros(len(group), dtype=np.int8)
+        for col, label in zip(self.key_columns, self.group_key(idx)):
+            group[col] = pd.Categorical.from_codes(zeros, categories=[label])
+        return group
+
+
+def _excel_columns(frame: pd.DataFrame) -> List[list]:
+    """Column values as Python lists with missing values as None."""
+    columns = []
+    for _, col in frame.items():
+        values = col.astype(object)
+        columns.append(values.where(col.notna(), None).tolist())
+    return columns
+
+
+def write_xlsx_streaming(frame: pd.DataFrame, file_path) -> None:
+    """
+    Write a frame to XLSX with openpyxl's write-only workbook.
+
+    Rows are streamed to the worksheet XML instead of building a cell object
+    graph, which is several times faster than to_excel for large groups.
+    The header row is written without pandas' bold/border styling.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title="Sheet1")
+    sheet.append([str(c) for c in frame.columns])
+    for row in zip(*_excel_columns(frame)):
+        sheet.append(row)
+    workbook.save(file_path)
+
+
+def write_xlsx_xlsxwriter(frame: pd.DataFrame, file_path) -> None:
+    """
+    Write a frame to XLSX with xlsxwriter in constant_memory mode.
+
+    Rows are flushed to disk as soon as they are complete, so memory does
+    not grow with the group size. Requires the optional xlsxwriter package.
+    """
+    workbook = _xlsxwriter_workbook(file_path)
+    try:
+        _write_xlsxwriter_sheet(workbook.add_worksheet("Sheet1"), frame)
+    finally:
+        workbook.close()
+
+
+def _xlsxwriter_workbook(file_path):
+    """xlsxwriter workbook in constant_memory mode (ValueError if not installed)."""
+    try:
+        import xlsxwriter
+    except ImportError:
+        raise ValueError(
+            "The xlsxwriter Excel writer requires the xlsxwriter package "
+            "(pip install xlsxwriter)"
+        )
+
+    return xlsxwriter.Workbook(
+        file_path,
+        {
+            # Serialising to a buffer needs in-memory mode (no temp files)
+            "in_memory": isinstance(file_path, io.BytesIO),
+            "constant_memory": True,
+            "nan_inf_to_errors": True,
+            "remove_timezone": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+        },
+    )
+
+
+def _write_xlsxwriter_sheet(sheet, frame: pd.DataFrame) -> None:
+    """Write a header row and the frame's rows to an xlsxwriter worksheet."""
+    sheet.write_row(0, 0, [str(c) for c in frame.columns])
+    for row_idx, row in enumerate(zip(*_excel_columns(frame)), start=1):
+        sheet.write_row(row_idx, 0, row)
+
+
+class XlsxSheetWriter:
+    """
+    One XLSX workbook written sheet by sheet with a streaming backend.
+
+    "xlsxwriter" uses constant_memory mode; the openpyxl writers use
+    openpyxl's write-only workbook (also for "openpyxl", which otherwise
+    builds the whole workbook in memory). Each sheet's rows go to a
+    temporary part as they are written and close() compresses the workbook
+    in one pass, so memory does not grow with the number of groups.
+    """
+
+    def __init__(self, file_path: str, excel_writer: str = DEFAULT_EXCEL_WRITER):
+        if excel_writer not in EXCEL_WRITERS:
+            raise ValueError(f"Unsupported Excel writer: {excel_writer}")
+        self.file_path = file_path
+        self.excel_writer = excel_writer
+        if excel_writer == "xlsxwriter":
+            self._workbook = _xlsxwriter_workbook(file_path)
+        else:
+            from openpyxl import Workbook
+
+            self._workbook = Workbook(write_only=True)
+
+    def add_sheet(self, name: str, frame: pd.DataFrame) -> None:
+        """Write frame (with a header row) to a new sheet called name."""
+        if len(frame) + 1 > EXCEL_MAX_ROWS:
+            raise ValueError(
+                f"{len(frame)} rows do not fit in one Excel sheet "
+                f"(limit {EXCEL_MAX_ROWS - 1})"
+            )
+        if self.excel_writer == "xlsxwriter":
+            _write_xlsxwriter_sheet(self._workbook.add_worksheet(name), frame)
+        else:
+            sheet = self._workbook.create_sheet(title=name)
+            sheet.append([str(c) for c in frame.columns])
+            for row in zip(*_excel_columns(frame)):
+                sheet.append(row)
+
+    def close(self) -> None:
+        """Assemble and compress the workbook file."""
+        if self.excel_writer == "xlsxwriter":
+            self._workbook.close()
+        else:
+            self._workbook.save(self.file_path)
+
+
+def export_group(
+    group_data: pd.DataFrame,
+    file_path,
+    output_format: str,
+    excel_writer: str = DEFAULT_EXCEL_WRITER,
+) -> None:
+    """Write a single group to disk (or a binary buffer) in the requested format."""
+    if output_format == "csv":
+        group_data.to_csv(file_path, index=False)
+    elif output_format == "parquet":
+        group_data.to_parquet(file_path, index=False)
+    elif output_format == "feather":
+        # Feather stores no index, so the slice gets a default one
+        group_data.reset_index(drop=True).to_feather(file_path)
+    elif output_format == "excel":
+        if excel_writer == "openpyxl":
+            group_data.to_excel(file_path, index=False, engine="openpyxl")
+        elif excel_writer == "openpyxl-stream":
+            write_xlsx_streaming(group_data, file_path)
+        elif excel_writer == "xlsxwriter":
+            write_xlsx_xlsxwriter(group_data, file_path)
+        else:
+            raise ValueError(f"Unsupported Excel writer: {excel_writer}")
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+
+def serialize_group(
+    group_data: pd.DataFrame,
+    output_format: str,
+    excel_writer: str = DEFAULT_EXCEL_WRITER,
+) -> bytes:
+    """Serialize a single group to the bytes export_group would write to disk."""
+    if output_format == "csv":
+        return group_data.to_csv(index=False).encode("utf-8")
+    buffer = io.BytesIO()
+    export_group(group_data, buffer, output_format, excel_writer)
+    return buffer.getvalue()
+
+
+def resolve_workers(workers: int) -> int:
+    """Number of export workers to use; 0 or less means one per CPU core."""
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def plan_file_paths(
+    partition: "Partition",
+    selected_columns: Sequence[str],
+    all_columns: Sequence[str],
+    directory: str,
+    extension: str,
+    registry: Optional[NameRegistry] = None,
+) -> Tuple[List[str], List[str]]:
+    """
+    Decide every group's output filename before anything is written.
+
+    Planning up front keeps names deterministic when groups are exported
+    concurrently: collisions are resolved in group order, in memory, against
+    the files already in directory (listed once) and the names planned for
+    earlier groups.
+
+    Returns:
+        (filenames without extension, full file paths), indexed by group
+    """
+    registry = registry or NameRegistry()
+    if list(selected_columns) == partition.key_columns and list(all_columns) == partition.all_columns:
+        filenames = list(partition.filenames())
+    else:
+        filenames = [
+            create_filename(
+                selected_columns, partition.group_key(idx), all_columns, group_number=idx + 1
+            )
+            for idx in range(len(partition))
+        ]
+    file_paths = [
+        os.path.join(directory, registry.claim(directory, filename, extension))
+        for filename in filenames
+    ]
+    return filenames, file_paths
+
+
+def write_parquet_dataset(partition: "Partition", directory: str) -> List[str]:
+    """
+    Write a partition as one hive-style Parquet dataset.
+
+    Rows go to <directory>/<col>=<value>/.../part-0.parquet in a single
+    pyarrow write_dataset call, so there is no per-group file handling in
+    Python. Key values are taken from the buffer as they are: build the
+    partition with normalise_keys=False to keep the original dtypes (missing
+    keys then land in pyarrow's __HIVE_DEFAULT_PARTITION__ directory).
+
+    Returns:
+        Paths of the Parquet files written
+    """
+    _require_pyarrow("The parquet-dataset output format")
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    table = pa.Table.from_pandas(partition.buffer, preserve_index=False)
+    key_schema = pa.schema([table.schema.field(col) for col in partition.key_columns])
+    written: List[str] = []
+    ds.write_dataset(
+        table,
+        directory,
+        format="parquet",
+        partitioning=ds.partitioning(key_schema, flavor="hive"),
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_partitions=max(1024, len(partition)),
+        # Rows arrive sorted by group, so one writer thread streams each
+        # group's file in order; it also keeps row order within a file
+        use_threads=False,
+    )
+    for root, _, names in os.walk(directory):
+        written.extend(os.path.join(root, name) for name in names)
+    return sorted(written)
+
+
+# Partition inherited by forked export workers so group slices do not have
+# to be pickled; only set while a fork-based process pool is running.
+_SHARED_PARTITION: Optional["Partition"] = None
+
+
+GroupJobResult = Tuple[Optional[str], Optional[bytes]]
+
+
+def _export_one(
+    group_data: pd.DataFrame,
+    file_path: Optional[str],
+    output_format: str,
+    excel_writer: str,
+) -> GroupJobResult:
+    """
+    Export one group, returning (error message or None, serialized bytes or None).
+
+    With file_path None the group is serialized to bytes instead of being
+    written, for streaming into a ZIP archive.
+    """
+    try:
+        if file_path is None:
+            return None, serialize_group(group_data, output_format, excel_writer)
+        export_group(group_data, file_path, output_format, excel_writer)
+        return None, None
+    except Exception as e:
+        return str(e), None
+
+
+def _export_task(
+    task: Tuple[int, Optional[str], str, str, Optional[pd.DataFrame]]
+) -> GroupJobResult:
+    """Process pool entry point: slice from the inherited partition if no data was sent."""
+    idx, file_path, output_format, excel_writer, group_data = task
+    if group_data is None:
+        group_data = _SHARED_PARTITION.group(idx)
+    return _export_one(group_data, file_path, output_format, excel_writer)
+
+
+# Export tasks in flight per worker; bounds how many serialized groups wait
+# for the (in-order) consumer, e.g. the streaming ZIP writer
+EXPORT_TASKS_PER_WORKER = 4
+
+
+def _map_bounded(pool, func: Callable, items, window: int) -> Iterator:
+    """
+    Like pool.map, but with at most window tasks submitted ahead of the consumer.
+
+    Executor.map submits every item up front, so the results of fast
+    workers pile up in memory until the consumer reaches them; here the
+    next task is only submitted once the oldest result has been taken.
+    Results are yielded in input order.
+    """
+    pending: deque = deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_exports(
+    partition: "Partition",
+    file_paths: Optional[Sequence[str]],
+    output_format: str,
+    workers: int = 1,
+    excel_writer: str = DEFAULT_EXCEL_WRITER,
+    indices: Optional[Sequence[int]] = None,
+) -> Iterator[Tuple[int, Optional[str], Optional[bytes]]]:
+    """
+    Export every group of a partition (or the given group indices) in order.
+
+    Yields (group index, error or None, bytes or None). When file_paths is
+    None nothing is written; each group is serialized and its bytes are
+    yielded instead (used to stream groups into a ZIP archive).
+
+    With workers > 1, CSV, Parquet and Feather groups are handled by a
+    thread pool (the writers release the GIL for most of the work) and
+    Excel groups (CPU-bound in openpyxl) by a process pool. Results are always
+    yielded in group order so progress and logs stay ordered, and only
+    EXPORT_TASKS_PER_WORKER tasks per worker are in flight, so serialized
+    groups are consumed as they arrive instead of piling up. Where the
+    fork start method is safe (no other threads running) process workers
+    inherit the reordered buffer and receive only group indices; otherwise
+    each group is pickled to its worker (see Partition.detached_group).
+    """
+    global _SHARED_PARTITION
+    indices = range(len(partition)) if indices is None else list(indices)
+
+    def path(i: int) -> Optional[str]:
+        return None if file_paths is None else file_paths[i]
+
+    if workers <= 1 or len(indices) <= 1:
+        for idx in indices:
+            yield (idx,) + _export_one(partition.group(idx), path(idx), output_format, excel_writer)
+        return
+
+    window = workers * EXPORT_TASKS_PER_WORKER
+    if output_format != "excel":
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = _map_bounded(
+                pool,
+                lambda i: _export_one(partition.group(i), path(i), output_format, excel_writer),
+                indices,
+                window,
+            )
+            for idx, (error, data) in zip(indices, results):
+                yield idx, error, data
+        return
+
+    use_fork = (
+        "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1
+    )
+    if use_fork:
+        _SHARED_PARTITION = partition
+        context = multiprocessing.get_context("fork")
+        tasks = ((i, path(i), output_format, excel_writer, None) for i in indices)
+    else:
+        # Forking a multi-threaded process (e.g. the Tk app) is unsafe
+        context = multiprocessing.get_context("spawn")
+        tasks = (
+            (i, path(i), output_format, excel_writer, partition.detached_group(i))
+            for i in indices
+        )
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = _map_bounded(pool, _export_task, tasks, window)
+            for idx, (error, data) in zip(indices, results):
+                yield idx, error, data
+    finally:
+        _SHARED_PARTITION = None
+
+
+def zip_compression_for(output_format: str, zip_compression: str = "auto") -> int:
+    """
+    zipfile compression constant for archive members.
+
+    "auto" stores XLSX, Parquet and Feather members uncompressed (they are
+    compressed internally already, so deflating again costs CPU for almost
+    no gain) and deflates everything else.
+    """
+    if zip_compression not in ZIP_COMPRESSIONS:
+        raise ValueError(f"Unsupported ZIP compression: {zip_compression}")
+    if zip_compression == "stored" or (
+        zip_compression == "auto" and output_format in _PRECOMPRESSED_FORMATS
+    ):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+MANIFEST_VERSION = 1
+# Minimum time between manifest rewrites during an export
+MANIFEST_FLUSH_SECONDS = 2.0
+
+
+def manifest_path_for(split_output_dir: str) -> str:
+    """Manifest file of a split folder: <folder>.manifest.json next to it."""
+    return f"{os.path.normpath(split_output_dir)}.manifest.json"
+
+
+def group_hashes(partition: "Partition", signature: str = "") -> List[str]:
+    """
+    Content hash of every group of a partition.
+
+    Rows are hashed once, vectorized, over the whole buffer; each group's
+    hash combines its slice of row hashes with signature (columns, dtypes
+    and output settings), so any change to a group's rows or to how it is
+    written gives a new hash.
+    """
+    row_hashes = pd.util.hash_pandas_object(partition.buffer, index=False).to_numpy()
+    prefix = hashlib.sha1(signature.encode("utf-8")).digest()
+    offsets = partition.offsets
+    return [
+        hashlib.sha1(prefix + row_hashes[start:end].tobytes()).hexdigest()
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
+
+
+class SplitManifest:
+    """
+    Record of the groups written to a split folder (key, file, rows, hash).
+
+    Stored as JSON next to the folder and rewritten atomically at most every
+    MANIFEST_FLUSH_SECONDS during an export, so after a crash a re-run can
+    trust every group the manifest lists. Groups are keyed by file name.
+    """
+
+    def __init__(self, path: str, previous: Optional[Dict[str, dict]] = None):
+        self.path = path
+        self.previous: Dict[str, dict] = previous or {}
+        self.groups: Dict[str, dict] = {}
+        self.info: Dict[str, object] = {}
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def load(cls, path: str) -> "SplitManifest":
+        """Manifest whose previous groups are read from path (if valid)."""
+        previous: Dict[str, dict] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data.get("version") == MANIFEST_VERSION:
+                previous = dict(data.get("groups", {}))
+        except (OSError, ValueError, AttributeError):
+            previous = {}
+        return cls(path, previous)
+
+    def unchanged(self, file_path: str, digest: str) -> bool:
+        """True if file_path was written with this content and is still intact."""
+        entry = self.previous.get(os.path.basename(file_path))
+        if entry is None or entry.get("hash") != digest:
+            return False
+        try:
+            return os.path.getsize(file_path) == entry.get("bytes")
+        except OSError:
+            return False
+
+    def record(self, file_path: str, key: Tuple, rows: int, digest: str, size: int) -> None:
+        """Add a written (or verified) group and flush if the interval has passed."""
+        self.groups[os.path.basename(file_path)] = {
+            "key": [str(value) for value in key],
+            "rows": rows,
+            "hash": digest,
+            "bytes": size,
+        }
+        if time.monotonic() - self._last_flush >= MANIFEST_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the manifest atomically; failures are ignored (best effort)."""
+        self._last_flush = time.monotonic()
+        data = {
+            "version": MANIFEST_VERSION,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            **self.info,
+            "groups": self.groups,
+        }
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, indent=1)
+            os.replace(tmp, self.path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def create_zip(
+    files: Sequence[str],
+    zip_path: str,
+    arc_root: str,
+    compression: int = zipfile.ZIP_DEFLATED,
+    compresslevel: Optional[int] = None,
+    meter: Optional[ProgressMeter] = None,
+) -> str:
+    """
+    Create a ZIP archive containing the given files.
+
+    Args:
+        files: Files to add
+        zip_path: Desired archive path (made unique if it already exists)
+        arc_root: Directory that archive member names are relative to
+        compression: zipfile compression constant for the members
+        compresslevel: Deflate level 0-9 (None = zlib default)
+        meter: Optional ProgressMeter advanced by the size of each file added
+
+    Returns:
+        Path of the archive actually written
+    """
+    zip_path = unique_path(zip_path)
+    with zipfile.ZipFile(zip_path, "w", compression, compresslevel=compresslevel) as zipf:
+        for number, file_path in enumerate(files, start=1):
+            arcname = os.path.relpath(file_path, arc_root)
+            zipf.write(file_path, arcname)
+            if meter is not None:
+                meter.advance(
+                    os.path.getsize(file_path),
+                    f"Creating ZIP archive... ({number}/{len(files)})",
+                )
+    return zip_path
+
+
+def _validate_selection(
+    selected_columns: Sequence[str],
+    all_columns: Sequence[str],
+    output_format: str,
+    excel_writer: str = DEFAULT_EXCEL_WRITER,
+) -> None:
+    """Raise ValueError if the split request cannot be run."""
+    if not selected_columns:
+        raise ValueError("Please select at least one column.")
+    missing = [c for c in selected_columns if c not in all_columns]
+    if missing:
+        raise ValueError(f"Columns not found in dataset: {', '.join(map(str, missing))}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    if excel_writer not in EXCEL_WRITERS:
+        raise ValueError(f"Unsupported Excel writer: {excel_writer}")
+    if output_format in ARROW_FORMATS:
+        _require_pyarrow(f"The {output_format} output format")
+
+
+def _log_group_count(
+    selected_columns: Sequence[str], all_columns: Sequence[str], total_groups: int, log: LogCallback
+) -> None:
+    if len(selected_columns) == 1:
+        log(f"Single column split: {total_groups} unique values found", "INFO")
+    elif is_all_columns(selected_columns, all_columns):
+        log(f"All columns split: {total_groups} unique row combinations found", "INFO")
+    else:
+        log(f"Multi-column split: {total_groups} unique combinations found", "INFO")
+
+
+def _zip_base_name(split_output_dir: str) -> str:
+    """ZIP archive name (without extension) derived from the output folder."""
+    try:
+        return sanitize_string(os.path.basename(split_output_dir))
+    except Exception:
+        return "output_split"
+
+
+def _zip_result(
+    result: SplitResult,
+    output_folder: str,
+    progress: ProgressCallback,
+    log: LogCallback,
+    compression: int = zipfile.ZIP_DEFLATED,
+    compresslevel: Optional[int] = None,
+    registry: Optional[NameRegistry] = None,
+) -> None:
+    """Package the exported files of a run into <output folder name>.zip."""
+    progress(82, "Creating ZIP archive...")
+    registry = registry or NameRegistry()
+    zip_name = registry.claim(output_folder, _zip_base_name(result.output_dir), ".zip")
+    with result.metrics.stage("zip") as stage:
+        # Weighted by bytes: one large file moves the bar more than many small ones
+        total_bytes = sum(os.path.getsize(f) for f in result.exported_files)
+        result.zip_path = create_zip(
+            result.exported_files,
+            os.path.join(output_folder, zip_name),
+            arc_root=output_folder,
+            compression=compression,
+            compresslevel=compresslevel,
+            meter=ProgressMeter(progress, 82, 99, total_bytes, unit="bytes"),
+        )
+        stage.rows += sum(result.group_rows.values())
+        stage.bytes += os.path.getsize(result.zip_path)
+    log(
+        f"✓ ZIP archive created: {os.path.basename(result.zip_path)} "
+        f"({result.zip_size_mb:.2f} MB)",
+        "SUCCESS",
+    )
+
+
+def _export_parquet_dataset(
+    partition: Partition,
+    result: SplitResult,
+    output_folder: str,
+    make_zip: bool,
+    keep_files: bool,
+    compression: int,
+    zip_level: Optional[int],
+    registry: NameRegistry,
+    progress: ProgressCallback,
+    log: LogCallback,
+) -> None:
+    """parquet-dataset branch of split_dataframe: write, then optionally zip."""
+    try:
+        with result.metrics.stage("export") as stage:
+            files = write_parquet_dataset(partition, result.output_dir)
+            stage.rows += len(partition.buffer)
+            stage.bytes += sum(os.path.getsize(f) for f in files)
+    except Exception as e:
+        error_msg = f"Error writing Parquet dataset: {e}"
+        log(error_msg, "ERROR")
+        result.errors.append(error_msg)
+        return
+
+    log(f"Created Parquet dataset: {result.output_dir}", "INFO")
+    result.exported_files = files
+    for idx, filename in enumerate(partition.filenames()):
+        result.group_rows[filename] = partition.group_size(idx)
+    log(f"✓ Wrote {len(files)} Parquet files for {len(partition)} groups", "DETAIL")
+
+    if make_zip:
+        _zip_result(result, output_folder, progress, log, compression, zip_level, registry)
+        result.archive_members = [os.path.relpath(f, output_folder) for f in files]
+        if not keep_files:
+            shutil.rmtree(result.output_dir, ignore_errors=True)
+            result.exported_files = []
+
+    log(f"✓ Total files exported: {result.file_count}", "SUCCESS")
+
+
+def _export_excel_sheets(
+    partition: Partition,
+    result: SplitResult,
+    selected_columns: Sequence[str],
+    all_columns: Sequence[str],
+    output_folder: str,
+    excel_writer: str,
+    registry: NameRegistry,
+    progress: ProgressCallback,
+    log: LogCallback,
+) -> None:
+    """
+    excel-sheets branch of split_dataframe: one workbook, one sheet per group.
+
+    The workbook is <split folder name>.xlsx in output_folder; sheets are
+    named by sheet_name_table.
+    """
+    workbook_name = registry.claim(
+        output_folder, output_folder_name(selected_columns, all_columns), ".xlsx"
+    )
+    workbook_path = os.path.join(output_folder, workbook_name)
+    with result.metrics.stage("sanitize"):
+        names = partition.sheet_names()
+
+    total_groups = len(partition)
+    meter = ProgressMeter(progress, 15, 90, len(partition.buffer))
+    writer = XlsxSheetWriter(workbook_path, excel_writer)
+    written = 0
+    try:
+        for idx, name in enumerate(names):
+            group_rows = partition.group_size(idx)
+            try:
+                with result.metrics.stage("export") as stage:
+                    writer.add_sheet(name, partition.group(idx))
+                    stage.rows += group_rows
+                result.group_rows[name] = group_rows
+                written += 1
+                log(f"✓ Sheet: {name} ({group_rows} rows)", "DETAIL")
+            except Exception as e:
+                error_msg = f"Error exporting group {idx + 1}: {e}"
+                log(error_msg, "ERROR")
+                result.errors.append(error_msg)
+            meter.advance(group_rows, f"Writing sheets... ({idx + 1}/{total_groups})")
+    finally:
+        progress(90, "Saving workbook...")
+        # Saving compresses every sheet into the workbook in one pass
+        with result.metrics.stage("save") as stage:
+            writer.close()
+            stage.rows += sum(result.group_rows.values())
+            stage.bytes += os.path.getsize(workbook_path)
+    result.exported_files = [workbook_path]
+    if result.errors:
+        log(f"Completed with {len(result.errors)} errors", "WARNING")
+    log(
+        f"✓ Workbook created: {workbook_name} ({written} sheets, "
+        f"{os.path.getsize(workbook_path) / 1024 / 1024:.2f} MB)",
+        "SUCCESS",
+    )
+
+
+def _remove_stale_files(
+    manifest: SplitManifest, file_paths: Sequence[str], directory: str, log: LogCallback
+) -> None:
+    """Delete files a previous run wrote for groups that no longer exist."""
+    current = {os.path.basename(path) for path in file_paths}
+    for filename in manifest.previous:
+        if filename in current or os.path.basename(filename) != filename:
+            continue
+        try:
+            os.remove(os.path.join(directory, filename))
+            log(f"Removed output of a group that no longer exists: {filename}", "DETAIL")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log(f"Could not remove stale file {filename}: {e}", "WARNING")
+
+
+def _log_metrics(result: SplitResult, log: LogCallback) -> None:
+    """Log the throughput of a finished run and its per-stage summary."""
+    log(
+        f"Throughput: {result.rows_per_second:,.0f} rows/sec over {result.elapsed_seconds:.1f} s"
+        + (f", peak RSS {result.peak_rss_mb:.0f} MB" if result.peak_rss_mb is not None else ""),
+        "INFO",
+    )
+    for line in result.metrics.summary_lines():
+        log(f"  {line}", "INFO")
+
+
+def split_dataframe(
+    dataframe: pd.DataFrame,
+    selected_columns: Sequence[str],
+    output_format: str,
+    output_folder: str,
+    make_zip: bool = True,
+    workers: int = 1,
+    excel_writer: str = DEFAULT_EXCEL_WRITER,
+    grouping_cache: Optional[GroupingCache] = None,
+    keep_files: bool = True,
+    zip_compression: str = "auto",
+    zip_level: Optional[int] = None,
+    write_manifest: bool = True,
+    resume: bool = False,
+    metrics: Optional[RunMetrics] = None,
+    progress: Optional[ProgressCallback] = None,
+    log: Optional[LogCallback] = None,
+) -> SplitResult:
+    """
+    Split a loaded DataFrame into one file per unique key and optionally zip them.
+
+    The excel-sheets format instead writes one workbook
+    (<output_folder>/<split name>.xlsx) with a sheet per group; it is a
+    single compressed file, so no ZIP archive or manifest is written.
+
+    A manifest (see SplitManifest) is written next to the split folder. With
+    resume the split updates the folder <output_folder>/<split name> in place
+    instead of creating a new one: groups whose content hash matches the
+    manifest and whose file is intact are skipped, changed or missing groups
+    are (re)written and files of groups that no longer exist are removed.
+
+    Args:
+        dataframe: Dataset to split
+        selected_columns: Columns to split by
+        output_format: One of OUTPUT_FORMATS
+        output_folder: Folder in which the split folder and ZIP are created
+        make_zip: Whether to package the exported files into a ZIP archive
+        workers: Concurrent export workers (1 = sequential, 0 = one per core)
+        excel_writer: Excel backend, one of EXCEL_WRITERS; the excel-sheets
+            format always uses a streaming backend (see XlsxSheetWriter)
+        grouping_cache: Optional GroupingCache of this dataframe whose
+            factorizations are reused (e.g. the one behind the preview)
+        keep_files: Write the loose per-group files; with make_zip and
+            keep_files=False only the ZIP archive is produced
+        zip_compression: Archive member compression, one of ZIP_COMPRESSIONS
+        zip_level: Deflate level 0-9 (None = zlib default)
+        write_manifest: Write the manifest next to the split folder (not
+            for ZIP-only output, which has no folder to resume)
+        resume: Update the existing split folder, skipping unchanged groups
+            (requires keep_files; not available for parquet-dataset and
+            excel-sheets)
+        metrics: RunMetrics to add the split stages to (e.g. one that holds
+            the load stage); a new one is started when None
+        progress: Optional progress callback
+        log: Optional log callback
+
+    Returns:
+        SplitResult describing what was written; result.metrics holds the
+        group, sanitize (filename planning), hash, export and zip stages
+    """
+    progress = progress or _noop_progress
+    log = log or _noop_log
+    selected_columns = list(selected_columns)
+    all_columns = list(dataframe.columns)
+    _validate_selection(selected_columns, all_columns, output_format, excel_writer)
+    if not make_zip and not keep_files:
+        raise ValueError("Nothing to write: enable the ZIP archive or keep the files.")
+    if resume and (not keep_files or output_format in ("parquet-dataset", "excel-sheets")):
+        raise ValueError(
+            "Resuming needs the loose files and is not available for "
+            "parquet-dataset or excel-sheets."
+        )
+    compression = zip_compression_for(output_format, zip_compression)
+    metrics = metrics or RunMetrics()
+    started = time.perf_counter()
+
+    progress(5, "Preparing split operation...")
+    log(f"Starting split with columns: {', '.join(map(str, selected_columns))}", "INFO")
+
+    # Get unique combinations
+    progress(10, "Computing unique groups...")
+
+    # Factorize the key columns once and reorder rows so every group is a
+    # contiguous slice; the caller's frame is left untouched
+    with metrics.stage("group") as stage:
+        split_groups = Partition(
+            dataframe,
+            selected_columns,
+            cache=grouping_cache,
+            normalise_keys=output_format not in ARROW_FORMATS,
+        )
+        stage.rows += len(dataframe)
+    total_groups = len(split_groups)
+    _log_group_count(selected_columns, all_columns, total_groups, log)
+
+    registry = NameRegistry()
+    if resume:
+        # Update the split folder in place; the files in it are ours
+        split_output_dir = os.path.join(
+            output_folder, output_folder_name(selected_columns, all_columns)
+        )
+        registry.adopt(split_output_dir)
+    else:
+        split_output_dir = os.path.join(
+            output_folder,
+            registry.claim(output_folder, output_folder_name(selected_columns, all_columns)),
+        )
+    result = SplitResult(
+        output_dir=split_output_dir,
+        total_groups=total_groups,
+        rows_processed=len(dataframe),
+        metrics=metrics,
+    )
+
+    # Guard against zero groups to avoid division by zero
+    if total_groups == 0:
+        log("No groups found to export.", "WARNING")
+        progress(100, "No groups to export")
+        return result
+
+    progress(15, f"Exporting {total_groups} groups...")
+
+    if output_format in ("parquet-dataset", "excel-sheets"):
+        if output_format == "parquet-dataset":
+            _export_parquet_dataset(
+                split_groups, result, output_folder, make_zip, keep_files,
+                compression, zip_level, registry, progress, log,
+            )
+        else:
+            result.output_dir = output_folder
+            _export_excel_sheets(
+                split_groups, result, selected_columns, all_columns, output_folder,
+                excel_writer, registry, progress, log,
+            )
+        result.elapsed_seconds = time.perf_counter() - started
+        result.peak_rss_mb = peak_rss_mb()
+        _log_metrics(result, log)
+        progress(100, "✓ Split completed successfully!")
+        return result
+
+    if resume and os.path.isdir(split_output_dir):
+        log(f"Updating existing output directory: {split_output_dir}", "INFO")
+    elif keep_files:
+        os.makedirs(split_output_dir, exist_ok=True)
+        log(f"Created output directory: {split_output_dir}", "INFO")
+
+    extension = FORMAT_EXTENSIONS[output_format]
+    with metrics.stage("sanitize"):
+        filenames, file_paths = plan_file_paths(
+            split_groups, selected_columns, all_columns, split_output_dir, extension, registry
+        )
+    workers = resolve_workers(workers)
+    if workers > 1:
+        log(f"Exporting with {workers} parallel workers", "INFO")
+
+    manifest = None
+    digests: List[str] = []
+    skipped = set()
+    # A ZIP-only split has no folder for the manifest to describe
+    if (write_manifest and keep_files) or resume:
+        manifest_path = manifest_path_for(split_output_dir)
+        manifest = SplitManifest.load(manifest_path) if resume else SplitManifest(manifest_path)
+        manifest.info = {
+            "selected_columns": [str(c) for c in selected_columns],
+            "output_format": output_format,
+        }
+        signature = json.dumps(
+            [
+                [str(c) for c in all_columns],
+                [str(dtype) for dtype in split_groups.buffer.dtypes],
+                output_format,
+                excel_writer if output_format == "excel" else None,
+            ]
+        )
+        with metrics.stage("hash") as stage:
+            digests = group_hashes(split_groups, signature)
+            stage.rows += len(dataframe)
+        result.manifest_path = manifest_path
+    if resume and manifest is not None:
+        skipped = {
+            idx for idx in range(total_groups)
+            if manifest.unchanged(file_paths[idx], digests[idx])
+        }
+        log(
+            f"Resuming in {split_output_dir}: {len(skipped)} of {total_groups} groups unchanged",
+            "INFO",
+        )
+
+    # With a ZIP, groups are serialized once and the bytes are streamed into
+    # the archive (and optionally to the loose file) - nothing is read back
+    zipf = None
+    if make_zip:
+        zip_name = f"{_zip_base_name(split_output_dir)}.zip"
+        if not resume:
+            zip_name = registry.claim(output_folder, _zip_base_name(split_output_dir), ".zip")
+        result.zip_path = os.path.join(output_folder, zip_name)
+        zipf = zipfile.ZipFile(result.zip_path, "w", compression, compresslevel=zip_level)
+
+    # Progress is weighted by rows, so one huge group is not counted like a
+    # tiny one; unchanged groups cost next to nothing and are not counted
+    meter = ProgressMeter(
+        progress,
+        15,
+        95,
+        sum(split_groups.group_size(idx) for idx in range(total_groups) if idx not in skipped),
+    )
+    exports = iter_exports(
+        split_groups,
+        None if make_zip else file_paths,
+        output_format,
+        workers,
+        excel_writer,
+        indices=[idx for idx in range(total_groups) if idx not in skipped],
+    )
+    try:
+        for idx in range(total_groups):
+            # Unchanged groups are taken from disk; the rest come from the
+            # exporter, which yields them in the same order
+            is_skipped = idx in skipped
+            group_rows = split_groups.group_size(idx)
+            size = None
+            if is_skipped:
+                error, data = None, None
+            else:
+                with metrics.stage("export") as stage:
+                    _, error, data = next(exports)
+                    if error is None and data is not None and keep_files:
+                        try:
+                            with open(file_paths[idx], "wb") as handle:
+                                handle.write(data)
+                        except Exception as e:
+                            error = str(e)
+                    if error is None:
+                        size = len(data) if data is not None else os.path.getsize(file_paths[idx])
+                        stage.rows += group_rows
+                        stage.bytes += size
+            arcname = os.path.relpath(file_paths[idx], output_folder)
+
+            if error is None and zipf is not None:
+                with metrics.stage("zip") as stage:
+                    try:
+                        if is_skipped:
+                            zipf.write(file_paths[idx], arcname)
+                        else:
+                            zipf.writestr(arcname, data)
+                        result.archive_members.append(arcname)
+                        stage.rows += group_rows
+                    except Exception as e:
+                        error = str(e)
+
+            if error is None:
+                if keep_files:
+                    result.exported_files.append(file_paths[idx])
+                result.group_rows[filenames[idx]] = group_rows
+                if manifest is not None:
+                    if size is None:
+                        size = os.path.getsize(file_paths[idx])
+                    manifest.record(
+                        file_paths[idx], split_groups.group_key(idx), group_rows,
+                        digests[idx], size,
+                    )
+                if is_skipped:
+                    result.skipped_groups += 1
+                    log(
+                        f"↷ Unchanged: {os.path.basename(file_paths[idx])} ({group_rows} rows)",
+                        "DETAIL",
+                    )
+                else:
+                    log(
+                        f"✓ Exported: {os.path.basename(file_paths[idx])} ({group_rows} rows)",
+                        "DETAIL",
+                    )
+            else:
+                error_msg = f"Error exporting group {idx + 1}: {error}"
+                log(error_msg, "ERROR")
+                result.errors.append(error_msg)
+
+            meter.advance(
+                0 if is_skipped else group_rows,
+                f"Exporting files... ({idx + 1}/{total_groups})",
+            )
+    finally:
+        exports.close()
+        if zipf is not None:
+            with metrics.stage("zip"):
+                zipf.close()
+        if manifest is not None:
+            manifest.flush()
+    if result.zip_path:
+        metrics.stages["zip"].bytes = os.path.getsize(result.zip_path)
+
+    if resume and manifest is not None:
+        _remove_stale_files(manifest, file_paths, split_output_dir, log)
+
+    if result.errors:
+        log(f"Completed with {len(result.errors)} errors", "WARNING")
+
+    if result.skipped_groups:
+        log(f"↷ Skipped {result.skipped_groups} unchanged groups", "INFO")
+
+    if result.zip_path:
+        log(
+            f"✓ ZIP archive created: {os.path.basename(result.zip_path)} "
+            f"({result.zip_size_mb:.2f} MB)",
+            "SUCCESS",
+        )
+
+    log(f"✓ Total files exported: {result.file_count}", "SUCCESS")
+    result.elapsed_seconds = time.perf_counter() - started
+    result.peak_rss_mb = peak_rss_mb()
+    _log_metrics(result, log)
+    progress(100, "✓ Split completed successfully!")
+    return result
+
+
+def split_file(
+    file_path: str,
+    selected_columns: Sequence[str],
+    output_format: str,
+    output_folder: str,
+    make_zip: bool = True,
+    workers: int = 1,
+    excel_writer: str = DEFAULT_EXCEL_WRITER,
+    keep_files: bool = True,
+    zip_compression: str = "auto",
+    zip_level: Optional[int] = None,
+    reader: str = "auto",
+    cache_dir: Optional[str] = None,
+    usecols: Optional[Sequence[str]] = None,
+    dtype: LoadDtype = None,
+    category_keys: bool = False,
+    sheets: SheetSelection = None,
+    text_storage: str = "default",
+    write_manifest: bool = True,
+    resume: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    log: Optional[LogCallback] = None,
+) -> SplitResult:
+    """
+    Load a file and split it by the given columns.
+
+    See load_dataframe for reader/cache_dir/usecols/dtype/sheets/text_storage and
+    split_dataframe for the remaining arguments. The key columns are always
+    loaded, also when usecols omits them; category_keys loads them as
+    pandas category.
+    """
+    log = log or _noop_log
+    selected_columns = list(selected_columns)
+    if usecols:
+        usecols = list(usecols) + [c for c in selected_columns if c not in usecols]
+    metrics = RunMetrics()
+    with metrics.stage("load") as stage:
+        dataframe = load_dataframe(
+            file_path, reader=reader, cache_dir=cache_dir, log=log, usecols=usecols,
+            dtype=dtype, category_columns=selected_columns if category_keys else None,
+            sheets=sheets, text_storage=text_storage,
+        )
+        stage.rows += len(dataframe)
+        stage.bytes += os.path.getsize(file_path)
+    log(f"Loaded {file_path}: {len(dataframe)} rows, {len(dataframe.columns)} columns", "INFO")
+    return split_dataframe(
+        dataframe,
+        selected_columns,
+        output_format,
+        output_folder,
+        make_zip=make_zip,
+        workers=workers,
+        excel_writer=excel_writer,
+        keep_files=keep_files,
+        zip_compression=zip_compression,
+        zip_level=zip_level,
+        write_manifest=write_manifest,
+        resume=resume,
+        metrics=metrics,
+        progress=progress,
+        log=log,
+    )
+
+
+# ===== BATCH =====
+
+BATCH_REPORT_COLUMNS = [
+    "input", "status", "rows", "groups", "files", "skipped_groups", "errors",
+    "load_seconds", "split_seconds", "output_dir", "zip_path", "message",
+]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch split over several input files."""
+
+    output_dir: str
+    results: Dict[str, SplitResult] = field(default_factory=dict)
+    failures: Dict[str, str] = field(default_factory=dict)
+    zip_path: Optional[str] = None
+    report_path: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def file_count(self) -> int:
+        """Group files produced over all inputs."""
+        return sum(r.file_count for r in self.results.values())
+
+    @property
+    def failed(self) -> bool:
+        """Whether any input failed or any group failed to export."""
+        return bool(self.failures) or any(r.errors for r in self.results.values())
+
+
+def expand_inputs(patterns: Sequence[str]) -> List[str]:
+    """
+    Input files named by paths, folders and glob patterns.
+
+    A folder contributes its supported files (not recursively, skipping
+    Office "~$" lock files); a pattern is expanded with glob ("**" recurses).
+    Matches of one folder or pattern are sorted; duplicates are dropped.
+    """
+    files: List[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                os.path.join(pattern, name) for name in os.listdir(pattern)
+                if name.lower().endswith(SUPPORTED_INPUT_EXTENSIONS)
+                and not name.startswith("~$")
+                and os.path.isfile(os.path.join(pattern, name))
+            ]
+        elif glob.has_magic(pattern):
+            matches = [
+                path for path in glob.glob(pattern, recursive=True)
+                if path.lower().endswith(SUPPORTED_INPUT_EXTENSIONS) and os.path.isfile(path)
+            ]
+        else:
+            matches = [pattern]
+        for path in sorted(matches):
+            if path not in files:
+                files.append(path)
+    return files
+
+
+def is_batch_input(patterns: Sequence[str]) -> bool:
+    """Whether the inputs name several files (more than one, a folder or a pattern)."""
+    return len(patterns) > 1 or any(os.path.isdir(p) or glob.has_magic(p) for p in patterns)
+
+
+def _write_batch_report(batch: BatchResult, inputs: Sequence[str], path: str) -> None:
+    """Write one CSV row per input with its outcome and timings."""
+    with open(path, "w", newline="", encoding="utf-8-sig") as handle:
+        writer = csv.DictWriter(handle, fieldnames=BATCH_REPORT_COLUMNS)
+        writer.writeheader()
+        for file_path in inputs:
+            result = batch.results.get(file_path)
+            if result is None:
+                writer.writerow({
+                    "input": file_path,
+                    "status": "failed",
+                    "message": batch.failures.get(file_path, "not processed"),
+                })
+                continue
+            load = result.metrics.stages.get("load")
+            writer.writerow({
+                "input": file_path,
+                "status": "errors" if result.errors else "ok",
+                "rows": result.rows_processed,
+                "groups": result.total_groups,
+                "files": result.file_count,
+                "skipped_groups": result.skipped_groups,
+                "errors": len(result.errors),
+                "load_seconds": round(load.wall_seconds, 3) if load else "",
+                "split_seconds": round(result.elapsed_seconds, 3),
+                "output_dir": result.output_dir,
+                "zip_path": result.zip_path or "",
+                "message": "; ".join(result.errors[:3]),
+            })
+
+
+def split_batch(
+    inputs: Sequence[str],
+    selected_columns: Sequence[str],
+    output_format: str,
+    output_folder: str,
+    make_zip: bool = True,
+    single_zip: bool = False,
+    prefetch: int = 1,
+    workers: int = 1,
+    excel_writer: str = DEFAULT_EXCEL_WRITER,
+    reader: str = "auto",
+    cache_dir: Optional[str] = None,
+    usecols: Optional[Sequence[str]] = None,
+    dtype: LoadDtype = None,
+    category_keys: bool = False,
+    sheets: SheetSelection = None,
+    text_storage: str = "default",
+    zip_compression: str = "auto",
+    zip_level: Optional[int] = None,
+    write_manifest: bool = True,
+    resume: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    log: Optional[LogCallback] = None,
+) -> BatchResult:
+    """
+    Split many input files by the same columns in one job.
+
+    Inputs are loaded ahead on prefetch background threads while the
+    current file is being split, so reading file N+1 overlaps exporting
+    file N; at most prefetch + 1 datasets are in memory at once. Every
+    input gets its own subfolder of output_folder (named after the file)
+    in which the usual split folder is created. A failing input is
+    recorded and the batch moves on. A CSV report with one row per input
+    (batch_report.csv) is written to output_folder.
+
+    Args:
+        inputs: Input files, folders or glob patterns (see expand_inputs)
+        selected_columns: Columns to split every input by
+        output_format: One of OUTPUT_FORMATS
+        output_folder: Folder receiving the per-input folders and the report
+        make_zip: Create a ZIP archive per input
+        single_zip: Create one archive with the output of every input
+            instead of one per input (the loose files are kept)
+        prefetch: Inputs loaded ahead of the one being split (0 = none)
+        progress: Optional progress callback (whole batch)
+        log: Optional log callback
+
+    See load_dataframe and split_dataframe for the remaining arguments.
+
+    Returns:
+        BatchResult with the SplitResult of every input that was split
+    """
+    progress = progress or _noop_progress
+    log = log or _noop_log
+    selected_columns = list(selected_columns)
+    files = expand_inputs(inputs)
+    if not files:
+        raise ValueError("No input files found.")
+    if prefetch < 0:
+        raise ValueError("Prefetch must be 0 or more inputs")
+    if usecols:
+        usecols = list(usecols) + [c for c in selected_columns if c not in usecols]
+    compression = zip_compression_for(output_format, zip_compression)
+
+    started = time.perf_counter()
+    batch = BatchResult(output_dir=output_folder)
+    log(f"Batch split of {len(files)} files by: {', '.join(map(str, selected_columns))}", "INFO")
+
+    # Subfolder names only need to be unique within this batch, so the same
+    # input maps to the same folder on every run (which resume relies on)
+    folders = NameRegistry()
+    folders.adopt(output_folder)
+    # Report and single archive never overwrite an earlier batch
+    registry = NameRegistry()
+
+    def load(file_path: str) -> Tuple[pd.DataFrame, RunMetrics]:
+        metrics = RunMetrics()
+        with metrics.stage("load") as stage:
+            dataframe = load_dataframe(
+                file_path, reader=reader, cache_dir=cache_dir, usecols=usecols, dtype=dtype,
+                category_columns=selected_columns if category_keys else None, sheets=sheets,
+                text_storage=text_storage,
+            )
+            stage.rows += len(dataframe)
+            stage.bytes += os.path.getsize(file_path)
+        return dataframe, metrics
+
+    split_band = 95.0 if single_zip else 100.0
+    pending: deque = deque()
+    upcoming = iter(files)
+    with ThreadPoolExecutor(max_workers=max(1, prefetch)) as loader:
+        for number in range(len(files)):
+            # Keep the current input plus `prefetch` further ones loading
+            while len(pending) < prefetch + 1:
+                file_path = next(upcoming, None)
+                if file_path is None:
+                    break
+                pending.append((file_path, loader.submit(load, file_path)))
+            file_path, future = pending.popleft()
+            name = os.path.basename(file_path)
+            band_size = split_band / len(files)
+            band_start = number * band_size
+            prefix = f"[{number + 1}/{len(files)}] {name}"
+
+            def file_progress(value: float, message: str, start=band_start, prefix=prefix) -> None:
+                # Each input owns an equal band of the batch progress
+                progress(start + value / 100 * band_size, f"{prefix}: {message}")
+
+            file_progress(0, "Loading...")
+            try:
+                dataframe, metrics = future.result()
+                log(
+                    f"Loaded {file_path}: {len(dataframe)} rows, {len(dataframe.columns)} columns",
+                    "INFO",
+                )
+                _validate_selection(
+                    selected_columns, list(dataframe.columns), output_format, excel_writer
+                )
+                stem = sanitize_string(os.path.splitext(name)[0]) or "input"
+                input_folder = os.path.join(output_folder, folders.claim(output_folder, stem))
+                os.makedirs(input_folder, exist_ok=True)
+                result = split_dataframe(
+                    dataframe,
+                    selected_columns,
+                    output_format,
+                    input_folder,
+                    make_zip=make_zip and not single_zip,
+                    workers=workers,
+                    excel_writer=excel_writer,
+                    zip_compression=zip_compression,
+                    zip_level=zip_level,
+                    write_manifest=write_manifest,
+                    resume=resume,
+                    metrics=metrics,
+                    progress=file_progress,
+                    log=log,
+                )
+                del dataframe
+            except Exception as e:
+                batch.failures[file_path] = str(e)
+                log(f"✗ {file_path}: {e}", "ERROR")
+                continue
+            batch.results[file_path] = result
+            log(f"✓ {name}: {result.file_count} files from {result.rows_processed} rows", "SUCCESS")
+
+    if single_zip:
+        exported = [f for r in batch.results.values() for f in r.exported_files]
+        if exported:
+            zip_name = registry.claim(output_folder, "batch", ".zip")
+            batch.zip_path = create_zip(
+                exported,
+                os.path.join(output_folder, zip_name),
+                arc_root=output_folder,
+                compression=compression,
+                compresslevel=zip_level,
+                meter=ProgressMeter(
+                    progress, split_band, 100, sum(os.path.getsize(f) for f in exported),
+                    unit="bytes",
+                ),
+            )
+            log(f"✓ Batch ZIP archive created: {os.path.basename(batch.zip_path)}", "SUCCESS")
+
+    batch.report_path = os.path.join(
+        output_folder, registry.claim(output_folder, "batch_report", ".csv")
+    )
+    _write_batch_report(batch, files, batch.report_path)
+    batch.elapsed_seconds = time.perf_counter() - started
+    log(
+        f"Batch finished in {format_duration(batch.elapsed_seconds)}: "
+        f"{len(batch.results)} of {len(files)} files split, {batch.file_count} output files"
+        + (f", {len(batch.failures)} failed" if batch.failures else ""),
+        "WARNING" if batch.failed else "SUCCESS",
+    )
+    log(f"Report: {batch.report_path}", "INFO")
+    progress(100, "✓ Batch completed" if not batch.failed else "Batch completed with errors")
+    return batch
+
+
+class _AppendingCsvWriters:
+    """
+    Appendable per-group CSV writers with a cap on simultaneously open files.
+
+    The header is written once when a group's file is created; later chunks
+    reopen the file in append mode. Least recently used handles are closed
+    when more than max_open_files groups are active.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_open_files: int = 256,
+        buffer_size: int = 64 * 1024,
+        registry: Optional[NameRegistry] = None,
+    ):
+        self.directory = directory
+        self.registry = registry or NameRegistry()
+        self.max_open_files = max(1, max_open_files)
+        self.buffer_size = buffer_size
+        self.paths: Dict[Tuple, str] = {}
+        self.rows: Dict[Tuple, int] = {}
+        self._handles: "OrderedDict[Tuple, object]" = OrderedDict()
+
+    def write(self, key: Tuple, filename: str, frame: pd.DataFrame) -> bool:
+        """Append frame to the file of group key; returns True if the file was created."""
+        created = key not in self.paths
+        if created:
+            self.paths[key] = os.path.join(
+                self.directory, self.registry.claim(self.directory, filename, ".csv")
+            )
+            self.rows[key] = 0
+
+        handle = self._handles.pop(key, None)
+        if handle is None:
+            if len(self._handles) >= self.max_open_files:
+                _, oldest = self._handles.popitem(last=False)
+                oldest.close()
+            handle = open(
+                self.paths[key], "w" if created else "a",
+                newline="", encoding="utf-8", buffering=self.buffer_size,
+            )
+        self._handles[key] = handle
+
+        frame.to_csv(handle, header=created, index=False)
+        self.rows[key] += len(frame)
+        return created
+
+    def close(self) -> None:
+        while self._handles:
+            _, handle = self._handles.popitem()
+            handle.close()
+
+
+def split_csv_streaming(
+    file_path: str,
+    selected_columns: Sequence[str],
+    output_folder: str,
+    chunksize: int = 100_000,
+    make_zip: bool = True,
+    max_open_files: int = 256,
+    zip_compression: str = "auto",
+    zip_level: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    log: Optional[LogCallback] = None,
+) -> SplitResult:
+    """
+    Split a CSV file of any size into per-group CSV files without loading it whole.
+
+    The input is read in chunks of chunksize rows; each chunk is partitioned
+    and its groups are appended to per-group files, so memory stays bounded
+    by the chunk size plus the open writers' buffers. All values are read as
+    text and written back verbatim; key columns get the same missing-value
+    parsing and "Unknown" normalisation as the in-memory split (numeric key
+    values keep their text, e.g. "7" where a loaded float column gives "7.0"). Output files follow the usual
+    naming rules, except that in the all-columns case Group_NNN numbers are
+    assigned in order of first appearance.
+
+    Args:
+        file_path: Input .csv file
+        selected_columns: Columns to split by
+        output_folder: Folder in which the split folder and ZIP are created
+        chunksize: Rows per chunk
+        make_zip: Whether to package the exported files into a ZIP archive
+        max_open_files: Maximum number of output files kept open at once
+        zip_compression: Archive member compression, one of ZIP_COMPRESSIONS
+        zip_level: Deflate level 0-9 (None = zlib default)
+        progress: Optional progress callback
+        log: Optional log callback
+
+    Returns:
+        SplitResult including rows processed, elapsed time and peak RSS
+    """
+    progress = progress or _noop_progress
+    log = log or _noop_log
+    selected_columns = list(selected_columns)
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    if not file_path.lower().endswith(".csv"):
+        raise ValueError("Streaming split requires a .csv input file")
+    if chunksize < 1:
+        raise ValueError("Chunk size must be at least 1 row")
+    compression = zip_compression_for("csv", zip_compression)
+
+    all_columns = list(pd.read_csv(file_path, nrows=0).columns)
+    if not all_columns:
+        raise ValueError("No columns detected in dataset")
+    _validate_selection(selected_columns, all_columns, "csv")
+
+    started = time.perf_counter()
+    # The input position gives the progress and ETA of the streaming stage
+    meter = ProgressMeter(progress, 15, 80, os.path.getsize(file_path), unit="bytes")
+
+    progress(5, "Preparing streaming split...")
+    log(
+        f"Starting streaming split with columns: {', '.join(map(str, selected_columns))} "
+        f"(chunks of {chunksize} rows)",
+        "INFO",
+    )
+
+    registry = NameRegistry()
+    split_output_dir = os.path.join(
+        output_folder,
+        registry.claim(output_folder, output_folder_name(selected_columns, all_columns)),
+    )
+    os.makedirs(split_output_dir, exist_ok=True)
+    log(f"Created output directory: {split_output_dir}", "INFO")
+
+    result = SplitResult(output_dir=split_output_dir, total_groups=0)
+    metrics = result.metrics
+    writers = _AppendingCsvWriters(
+        split_output_dir, max_open_files=max_open_files, registry=registry
+    )
+    filenames: Dict[Tuple, str] = {}
+
+    try:
+        with open(file_path, "rb") as source:
+            # Key columns get pandas' default missing-value strings ("N/A",
+            # "NULL", ...) like load_dataframe, so they end up in "Unknown";
+            # all other columns stay verbatim
+            reader = pd.read_csv(
+                source, chunksize=chunksize, dtype=str, keep_default_na=False,
+                na_values={col: sorted(STR_NA_VALUES) for col in selected_columns},
+            )
+            chunks = iter(reader)
+            chunk_number = 0
+            while True:
+                with metrics.stage("load") as stage:
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        stage.rows += len(chunk)
+                if chunk is None:
+                    break
+                chunk_number += 1
+                with metrics.stage("group") as stage:
+                    partition = Partition(chunk, selected_columns)
+                    stage.rows += len(chunk)
+                for group_key, group_data in partition:
+                    filename = filenames.get(group_key)
+                    if filename is None:
+                        with metrics.stage("sanitize"):
+                            filename = create_filename(
+                                selected_columns, group_key, all_columns,
+                                group_number=len(filenames) + 1,
+                            )
+                        filenames[group_key] = filename
+                    try:
+                        with metrics.stage("export") as stage:
+                            writers.write(group_key, filename, group_data)
+                            stage.rows += len(group_data)
+                    except Exception as e:
+                        error_msg = f"Error writing group {filename}: {str(e)}"
+                        log(error_msg, "ERROR")
+                        result.errors.append(error_msg)
+
+                result.rows_processed += len(chunk)
+                elapsed = time.perf_counter() - started
+                rate = result.rows_processed / elapsed if elapsed > 0 else 0.0
+                log(
+                    f"Chunk {chunk_number}: {result.rows_processed} rows read, "
+                    f"{len(filenames)} groups, {rate:,.0f} rows/sec",
+                    "DETAIL",
+                )
+                meter.update(
+                    source.tell(),
+                    f"Streaming... {result.rows_processed} rows ({rate:,.0f} rows/sec)",
+                )
+    finally:
+        with metrics.stage("export"):
+            writers.close()
+    metrics.stages["load"].bytes = os.path.getsize(file_path)
+
+    result.total_groups = len(filenames)
+    for key, path in writers.paths.items():
+        result.exported_files.append(path)
+        result.group_rows[filenames[key]] = writers.rows[key]
+    metrics.stages["export"].bytes = sum(os.path.getsize(p) for p in result.exported_files)
+    _log_group_count(selected_columns, all_columns, result.total_groups, log)
+
+    if result.errors:
+        log(f"Completed with {len(result.errors)} errors", "WARNING")
+
+    if make_zip and result.exported_files:
+        _zip_result(result, output_folder, progress, log, compression, zip_level, registry)
+
+    result.elapsed_seconds = time.perf_counter() - started
+    result.peak_rss_mb = peak_rss_mb()
+    log(f"✓ Total files exported: {len(result.exported_files)}", "SUCCESS")
+    _log_metrics(result, log)
+    progress(100, "✓ Split completed successfully!")
+    return result
+
+
+# ===== COMMAND LINE =====
+
+def _console_log(message: str, level: str = "INFO") -> None:
+    """Print a log line in the same format as the desktop activity log."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    stream = sys.stderr if level in ("ERROR", "WARNING") else sys.stdout
+    print(f"[{timestamp}] [{level}] {message}", file=stream)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="split_engine",
+        description="Split an Excel/CSV file into one file per unique column value.",
+    )
+    parser.add_argument(
+        "input", nargs="+",
+        help="Input file; several files, a folder or a glob pattern run a batch "
+        "(every file split by the same columns, one report)",
+    )
+    parser.add_argument(
+        "-c", "--columns", action="append", default=[],
+        help="Column to split by; repeat the option to split by several columns",
+    )
+    parser.add_argument(
+        "--all-columns", action="store_true",
+        help="Split by every column (one file per unique row combination)",
+    )
+    parser.add_argument(
+        "-f", "--format", choices=OUTPUT_FORMATS, default="csv", help="Output format (default: csv)"
+    )
+    parser.add_argument(
+        "-o", "--output", default=".", help="Output folder (default: current directory)"
+    )
+    parser.add_argument(
+        "--excel-writer", choices=EXCEL_WRITERS, default=DEFAULT_EXCEL_WRITER,
+        help="Excel backend for --format excel (default: openpyxl)",
+    )
+    parser.add_argument(
+        "--reader", choices=EXCEL_READERS, default="auto",
+        help="Excel reader (default: auto = calamine if installed)",
+    )
+    parser.add_argument(
+        "--cache-dir", default=None,
+        help="Cache parsed inputs here so unchanged files reload instantly",
+    )
+    parser.add_argument(
+        "--usecols", action="append", default=[], metavar="COLUMN",
+        help="Only load this column (repeatable); the split columns are always loaded",
+    )
+    parser.add_argument(
+        "--as-text", action="store_true",
+        help="Read every value as text and write it back verbatim (no type inference)",
+    )
+    parser.add_argument(
+        "--sheet", action="append", default=[], metavar="NAME", dest="sheets",
+        help="Excel sheet to load (repeatable; default: first sheet). Several sheets, "
+        f"or '{ALL_SHEETS}' for all, are combined with their name in a '{SHEET_COLUMN}' "
+        "column that can be used as a split column",
+    )
+    parser.add_argument(
+        "--text-storage", choices=TEXT_STORAGES, default="default",
+        help="Text columns in memory: default (as pandas loads them), arrow "
+        "(string[pyarrow], memory-mapped Arrow cache; needs pyarrow) or auto",
+    )
+    parser.add_argument(
+        "--category-keys", action="store_true",
+        help="Load the split columns as pandas category to save memory",
+    )
+    parser.add_argument("--no-zip", action="store_true", help="Do not create a ZIP archive")
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Update the existing split folder in place, skipping unchanged groups",
+    )
+    parser.add_argument(
+        "--no-manifest", action="store_true",
+        help="Do not write the <folder>.manifest.json file next to the split folder",
+    )
+    parser.add_argument(
+        "--zip-only", action="store_true",
+        help="Write groups straight into the ZIP archive without the loose files",
+    )
+    parser.add_argument(
+        "--zip-compression", choices=ZIP_COMPRESSIONS, default="auto",
+        help="ZIP member compression (default: auto = store XLSX, deflate CSV)",
+    )
+    parser.add_argument(
+        "--zip-level", type=int, choices=range(0, 10), default=None, metavar="0-9",
+        help="Deflate level for ZIP members (default: zlib default)",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1,
+        help="Parallel export workers (default: 1, 0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Stream a CSV input in chunks instead of loading it (for files larger than RAM)",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=100_000, help="Rows per chunk in --stream mode"
+    )
+    parser.add_argument(
+        "--max-open-files", type=int, default=256,
+        help="Output files kept open at once in --stream mode",
+    )
+    parser.add_argument(
+        "--single-zip", action="store_true",
+        help="Batch: one ZIP archive with the output of every input instead of one per input",
+    )
+    parser.add_argument(
+        "--prefetch", type=int, default=1,
+        help="Batch: inputs loaded ahead while the current one is split (default: 1)",
+    )
+    parser.add_argument(
+        "--metrics", default=None, metavar="FILE",
+        help="Append a JSON record of per-stage timings and memory to FILE (JSON Lines)",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print warnings and errors")
+    return parser
+
+
+def _sheet_selection(names: Sequence[str]) -> SheetSelection:
+    """Sheet selection for load_dataframe from the repeated --sheet values."""
+    if not names:
+        return None
+    if ALL_SHEETS in names:
+        return ALL_SHEETS
+    return names[0] if len(names) == 1 else list(names)
+
+
+def _run_batch(args: argparse.Namespace, log: LogCallback) -> int:
+    """Batch branch of main: split every input by the same columns."""
+    if args.stream or args.zip_only:
+        raise ValueError("--stream and --zip-only are not available for several inputs")
+    if args.all_columns or not args.columns:
+        raise ValueError("A batch needs the split columns by name (--columns).")
+    batch = split_batch(
+        args.input, args.columns, args.format, args.output,
+        make_zip=not args.no_zip, single_zip=args.single_zip, prefetch=args.prefetch,
+        workers=args.workers, excel_writer=args.excel_writer, reader=args.reader,
+        cache_dir=args.cache_dir, usecols=args.usecols or None,
+        dtype="str" if args.as_text else None, category_keys=args.category_keys,
+        sheets=_sheet_selection(args.sheets), text_storage=args.text_storage,
+        zip_compression=args.zip_compression, zip_level=args.zip_level,
+        write_manifest=not args.no_manifest, resume=args.resume, log=log,
+    )
+    if args.metrics:
+        for file_path, result in batch.results.items():
+            append_metrics_record(
+                args.metrics,
+                result.metrics_record(
+                    input=os.path.abspath(file_path),
+                    selected_columns=[str(c) for c in args.columns],
+                    output_format=args.format,
+                    stream=False,
+                    batch=True,
+                ),
+            )
+    return 1 if batch.failed else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point. Returns a process exit code."""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.no_zip and args.zip_only:
+        parser.error("--zip-only cannot be combined with --no-zip")
+
+    def log(message: str, level: str = "INFO") -> None:
+        if args.quiet and level not in ("ERROR", "WARNING"):
+            return
+        _console_log(message, level)
+
+    try:
+        if not os.path.isdir(args.output):
+            raise FileNotFoundError(f"Folder does not exist: {args.output}")
+
+        if is_batch_input(args.input):
+            return _run_batch(args, log)
+        if args.single_zip:
+            raise ValueError("--single-zip needs several inputs (files, a folder or a pattern)")
+        input_path = args.input[0]
+
+        if args.stream:
+            if args.format != "csv":
+                raise ValueError("--stream only supports --format csv")
+            if args.zip_only:
+                raise ValueError("--stream writes loose files; it cannot be combined with --zip-only")
+            if args.resume:
+                raise ValueError("--resume is not available with --stream")
+            if args.all_columns:
+                columns = list(pd.read_csv(input_path, nrows=0).columns)
+            else:
+                columns = list(args.columns)
+            result = split_csv_streaming(
+                input_path, columns, args.output,
+                chunksize=args.chunksize, make_zip=not args.no_zip,
+                max_open_files=args.max_open_files, zip_compression=args.zip_compression,
+                zip_level=args.zip_level, log=log,
+            )
+        else:
+            usecols = list(args.usecols)
+            if usecols and not args.all_columns:
+                usecols += [c for c in args.columns if c not in usecols]
+            category_columns = (
+                args.columns if args.category_keys and not args.all_columns else None
+            )
+            metrics = RunMetrics()
+            with metrics.stage("load") as stage:
+                dataframe = load_dataframe(
+                    input_path, reader=args.reader, cache_dir=args.cache_dir, log=log,
+                    usecols=usecols or None, dtype="str" if args.as_text else None,
+                    category_columns=category_columns, sheets=_sheet_selection(args.sheets),
+                    text_storage=args.text_storage,
+                )
+                stage.rows += len(dataframe)
+                stage.bytes += os.path.getsize(input_path)
+            log(f"Loaded {input_path}: {len(dataframe)} rows, {len(dataframe.columns)} columns")
+
+            if args.all_columns:
+                columns = list(dataframe.columns)
+            else:
+                columns = list(args.columns)
+            if not columns:
+                raise ValueError("Please select at least one column (--columns or --all-columns).")
+
+            result = split_dataframe(
+                dataframe, columns, args.format, args.output,
+                make_zip=not args.no_zip, workers=args.workers,
+                excel_writer=args.excel_writer, keep_files=not args.zip_only,
+                zip_compression=args.zip_compression, zip_level=args.zip_level,
+                write_manifest=not args.no_manifest, resume=args.resume,
+                metrics=metrics, log=log,
+            )
+
+        if args.metrics:
+            append_metrics_record(
+                args.metrics,
+                result.metrics_record(
+                    input=os.path.abspath(input_path),
+                    selected_columns=[str(c) for c in columns],
+                    output_format=args.format,
+                    stream=args.stream,
+                ),
+            )
+    except (FileNotFoundError, ValueError) as e:
+        log(str(e), "ERROR")
+        return 2
+    except Exception as e:
+        log(f"Split operation failed: {str(e)}", "ERROR")
+        log(traceback.format_exc(), "ERROR")
+        return 1
+
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Split by Column - Options
+Input/output formats and backend choices shared by the split engine, the
+command line and the desktop application.
+
+This module has no third-party imports, so the desktop application can
+build its window from these choices before pandas (via split_engine) is
+imported on the first file load.
+"""
+
+SUPPORTED_INPUT_EXTENSIONS = (".xlsx", ".xls", ".csv", ".parquet", ".feather")
+# "excel-sheets" is a single workbook with one sheet per group instead of
+# one file per group
+OUTPUT_FORMATS = ("csv", "excel", "excel-sheets", "parquet", "feather", "parquet-dataset")
+FORMAT_EXTENSIONS = {
+    "csv": ".csv",
+    "excel": ".xlsx",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+
+# Formats written through pyarrow (optional dependency). Their key columns
+# keep the original dtypes instead of the normalised text labels;
+# "parquet-dataset" is one hive-partitioned dataset (col=value/part-0.parquet)
+# instead of one file per group.
+ARROW_FORMATS = ("parquet", "feather", "parquet-dataset")
+
+# Excel writer backends: "openpyxl" builds the full workbook in memory (via
+# pandas.to_excel), "openpyxl-stream" uses openpyxl's write-only mode and
+# "xlsxwriter" uses xlsxwriter's constant_memory mode (optional dependency).
+EXCEL_WRITERS = ("openpyxl", "openpyxl-stream", "xlsxwriter")
+DEFAULT_EXCEL_WRITER = "openpyxl"
+
+# ZIP member compression: "auto" stores already-compressed XLSX and
+# deflates CSV; "deflated"/"stored" force one method for all members
+ZIP_COMPRESSIONS = ("auto", "deflated", "stored")
+
+# Excel reader backends; "auto" uses calamine when python-calamine is installed
+EXCEL_READERS = ("auto", "openpyxl", "calamine")
+
+# Several workbook sheets can be loaded as one dataset; the sheet each row
+# came from is kept in SHEET_COLUMN, which can be used as a split key.
+# ALL_SHEETS selects every sheet ("*" cannot occur in an Excel sheet name).
+SHEET_COLUMN = "Sheet"
+ALL_SHEETS = "*"
+
+# In-memory storage of text columns: "default" keeps what pandas loads
+# (Python objects before pandas 3), "arrow" stores them as pandas
+# string[pyarrow] and caches parsed inputs as memory-mapped Arrow IPC files,
+# "auto" uses arrow when pyarrow is installed
+TEXT_STORAGES = ("auto", "default", "arrow")
@@ -0,0 +1,74 @@
+"""Parsed-input cache: hits, invalidation and eviction."""
+
+import os
+
+import pandas as pd
+
+import split_engine
+
+
+def _entries(cache_dir) -> list:
+    return sorted(name for name in os.listdir(cache_dir) if not name.endswith(".tmp"))
+
+
+def _count_parses(monkeypatch) -> list:
+    """Record every load that had to parse the input (a cache miss)."""
+    misses = []
+    read_cache = split_engine._read_cache
+
+    def spy(stem):
+        frame = read_cache(stem)
+        if frame is None:
+            misses.append(stem)
+        return frame
+
+    monkeypatch.setattr(split_engine, "_read_cache", spy)
+    return misses
+
+
+def test_other_sheets_stay_cached(tmp_path, monkeypatch):
+    workbook = tmp_path / "book.xlsx"
+    with pd.ExcelWriter(workbook) as writer:
+        pd.DataFrame({"Region": ["East", "West"], "v": [1, 2]}).to_excel(writer, sheet_name="A", index=False)
+        pd.DataFrame({"Region": ["North"], "v": [3]}).to_excel(writer, sheet_name="B", index=False)
+    cache_dir = tmp_path / "cache"
+    misses = _count_parses(monkeypatch)
+
+    for sheet in ("A", "B", "A", "B"):
+        split_engine.load_dataframe(
+            str(workbook), reader="openpyxl", cache_dir=str(cache_dir), sheets=sheet
+        )
+
+    assert len(misses) == 2
+    assert len(_entries(cache_dir)) == 2
+
+
+def test_other_load_options_stay_cached(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"Region": ["East", "West"], "a": [1, 2], "b": [3, 4]}).to_csv(path, index=False)
+    cache_dir = tmp_path / "cache"
+    misses = _count_parses(monkeypatch)
+
+    for usecols in (["Region", "a"], ["Region", "b"], ["Region", "a"]):
+        split_engine.load_dataframe(str(path), cache_dir=str(cache_dir), usecols=usecols)
+    split_engine.load_dataframe(str(path), cache_dir=str(cache_dir), dtype="str")
+
+    assert len(misses) == 3
+    assert len(_entries(cache_dir)) == 3
+
+
+def test_changed_file_replaces_its_entry(tmp_path):
+    path = tmp_path / "data.csv"
+    cache_dir = tmp_path / "cache"
+    pd.DataFrame({"Region": ["East", "West"]}).to_csv(path, index=False)
+    split_engine.load_dataframe(str(path), cache_dir=str(cache_dir))
+    old_entries = _entries(cache_dir)
+
+    pd.DataFrame({"Region": ["North", "South", "East"]}).to_csv(path, index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    reloaded = split_engine.load_dataframe(str(path), cache_dir=str(cache_dir))
+
+    assert list(reloaded["Region"]) == ["North", "South", "East"]
+    assert len(_entries(cache_dir)) == 1
+    assert _entries(cache_dir) != old_entries
@@ -0,0 +1,48 @@
+"""Split manifests and resuming a split in place."""
+
+import os
+
+import pandas as pd
+
+import split_engine
+
+
+def _frame(values: list) -> pd.DataFrame:
+    return pd.DataFrame({"Region": ["East", "West", "North"] * 2, "value": values})
+
+
+def _split(dataframe, output_folder, **kwargs):
+    return split_engine.split_dataframe(
+        dataframe, ["Region"], "csv", str(output_folder), make_zip=False, **kwargs
+    )
+
+
+def test_resume_skips_unchanged_groups(tmp_path):
+    first = _split(_frame([1, 2, 3, 4, 5, 6]), tmp_path)
+    assert os.path.exists(first.manifest_path)
+
+    unchanged = _split(_frame([1, 2, 3, 4, 5, 6]), tmp_path, resume=True)
+    assert unchanged.output_dir == first.output_dir
+    assert unchanged.skipped_groups == 3
+
+    changed = _split(_frame([1, 2, 3, 4, 50, 6]), tmp_path, resume=True)
+    assert changed.skipped_groups == 2
+    west = pd.read_csv(os.path.join(first.output_dir, "West.csv"))
+    assert list(west["value"]) == [2, 50]
+
+
+def test_resume_rewrites_missing_files(tmp_path):
+    first = _split(_frame([1, 2, 3, 4, 5, 6]), tmp_path)
+    os.remove(os.path.join(first.output_dir, "East.csv"))
+
+    resumed = _split(_frame([1, 2, 3, 4, 5, 6]), tmp_path, resume=True)
+    assert resumed.skipped_groups == 2
+    assert os.path.exists(os.path.join(first.output_dir, "East.csv"))
+
+
+def test_zip_only_split_writes_no_manifest(tmp_path):
+    result = split_engine.split_dataframe(
+        _frame([1, 2, 3, 4, 5, 6]), ["Region"], "csv", str(tmp_path), keep_files=False
+    )
+    assert result.manifest_path is None
+    assert sorted(os.listdir(tmp_path)) == ["Region.zip"]
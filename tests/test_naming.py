@@ -0,0 +1,42 @@
+"""Collision-free output names."""
+
+import os
+
+import pandas as pd
+import pytest
+
+import split_engine
+
+
+def test_registry_folds_case_when_filesystem_ignores_it(tmp_path):
+    (tmp_path / "EAST.csv").write_text("x\n")
+    registry = split_engine.NameRegistry(ignore_case=True)
+
+    assert registry.claim(str(tmp_path), "North", ".csv") == "North.csv"
+    assert registry.claim(str(tmp_path), "north", ".csv") == "north_1.csv"
+    assert registry.claim(str(tmp_path), "NORTH", ".CSV") == "NORTH_2.CSV"
+    assert registry.claim(str(tmp_path), "East", ".csv") == "East_1.csv"
+
+
+def test_registry_keeps_case_on_case_sensitive_filesystems(tmp_path):
+    registry = split_engine.NameRegistry(ignore_case=False)
+
+    assert registry.claim(str(tmp_path), "North", ".csv") == "North.csv"
+    assert registry.claim(str(tmp_path), "north", ".csv") == "north.csv"
+
+
+@pytest.mark.parametrize("platform", ["darwin", "win32"])
+def test_keys_differing_only_by_case_get_separate_files(tmp_path, monkeypatch, platform):
+    monkeypatch.setattr(split_engine.sys, "platform", platform)
+    (tmp_path / "region").mkdir()
+    frame = pd.DataFrame({"Region": ["North", "north", "North", "NORTH"], "value": [1, 2, 3, 4]})
+
+    result = split_engine.split_dataframe(
+        frame, ["Region"], "csv", str(tmp_path), make_zip=False, write_manifest=False
+    )
+
+    assert os.path.basename(result.output_dir) == "Region_1"
+    names = sorted(os.path.basename(path) for path in result.exported_files)
+    assert len({name.casefold() for name in names}) == 3
+    rows = sum(len(pd.read_csv(path)) for path in result.exported_files)
+    assert rows == len(frame)
@@ -0,0 +1,90 @@
+"""Partition and key normalisation against the original groupby sanitising."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import split_engine
+
+
+def _baseline_groups(dataframe: pd.DataFrame, keys: list) -> list:
+    """(key labels, row index) per group as the original astype(str)/replace split did."""
+    safe_df = dataframe.copy()
+    for col in keys:
+        safe_df[col] = (
+            safe_df[col].astype(str)
+            .replace(split_engine.NULL_LIKE_VALUES, split_engine.UNKNOWN_LABEL)
+            .fillna(split_engine.UNKNOWN_LABEL)
+        )
+    return [
+        (key if isinstance(key, tuple) else (key,), list(group.index))
+        for key, group in safe_df.groupby(keys, sort=True)
+    ]
+
+
+@pytest.fixture
+def mixed_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    rows = 500
+    region = np.array(["East", "West", None, "nan", "", "None", "<NA>", "a/b"], dtype=object)
+    code = np.array([1, "1", 2.5, None, float("nan"), "NA", "x"], dtype=object)
+    return pd.DataFrame({
+        "value": rng.normal(size=rows),
+        "Region": region[rng.integers(0, len(region), rows)],
+        "code": code[rng.integers(0, len(code), rows)],
+        "year": rng.choice([2023.0, 2024.0, np.nan], rows),
+    })
+
+
+@pytest.mark.parametrize("keys", [["Region"], ["Region", "code"], ["year", "Region", "code"]])
+def test_partition_matches_baseline(mixed_frame, keys):
+    partition = split_engine.Partition(mixed_frame, keys)
+
+    groups = [(key, list(group.index)) for key, group in partition]
+    assert groups == _baseline_groups(mixed_frame, keys)
+    for (key, group) in partition:
+        for col, label in zip(keys, key):
+            assert (group[col].astype(object) == label).all()
+        pd.testing.assert_frame_equal(
+            group.drop(columns=keys), mixed_frame.loc[group.index].drop(columns=keys)
+        )
+    assert list(partition.buffer.columns) == list(mixed_frame.columns)
+
+
+def test_cached_partition_matches_uncached(mixed_frame):
+    keys = ["Region", "code"]
+    cache = split_engine.GroupingCache(mixed_frame, max_cached_columns=1)
+    summary = cache.summary(keys)
+    cached = split_engine.Partition(mixed_frame, keys, cache=cache)
+    plain = split_engine.Partition(mixed_frame, keys)
+
+    assert summary.total_groups == len(plain)
+    assert cached.filenames() == plain.filenames()
+    pd.testing.assert_frame_equal(cached.buffer, plain.buffer)
+
+
+def test_key_codes_use_small_dtypes(mixed_frame):
+    codes, labels = split_engine.factorize_key_column(mixed_frame["Region"])
+    assert codes.dtype == np.int8
+    assert list(labels[codes]) == [
+        split_engine.UNKNOWN_LABEL if pd.isna(value) or value in ("nan", "", "None", "<NA>")
+        else value
+        for value in mixed_frame["Region"]
+    ]
+
+
+def test_detached_group_drops_other_labels():
+    rows = 20_000
+    frame = pd.DataFrame({"key": [f"k{i % 5000:05d}" for i in range(rows)], "value": range(rows)})
+    partition = split_engine.Partition(frame, ["key"])
+
+    for idx in (0, 1234, len(partition) - 1):
+        group = partition.group(idx)
+        detached = partition.detached_group(idx)
+        assert len(detached["key"].cat.categories) == 1
+        pd.testing.assert_frame_equal(
+            detached.astype({"key": object}), group.astype({"key": object})
+        )
+    assert len(pickle.dumps(detached)) < len(pickle.dumps(group)) // 10
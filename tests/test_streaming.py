@@ -0,0 +1,53 @@
+"""Streaming CSV split versus the in-memory split of the same file."""
+
+import os
+
+import pandas as pd
+
+import split_engine
+
+REGIONS = ["East", "N/A", "NULL", "#N/A", "null", "n/a", "", "None", "West", "a/b"]
+
+
+def _split_files(output_dir: str) -> dict:
+    """Relative path -> frame (read as text) of every CSV under output_dir."""
+    files = {}
+    for root, _, names in os.walk(output_dir):
+        for name in names:
+            if name.endswith(".csv"):
+                path = os.path.join(root, name)
+                files[os.path.relpath(path, output_dir)] = pd.read_csv(
+                    path, dtype=str, keep_default_na=False
+                )
+    return files
+
+
+def test_streaming_matches_in_memory_split(tmp_path):
+    rows = 200
+    source = pd.DataFrame({
+        "Region": [REGIONS[i % len(REGIONS)] for i in range(rows)],
+        "Team": [f"T{i % 3}" for i in range(rows)],
+        "Note": [f"note {i}" for i in range(rows)],
+    })
+    input_path = tmp_path / "input.csv"
+    source.to_csv(input_path, index=False)
+
+    memory_dir = tmp_path / "memory"
+    stream_dir = tmp_path / "stream"
+    memory_dir.mkdir()
+    stream_dir.mkdir()
+    split_engine.split_file(
+        str(input_path), ["Region", "Team"], "csv", str(memory_dir),
+        make_zip=False, write_manifest=False,
+    )
+    split_engine.split_csv_streaming(
+        str(input_path), ["Region", "Team"], str(stream_dir), chunksize=37, make_zip=False
+    )
+
+    memory_files = _split_files(str(memory_dir))
+    stream_files = _split_files(str(stream_dir))
+    assert sorted(memory_files) == sorted(stream_files)
+    assert any("Region_Unknown" in name for name in stream_files)
+    assert not any("N_A" in name or "NULL" in name for name in stream_files)
+    for name, frame in memory_files.items():
+        pd.testing.assert_frame_equal(frame, stream_files[name])